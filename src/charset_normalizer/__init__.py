@@ -23,9 +23,29 @@ from __future__ import annotations
 
 import logging
 
-from .api import from_bytes, from_fp, from_path, is_binary
-from .legacy import detect
-from .models import CharsetMatch, CharsetMatches
+from .api import (
+    afrom_bytes,
+    afrom_path,
+    ais_binary,
+    from_bytes,
+    from_bytes_many,
+    from_fp,
+    from_path,
+    from_paths,
+    is_binary,
+)
+from .cache import DetectionCache, PersistentDetectionCache
+from .incremental import IncrementalDetector
+from .legacy import UniversalDetector, detect
+from .metrics import add_phase_hook, remove_phase_hook, stats
+from .models import (
+    CandidateTrace,
+    CharsetMatch,
+    CharsetMatches,
+    CompactCharsetMatch,
+    DetectionTrace,
+)
+from .stream import ReplayReader, from_stream
 from .utils import set_logging_handler
 from .version import VERSION, __version__
 
@@ -33,13 +53,30 @@ __all__ = (
     "from_fp",
     "from_path",
     "from_bytes",
+    "from_bytes_many",
+    "from_paths",
+    "from_stream",
     "is_binary",
+    "afrom_bytes",
+    "afrom_path",
+    "ais_binary",
+    "IncrementalDetector",
     "detect",
+    "UniversalDetector",
     "CharsetMatch",
     "CharsetMatches",
+    "CompactCharsetMatch",
+    "DetectionTrace",
+    "CandidateTrace",
+    "ReplayReader",
+    "DetectionCache",
+    "PersistentDetectionCache",
     "__version__",
     "VERSION",
     "set_logging_handler",
+    "stats",
+    "add_phase_hook",
+    "remove_phase_hook",
 )
 
 # Attach a NullHandler to the top level logger by default
@@ -1,39 +1,81 @@
 from __future__ import annotations
 
+import atexit
 import logging
-from functools import lru_cache
-from os import PathLike
-from typing import BinaryIO
-
+import sys
+from codecs import getincrementaldecoder
+from collections import Counter
+from concurrent.futures import (
+    BrokenExecutor,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import lru_cache, partial
+from io import UnsupportedOperation
+from mmap import ACCESS_READ, mmap
+from os import PathLike, cpu_count, fstat, getpid
+from threading import Event, Lock
+from time import monotonic, perf_counter
+from typing import Any, BinaryIO, Callable, Iterable, Iterator
+
+if sys.version_info >= (3, 8):
+    from multiprocessing.shared_memory import SharedMemory
+
+from .cache import (
+    BoundedCache,
+    DetectionCache,
+    FileKey,
+    PersistentDetectionCache,
+    PersistentKey,
+    chunk_caches_enabled,
+)
+from .cache import cached_coherence_ratio as shared_coherence_ratio
+from .cache import cached_mess_ratio as shared_mess_ratio
 from .cd import (
-    coherence_ratio,
+    byte_profile_score,
     encoding_languages,
     mb_encoding_languages,
     merge_coherence_ratios,
+    single_byte_language_profile,
 )
 from .constant import (
     IANA_SUPPORTED,
     IANA_SUPPORTED_SIMILAR,
+    RE_LATIN_NEIGHBOUR,
     TOO_BIG_SEQUENCE,
     TOO_SMALL_SEQUENCE,
     TRACE,
 )
-from .md import mess_ratio
-from .models import CharsetMatch, CharsetMatches
+from .md import histogram_mess_ratio, mess_ratio, single_byte_property_table
+from .metrics import emit_phases, new_counters, phase_hooks, record_counters
+from .models import (
+    CandidateTrace,
+    CharsetMatch,
+    CharsetMatches,
+    CompactCharsetMatch,
+    DetectionTrace,
+)
 from .utils import (
     any_specified_encoding,
+    byte_presence_mask,
     cut_sequence_chunks,
+    explain_handler,  # noqa: F401 (used to live here, still importable from this module)
+    explain_logger,
     iana_name,
     identify_sig_or_bom,
+    identity_byte_values,
+    is_ascii_transparent,
     is_multi_byte_encoding,
     should_strip_sig_or_bom,
+    single_byte_decoding_table,
+    single_byte_identity_key,
+    single_byte_undefined_mask,
+    windowed_decode_length,
 )
 
 logger = logging.getLogger("charset_normalizer")
-explain_handler = logging.StreamHandler()
-explain_handler.setFormatter(
-    logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
-)
 
 # Pre-compute a reordered encoding list: multibyte first, then single-byte.
 # This allows the mb_definitive_match optimization to fire earlier, skipping
@@ -47,8 +89,39 @@ IANA_SUPPORTED_MB_FIRST: list[str] = sorted(
 )
 
 
+def _cache_parameters(
+    steps: int,
+    chunk_size: int,
+    threshold: float,
+    cp_isolation: list[str] | None,
+    cp_exclusion: list[str] | None,
+    preemptive_behaviour: bool,
+    language_threshold: float,
+    enable_fallback: bool,
+    trust_sample: bool,
+    max_candidates: int | None,
+    candidates: list[str] | None = None,
+) -> tuple[Any, ...]:
+    """
+    The detection parameters that a cached verdict depends on, hashable.
+    """
+    return (
+        steps,
+        chunk_size,
+        threshold,
+        tuple(cp_isolation) if cp_isolation is not None else None,
+        tuple(cp_exclusion) if cp_exclusion is not None else None,
+        preemptive_behaviour,
+        language_threshold,
+        enable_fallback,
+        trust_sample,
+        max_candidates,
+        tuple(candidates) if candidates is not None else None,
+    )
+
+
 def from_bytes(
-    sequences: bytes | bytearray,
+    sequences: bytes | bytearray | memoryview,
     steps: int = 5,
     chunk_size: int = 512,
     threshold: float = 0.2,
@@ -58,6 +131,16 @@ def from_bytes(
     explain: bool = False,
     language_threshold: float = 0.1,
     enable_fallback: bool = True,
+    cancel_token: Event | None = None,
+    trust_sample: bool = False,
+    cache: DetectionCache | PersistentDetectionCache | None = None,
+    timeout: float | None = None,
+    max_candidates: int | None = None,
+    workers: int | None = None,
+    workers_threshold: int = TOO_BIG_SEQUENCE,
+    materialize: bool = True,
+    trace: bool = False,
+    _candidates: list[str] | None = None,
 ) -> CharsetMatches:
     """
     Given a raw bytes sequence, return the best possibles charset usable to render str objects.
@@ -73,33 +156,164 @@ def from_bytes(
 
     This function will strip the SIG in the payload/sequence every time except on UTF-16, UTF-32.
     By default the library does not setup any handler other than the NullHandler, if you choose to set the 'explain'
-    toggle to True it will alter the logger configuration to add a StreamHandler that is suitable for debugging.
+    toggle to True the records are emitted through the "charset_normalizer.explain" logger that comes with a
+    StreamHandler suitable for debugging. The "charset_normalizer" logger configuration is never altered.
     Custom logging format and handler can be set manually.
+
+    The optional cancel_token (e.g. threading.Event) and timeout (in seconds) are checked between every tested
+    code page and between every measured chunk. Once set or expired, the detection stops and return what was found
+    so far (or the ascii/utf_8/specified fallback). The returned CharsetMatches is then flagged as truncated.
+
+    With trust_sample set to True, large payloads (see TOO_BIG_SEQUENCE) are only verified against the probed
+    chunks and the whole payload decode validation is skipped. Only the sampled windows are read, at the cost
+    of a possible UnicodeDecodeError later on when decoding a match if the sample was not representative.
+
+    Give a DetectionCache (in memory) or a PersistentDetectionCache (on disk) instance as cache to reuse the
+    verdict of a previous call made with the exact same payload and parameters.
+
+    With max_candidates set, single byte code pages are first ranked from the byte statistics of the probed chunks
+    against a per code page letter frequency profile, and only the max_candidates best ranked ones are verified.
+    Multi byte code pages, ascii, utf_8, the declared and the SIG/BOM encoding are always verified.
+
+    The sequences may be any object supporting the buffer protocol (memoryview, mmap, array, ...). It is read in
+    place and never copied as a whole. Unless bytes, bytearray or mmap, the matches raw payload is a flat byte
+    memoryview over it.
+
+    With workers set above 1, payloads of at least workers_threshold byte(s) have the whole payload decode
+    validation of the upcoming candidates run ahead in a pool of workers (threads on a free-threaded interpreter,
+    processes that receive the payload once otherwise). Candidates are still evaluated in the same order with
+    the same early stops, the verdict is unchanged.
+
+    Only the best guess retain its decoded str, the alternatives decode it again when accessed. With materialize set
+    to False, no match ever retain its decoded str nor its output: str(match) and output() decode the payload on
+    demand, every time. Use CharsetMatch.compact() for a snapshot that does not even reference the payload.
+
+    With trace set to True, the returned CharsetMatches.trace records, for every considered code page, why it was
+    skipped or how it failed, the measured chunk mess ratios, the coherence results and the time spent decoding,
+    measuring mess and coherence. Unlike explain, it is per call and costs nothing when disabled.
     """
+    # The explain logger level and handler are set once and for all: toggling explain
+    # never mutate the logger that concurrent calls share.
+    log: logging.Logger = explain_logger if explain else logger
+
+    if max_candidates is not None and max_candidates < 1:
+        raise ValueError("max_candidates must be a positive integer or None")
+
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be a positive integer or None")
+
+    if not materialize:
+        materialized_results: CharsetMatches = from_bytes(
+            sequences,
+            steps,
+            chunk_size,
+            threshold,
+            cp_isolation,
+            cp_exclusion,
+            preemptive_behaviour,
+            explain,
+            language_threshold,
+            enable_fallback,
+            cancel_token,
+            trust_sample,
+            cache,
+            timeout,
+            max_candidates,
+            workers,
+            workers_threshold,
+            True,
+            trace,
+            _candidates,
+        )
+
+        for match in materialized_results:
+            match._unload(materialized=False)
+
+        return materialized_results
+
+    if not isinstance(sequences, (bytearray, bytes, mmap)):
+        # Any other buffer (memoryview, array, ...) is seen as a flat byte view, no copy involved.
+        try:
+            sequences = memoryview(sequences).cast("B")
+        except TypeError as e:
+            raise TypeError(
+                f"Expected object of type bytes, bytearray or supporting the buffer protocol, got: {type(sequences)}"
+            ) from e
+
+    if cache is not None:
+        cache_key = cache.key(
+            sequences,
+            *_cache_parameters(
+                steps,
+                chunk_size,
+                threshold,
+                cp_isolation,
+                cp_exclusion,
+                preemptive_behaviour,
+                language_threshold,
+                enable_fallback,
+                trust_sample,
+                max_candidates,
+                _candidates,
+            ),
+        )
+
+        cached_results: CharsetMatches | None = cache.lookup(cache_key, sequences)
 
-    if not isinstance(sequences, (bytearray, bytes)):
-        raise TypeError(
-            "Expected object of type bytes or bytearray, got: {}".format(
-                type(sequences)
+        if cached_results is not None:
+            log.debug("Encoding detection: reusing a cached verdict for content.")
+            return _attach_trace(
+                cached_results, DetectionTrace(cached=True) if trace else None
             )
+
+        detection_results: CharsetMatches = from_bytes(
+            sequences,
+            steps,
+            chunk_size,
+            threshold,
+            cp_isolation,
+            cp_exclusion,
+            preemptive_behaviour,
+            explain,
+            language_threshold,
+            enable_fallback,
+            cancel_token,
+            trust_sample,
+            None,
+            timeout,
+            max_candidates,
+            workers,
+            workers_threshold,
+            True,
+            trace,
+            _candidates,
         )
 
-    if explain:
-        previous_logger_level: int = logger.level
-        logger.addHandler(explain_handler)
-        logger.setLevel(TRACE)
+        # An interrupted detection is not a verdict worth remembering.
+        if not detection_results.truncated:
+            cache.store(cache_key, detection_results)
+
+        return detection_results
+
+    deadline: float | None = monotonic() + timeout if timeout is not None else None
+
+    # Phases are timed when traced or when a phase hook is registered, never otherwise.
+    tracer: DetectionTrace | None = DetectionTrace() if trace or phase_hooks() else None
+    counters: dict[str, int] = new_counters()
 
     length: int = len(sequences)
 
     if length == 0:
-        logger.debug("Encoding detection on empty bytes, assuming utf_8 intention.")
-        if explain:  # Defensive: ensure exit path clean handler
-            logger.removeHandler(explain_handler)
-            logger.setLevel(previous_logger_level)
-        return CharsetMatches([CharsetMatch(sequences, "utf_8", 0.0, False, [], "")])
+        log.debug("Encoding detection on empty bytes, assuming utf_8 intention.")
+        return _finish_detection(
+            CharsetMatches([CharsetMatch(sequences, "utf_8", 0.0, False, [], "")]),
+            tracer,
+            trace,
+            counters,
+        )
 
     if cp_isolation is not None:
-        logger.log(
+        log.log(
             TRACE,
             "cp_isolation is set. use this flag for debugging purpose. "
             "limited list of encoding allowed : %s.",
@@ -109,8 +323,16 @@ def from_bytes(
     else:
         cp_isolation = []
 
+    # Internal restriction (e.g. the code pages an incremental detection kept alive), unlike
+    # cp_isolation it is not a debugging flag.
+    allowed_encodings: set[str] | None = (
+        {iana_name(cp, False) for cp in _candidates}
+        if _candidates is not None
+        else None
+    )
+
     if cp_exclusion is not None:
-        logger.log(
+        log.log(
             TRACE,
             "cp_exclusion is set. use this flag for debugging purpose. "
             "limited list of encoding excluded : %s.",
@@ -121,7 +343,7 @@ def from_bytes(
         cp_exclusion = []
 
     if length <= (chunk_size * steps):
-        logger.log(
+        log.log(
             TRACE,
             "override steps (%i) and chunk_size (%i) as content does not fit (%i byte(s) given) parameters.",
             steps,
@@ -138,20 +360,30 @@ def from_bytes(
     is_too_large_sequence: bool = len(sequences) >= TOO_BIG_SEQUENCE
 
     if is_too_small_sequence:
-        logger.log(
+        log.log(
             TRACE,
             "Trying to detect encoding from a tiny portion of ({}) byte(s).".format(
                 length
             ),
         )
     elif is_too_large_sequence:
-        logger.log(
+        log.log(
             TRACE,
             "Using lazy str decoding because the payload is quite large, ({}) byte(s).".format(
                 length
             ),
         )
 
+    # Trusting the sample only make sense where the lazy str decoding is used.
+    # Smaller payloads are fully decoded anyway (fingerprint, multi byte usage).
+    trust_sample = trust_sample and is_too_large_sequence
+
+    if trust_sample:
+        log.log(
+            TRACE,
+            "trust_sample is set. The whole payload validation will be skipped, only the probed chunks are decoded.",
+        )
+
     prioritized_encodings: list[str] = []
 
     specified_encoding: str | None = (
@@ -160,7 +392,7 @@ def from_bytes(
 
     if specified_encoding is not None:
         prioritized_encodings.append(specified_encoding)
-        logger.log(
+        log.log(
             TRACE,
             "Detected declarative mark in sequence. Priority +1 given for %s.",
             specified_encoding,
@@ -177,12 +409,21 @@ def from_bytes(
     # mess_ratio and coherence_ratio analysis and reuse the results from the first encoding.
     payload_result_cache: dict[int, tuple[float, list[tuple[str, float]], bool]] = {}
 
-    # Avoid unoptimized RSS usage.
-    # this cache is mostly interesting for
-    # local usage. Garbage collected at the
+    # Chunks measurements are shared process-wide (bounded) unless
+    # disabled. Then we avoid unoptimized RSS usage: this cache
+    # is mostly interesting for local usage. Garbage collected at the
     # end. Like it should.
-    cached_mess_ratio = lru_cache(maxsize=None)(mess_ratio)
-    cached_coherence_ratio = lru_cache(maxsize=None)(coherence_ratio)
+    cached_mess_ratio: Callable[..., float]
+    cached_coherence_ratio: Callable[..., list[tuple[str, float]]]
+
+    if chunk_caches_enabled():
+        cached_mess_ratio = shared_mess_ratio
+        cached_coherence_ratio = shared_coherence_ratio
+    else:
+        cached_mess_ratio = lru_cache(maxsize=None)(mess_ratio)
+        cached_coherence_ratio = partial(
+            shared_coherence_ratio, chunk_cache=BoundedCache(TOO_BIG_SEQUENCE * 8)
+        )
 
     # When a definitive result (chaos=0.0 and good coherence) is found after testing
     # the prioritized encodings (ascii, utf_8), we can significantly reduce the remaining
@@ -223,7 +464,7 @@ def from_bytes(
 
     if sig_encoding is not None:
         prioritized_encodings.append(sig_encoding)
-        logger.log(
+        log.log(
             TRACE,
             "Detected a SIG or BOM mark on first %i byte(s). Priority +1 given for %s.",
             len(sig_payload),
@@ -235,10 +476,133 @@ def from_bytes(
     if "utf_8" not in prioritized_encodings:
         prioritized_encodings.append("utf_8")
 
-    for encoding_iana in prioritized_encodings + IANA_SUPPORTED_MB_FIRST:
+    # Byte prescreen: one pass over the payload tell which byte values are present.
+    # Single byte code pages that leave one of them undefined are rejected without
+    # any decode. The mmap (partial read) and trust_sample cases are left out as
+    # they are meant to avoid reading the whole payload.
+    present_bytes_mask: int | None = (
+        byte_presence_mask(sequences)
+        if not trust_sample and isinstance(sequences, (bytes, bytearray, memoryview))
+        else None
+    )
+    seven_bit_only: bool = (
+        present_bytes_mask is not None and present_bytes_mask >> 0x80 == 0
+    )
+    # On 7-bit payload, every ascii transparent code page share the ascii verdict.
+    ascii_soft_failure: bool = False
+
+    # Single byte code pages that map every present byte value to the same characters
+    # decode the payload identically. Only the first one of such group (the leader) is
+    # measured, the others inherit its verdict without any decode, hash or mess_ratio.
+    # identity key -> (leader, its match or None when it failed)
+    identity_byte_set: bytes | None = (
+        identity_byte_values(present_bytes_mask)
+        if present_bytes_mask is not None
+        else None
+    )
+    identity_verdicts: dict[str, tuple[str, CharsetMatch | None]] = {}
+
+    # Byte histogram of each probed chunk, shared by every single byte candidate (a
+    # single byte code page never carry a SIG/BOM, their chunks are the same byte
+    # slices). Built on first use. See histogram_mess_ratio.
+    probe_histograms: list[tuple[list[tuple[int, int]], int]] | None = None
+
+    # The candidates keep their order whatever the prescreen found: the definitive match
+    # shortcuts (family skip, POST_DEFINITIVE_SB_CAP) and the early stops depend on it.
+    candidate_encodings: list[str] = IANA_SUPPORTED_MB_FIRST
+
+    # First stage (opt-in): rank the single byte candidates from the byte statistics of
+    # the probed chunks, only the max_candidates best ranked ones are verified.
+    if (
+        max_candidates is not None
+        and present_bytes_mask is not None
+        and not seven_bit_only
+    ):
+        candidate_encodings = _rank_candidates(
+            candidate_encodings,
+            present_bytes_mask,
+            _probe_chunks(
+                sequences,
+                range(0, length, int(length / steps)),
+                chunk_size,
+                is_too_large_sequence,
+            ),
+            max_candidates,
+            log,
+        )
+
+    # Opt-in: the whole payload decode validation of the upcoming candidates is run
+    # ahead in a pool of workers. The loop below consume the verdicts in its own order,
+    # so the early stops and the results are unchanged.
+    speculation: _SpeculativeValidation | None = None
+
+    if (
+        workers is not None
+        and workers > 1
+        and length >= workers_threshold
+        and not trust_sample
+        and isinstance(sequences, (bytes, bytearray))
+        # Worker processes read the payload from a shared memory block (Python 3.8+).
+        and sys.version_info >= (3, 8)
+    ):
+        validation_tasks: list[tuple[str, int]] = []
+
+        for encoding_iana in candidate_encodings:
+            if (
+                encoding_iana in prioritized_encodings
+                or encoding_iana in {"utf_16", "utf_32", "utf_7"}
+                or (cp_isolation and encoding_iana not in cp_isolation)
+                or (
+                    allowed_encodings is not None
+                    and encoding_iana not in allowed_encodings
+                )
+                or encoding_iana in cp_exclusion
+            ):
+                continue
+
+            try:
+                if is_multi_byte_encoding(encoding_iana):
+                    validation_tasks.append((encoding_iana, 0))
+                elif is_too_large_sequence and not (
+                    present_bytes_mask is not None
+                    and single_byte_undefined_mask(encoding_iana) & present_bytes_mask
+                ):
+                    # The lazy str decoding validate the remaining after the head.
+                    validation_tasks.append((encoding_iana, int(50e3)))
+            except (ModuleNotFoundError, ImportError):  # Defensive:
+                continue
+
+        if validation_tasks:
+            speculation = _SpeculativeValidation(sequences, workers, validation_tasks)
+            log.log(
+                TRACE,
+                "Validating %i candidate(s) ahead using %i %s worker(s).",
+                len(validation_tasks),
+                workers,
+                "thread" if _free_threaded() else "process",
+            )
+
+    # Set when the detection was cancelled or ran out of time.
+    interrupted: bool = False
+
+    for encoding_iana in prioritized_encodings + candidate_encodings:
+        if (cancel_token is not None and cancel_token.is_set()) or (
+            deadline is not None and monotonic() >= deadline
+        ):
+            log.log(
+                TRACE,
+                "Detection cancelled or out of time before testing %s. Using results found so far.",
+                encoding_iana,
+            )
+            interrupted = True
+            break
+
         if cp_isolation and encoding_iana not in cp_isolation:
             continue
 
+        if allowed_encodings is not None and encoding_iana not in allowed_encodings:
+            continue
+
         if cp_exclusion and encoding_iana in cp_exclusion:
             continue
 
@@ -247,6 +611,12 @@ def from_bytes(
 
         tested.add(encoding_iana)
 
+        counters["candidates"] += 1
+
+        candidate_trace: CandidateTrace | None = (
+            tracer.candidate(encoding_iana) if tracer is not None else None
+        )
+
         decoded_payload: str | None = None
         bom_or_sig_available: bool = sig_encoding == encoding_iana
         strip_sig_or_bom: bool = bom_or_sig_available and should_strip_sig_or_bom(
@@ -254,47 +624,87 @@ def from_bytes(
         )
 
         if encoding_iana in {"utf_16", "utf_32"} and not bom_or_sig_available:
-            logger.log(
+            log.log(
                 TRACE,
                 "Encoding %s won't be tested as-is because it require a BOM. Will try some sub-encoder LE/BE.",
                 encoding_iana,
             )
+            if candidate_trace is not None:
+                candidate_trace.conclude("skipped", "requires_bom")
             continue
         if encoding_iana in {"utf_7"} and not bom_or_sig_available:
-            logger.log(
+            log.log(
                 TRACE,
                 "Encoding %s won't be tested as-is because detection is unreliable without BOM/SIG.",
                 encoding_iana,
             )
+            if candidate_trace is not None:
+                candidate_trace.conclude("skipped", "requires_bom")
             continue
 
         # Skip encodings similar to ones that already soft-failed (high mess ratio).
         # Checked BEFORE the expensive decode attempt.
         if encoding_iana in soft_failure_skip:
-            logger.log(
+            log.log(
                 TRACE,
                 "%s is deemed too similar to a code page that was already considered unsuited. Continuing!",
                 encoding_iana,
             )
+            if candidate_trace is not None:
+                candidate_trace.conclude("skipped", "similar_soft_failure")
             continue
 
         # Skip encodings that were already fast-tracked from a similar successful encoding.
         if encoding_iana in success_fast_tracked:
-            logger.log(
+            log.log(
                 TRACE,
                 "Skipping %s: already fast-tracked from a similar successful encoding.",
                 encoding_iana,
             )
+            if candidate_trace is not None:
+                candidate_trace.conclude("skipped", "similar_fast_tracked")
             continue
 
         try:
             is_multi_byte_decoder: bool = is_multi_byte_encoding(encoding_iana)
         except (ModuleNotFoundError, ImportError):  # Defensive:
-            logger.log(
+            log.log(
                 TRACE,
                 "Encoding %s does not provide an IncrementalDecoder",
                 encoding_iana,
             )
+            if candidate_trace is not None:
+                candidate_trace.conclude("skipped", "no_incremental_decoder")
+            continue
+
+        if (
+            present_bytes_mask
+            and not is_multi_byte_decoder
+            and single_byte_undefined_mask(encoding_iana) & present_bytes_mask
+        ):
+            log.log(
+                TRACE,
+                "Code page %s does not fit given bytes sequence at ALL. Byte prescreen found undefined byte(s).",
+                encoding_iana,
+            )
+            tested_but_hard_failure.append(encoding_iana)
+            if candidate_trace is not None:
+                candidate_trace.conclude("hard_failure", "undefined_bytes")
+            continue
+
+        if (
+            ascii_soft_failure
+            and encoding_iana not in {"utf_8", specified_encoding, sig_encoding}
+            and is_ascii_transparent(encoding_iana)
+        ):
+            log.log(
+                TRACE,
+                "%s decode 7-bit bytes exactly as ascii does, that already failed chaos probing.",
+                encoding_iana,
+            )
+            tested_but_soft_failure.append(encoding_iana)
+            if candidate_trace is not None:
+                candidate_trace.conclude("soft_failure", "ascii_transparent")
             continue
 
         # When we've already found a definitive match (chaos=0.0 with good coherence)
@@ -308,13 +718,16 @@ def from_bytes(
             else:
                 enc_languages = set(mb_encoding_languages(encoding_iana))
             if not enc_languages.intersection(definitive_target_languages):
-                logger.log(
+                log.log(
                     TRACE,
                     "Skipping %s: definitive match already found, this encoding targets different languages (%s vs %s).",
                     encoding_iana,
                     enc_languages,
                     definitive_target_languages,
                 )
+                counters["definitive_match_pruned"] += 1
+                if candidate_trace is not None:
+                    candidate_trace.conclude("skipped", "definitive_match_family")
                 continue
 
         # After the definitive match, cap the number of additional same-family
@@ -326,26 +739,95 @@ def from_bytes(
             and not is_multi_byte_decoder
             and post_definitive_sb_success_count >= POST_DEFINITIVE_SB_CAP
         ):
-            logger.log(
+            log.log(
                 TRACE,
                 "Skipping %s: already accumulated %d same-family results after definitive match (cap=%d).",
                 encoding_iana,
                 post_definitive_sb_success_count,
                 POST_DEFINITIVE_SB_CAP,
             )
+            counters["definitive_match_pruned"] += 1
+            if candidate_trace is not None:
+                candidate_trace.conclude("skipped", "definitive_match_cap")
             continue
 
         # When a multibyte encoding with significant multibyte content has already
         # passed chaos probing, skip all single-byte encodings. They will either fail
         # chaos probing (wasting mess_ratio time) or produce inferior results.
         if mb_definitive_match_found and not is_multi_byte_decoder:
-            logger.log(
+            log.log(
                 TRACE,
                 "Skipping single-byte %s: multi-byte definitive match already found.",
                 encoding_iana,
             )
+            counters["mb_definitive_match_pruned"] += 1
+            if candidate_trace is not None:
+                candidate_trace.conclude("skipped", "multi_byte_definitive_match")
             continue
 
+        identity_key: str | None = None
+
+        if (
+            identity_byte_set is not None
+            and not is_multi_byte_decoder
+            and encoding_iana not in {specified_encoding, "ascii", "utf_8"}
+        ):
+            identity_key = single_byte_identity_key(encoding_iana, identity_byte_set)
+
+            if identity_key in identity_verdicts:
+                leader_iana, leader_match = identity_verdicts[identity_key]
+
+                if leader_match is None:
+                    log.log(
+                        TRACE,
+                        "%s decode the present byte values exactly as %s does, that was already deemed unsuited.",
+                        encoding_iana,
+                        leader_iana,
+                    )
+                    tested_but_soft_failure.append(encoding_iana)
+                    counters["identical_bytes_reused"] += 1
+                    if candidate_trace is not None:
+                        candidate_trace.conclude(
+                            "soft_failure", "identical_bytes", leader_iana
+                        )
+                    continue
+
+                identical_match = CharsetMatch(
+                    sequences,
+                    encoding_iana,
+                    leader_match._mean_mess_ratio,
+                    bom_or_sig_available,
+                    leader_match._languages,
+                    None,
+                    preemptive_declaration=specified_encoding,
+                )
+
+                if is_too_large_sequence:
+                    # Submatch factoring is disabled on large payload, see CharsetMatches.append
+                    results.append(identical_match)
+                else:
+                    for match in results:
+                        if leader_iana in match.could_be_from_charset:
+                            match.add_submatch(identical_match)
+                            break
+                    else:  # Defensive: the leader shall be in the results.
+                        results.append(identical_match)
+
+                success_fast_tracked.add(encoding_iana)
+                log.log(
+                    TRACE,
+                    "%s decode the present byte values exactly as %s does. Reusing its verdict (chaos=%f %%).",
+                    encoding_iana,
+                    leader_iana,
+                    round(leader_match._mean_mess_ratio * 100, ndigits=3),
+                )
+                counters["identical_bytes_reused"] += 1
+                if candidate_trace is not None:
+                    candidate_trace.conclude(
+                        "fast_tracked", "identical_bytes", leader_iana
+                    )
+                continue
+
         # Single-byte candidates of regular size defer the expensive whole
         # payload decode until after chunk probing: single-byte codecs are
         # stateless (1 byte == 1 char) so decoding chunk slices is provably
@@ -356,17 +838,69 @@ def from_bytes(
             not is_multi_byte_decoder and not is_too_large_sequence
         )
 
+        r_ = range(
+            0 if not bom_or_sig_available else len(sig_payload),
+            length,
+            int(length / steps),
+        )
+
+        # Ratio of decoded characters per byte, used to assess multi byte usage.
+        decoded_ratio: float = 1.0
+        # Start of the character each probed offset falls in, when the whole str is not kept.
+        chunk_boundaries: dict[int, int] | None = None
+
+        if candidate_trace is not None:
+            phase_started_at: float = perf_counter()
+
         try:
-            if is_too_large_sequence and not is_multi_byte_decoder:
+            if trust_sample:
+                # Only the head is verified here, the probed chunks will be
+                # decoded strictly right after. A multi byte character cut at
+                # the end of the head is not an error (final=False).
+                if is_multi_byte_decoder:
+                    head: memoryview = (
+                        memoryview(sequences)[: int(50e4)]
+                        if not strip_sig_or_bom
+                        else memoryview(sequences)[len(sig_payload) : int(50e4)]
+                    )
+                    decoded_ratio = len(
+                        getincrementaldecoder(encoding_iana)(errors="strict").decode(
+                            head, False
+                        )
+                    ) / max(len(head), 1)
+            elif is_too_large_sequence and not is_multi_byte_decoder:
                 str(
                     (
-                        sequences[: int(50e4)]
+                        memoryview(sequences)[: int(50e4)]
                         if not strip_sig_or_bom
-                        else sequences[len(sig_payload) : int(50e4)]
+                        else memoryview(sequences)[len(sig_payload) : int(50e4)]
                     ),
                     encoding=encoding_iana,
                 )
             elif not deferred_decoding:
+                # A failed validation that already completed ahead spare the decode.
+                speculative_error: str | None = (
+                    speculation.decode_error(encoding_iana, wait=False)
+                    if speculation is not None
+                    else None
+                )
+
+                if speculative_error is not None:
+                    if speculative_error:
+                        log.log(
+                            TRACE,
+                            "Code page %s does not fit given bytes sequence at ALL. %s",
+                            encoding_iana,
+                            speculative_error,
+                        )
+                    tested_but_hard_failure.append(encoding_iana)
+                    if candidate_trace is not None:
+                        candidate_trace.decode_time = perf_counter() - phase_started_at
+                        candidate_trace.conclude(
+                            "hard_failure", "decode_error", speculative_error or None
+                        )
+                    continue
+
                 # UTF-7 BOM is encoded in modified Base64 whose byte boundary
                 # can overlap with the next character. Stripping raw SIG bytes
                 # before decoding may leave stray bytes that decode as garbage.
@@ -380,40 +914,63 @@ def from_bytes(
                     )
                     if decoded_payload and decoded_payload[0] == "\ufeff":
                         decoded_payload = decoded_payload[1:]
+                elif is_too_large_sequence:
+                    # Validate the payload within a bounded memory footprint, a failed
+                    # whole payload decode would copy it into the UnicodeDecodeError.
+                    chunk_boundaries = {offset: offset for offset in r_}
+                    decoded_ratio = (
+                        windowed_decode_length(
+                            sequences,
+                            encoding_iana,
+                            0 if not strip_sig_or_bom else len(sig_payload),
+                            boundaries=chunk_boundaries,
+                        )
+                        / length
+                    )
+
+                    # Only those matches retain the decoded payload.
+                    if encoding_iana in [specified_encoding, "utf_8"]:
+                        decoded_payload = str(
+                            (
+                                sequences
+                                if not strip_sig_or_bom
+                                else memoryview(sequences)[len(sig_payload) :]
+                            ),
+                            encoding=encoding_iana,
+                        )
                 else:
                     decoded_payload = str(
                         (
                             sequences
                             if not strip_sig_or_bom
-                            else sequences[len(sig_payload) :]
+                            else memoryview(sequences)[len(sig_payload) :]
                         ),
                         encoding=encoding_iana,
                     )
         except (UnicodeDecodeError, LookupError) as e:
             if not isinstance(e, LookupError):
-                logger.log(
+                log.log(
                     TRACE,
                     "Code page %s does not fit given bytes sequence at ALL. %s",
                     encoding_iana,
                     str(e),
                 )
             tested_but_hard_failure.append(encoding_iana)
+            if candidate_trace is not None:
+                candidate_trace.decode_time = perf_counter() - phase_started_at
+                candidate_trace.conclude("hard_failure", "decode_error", str(e))
             continue
 
-        r_ = range(
-            0 if not bom_or_sig_available else len(sig_payload),
-            length,
-            int(length / steps),
-        )
+        if candidate_trace is not None:
+            candidate_trace.decode_time = perf_counter() - phase_started_at
 
-        multi_byte_bonus: bool = (
-            is_multi_byte_decoder
-            and decoded_payload is not None
-            and len(decoded_payload) < length
-        )
+        if decoded_payload is not None:
+            decoded_ratio = len(decoded_payload) / length
+
+        multi_byte_bonus: bool = is_multi_byte_decoder and decoded_ratio < 1.0
 
         if multi_byte_bonus:
-            logger.log(
+            log.log(
                 TRACE,
                 "Code page %s is a multi byte encoding table and it appear that at least one character "
                 "was encoded using n-bytes.",
@@ -426,6 +983,61 @@ def from_bytes(
         early_stop_count: int = 0
         lazy_str_hard_failure = False
 
+        if candidate_trace is not None:
+            phase_started_at = perf_counter()
+
+        # Histogram domain probing: the order insensitive detectors are evaluated
+        # on every probed chunk at once from the byte histograms. When enough chunks
+        # are proven to exceed the threshold, the candidate is bound to fail the chaos
+        # probing below and is rejected without a single decode nor mess_ratio call.
+        if (
+            not is_multi_byte_decoder
+            and present_bytes_mask is not None
+            and not explain
+            and encoding_iana not in {specified_encoding, "ascii", "utf_8"}
+        ):
+            if probe_histograms is None:
+                probe_histograms = _probe_histograms(
+                    sequences, r_, chunk_size, is_too_large_sequence
+                )
+
+            property_table: tuple[int, ...] = single_byte_property_table(encoding_iana)
+
+            histogram_gave_up: int = 0
+
+            for chunk_histogram, chunk_length in probe_histograms:
+                if (
+                    round(
+                        histogram_mess_ratio(
+                            chunk_histogram, chunk_length, property_table
+                        ),
+                        3,
+                    )
+                    >= threshold
+                ):
+                    histogram_gave_up += 1
+
+            if histogram_gave_up >= max_chunk_gave_up:
+                tested_but_soft_failure.append(encoding_iana)
+                if encoding_iana in IANA_SUPPORTED_SIMILAR:
+                    soft_failure_skip.update(IANA_SUPPORTED_SIMILAR[encoding_iana])
+                if identity_key is not None:
+                    identity_verdicts.setdefault(identity_key, (encoding_iana, None))
+                log.log(
+                    TRACE,
+                    "%s was excluded because of initial chaos probing (byte histogram). Gave up %i time(s).",
+                    encoding_iana,
+                    histogram_gave_up,
+                )
+                if candidate_trace is not None:
+                    candidate_trace.md_time = perf_counter() - phase_started_at
+                    candidate_trace.conclude(
+                        "soft_failure",
+                        "histogram_chaos",
+                        f"gave up {histogram_gave_up} time(s)",
+                    )
+                continue
+
         md_chunks: list[str] = []
         md_ratios = []
 
@@ -441,6 +1053,7 @@ def from_bytes(
                 is_multi_byte_decoder,
                 decoded_payload,
                 deferred_decoding,
+                chunk_boundaries,
             ):
                 md_chunks.append(chunk)
 
@@ -459,6 +1072,12 @@ def from_bytes(
                     bom_or_sig_available and not strip_sig_or_bom
                 ):
                     break
+
+                if (cancel_token is not None and cancel_token.is_set()) or (
+                    deadline is not None and monotonic() >= deadline
+                ):
+                    interrupted = True
+                    break
         except (
             UnicodeDecodeError,
             LookupError,
@@ -467,15 +1086,19 @@ def from_bytes(
                 # Deferred single-byte validation failed on a chunk (or the
                 # codec is unavailable on this interpreter build): identical
                 # outcome and bookkeeping to the eager full-decode failure.
-                logger.log(
+                log.log(
                     TRACE,
                     "Code page %s does not fit given bytes sequence at ALL. %s",
                     encoding_iana,
                     str(e),
                 )
                 tested_but_hard_failure.append(encoding_iana)
+                if candidate_trace is not None:
+                    candidate_trace.md_time = perf_counter() - phase_started_at
+                    candidate_trace.mess_ratios = md_ratios
+                    candidate_trace.conclude("hard_failure", "decode_error", str(e))
                 continue
-            logger.log(
+            log.log(
                 TRACE,
                 "LazyStr Loading: After MD chunk decode, code page %s does not fit given bytes sequence at ALL. %s",
                 encoding_iana,
@@ -484,28 +1107,64 @@ def from_bytes(
             early_stop_count = max_chunk_gave_up
             lazy_str_hard_failure = True
 
+        if candidate_trace is not None:
+            candidate_trace.md_time = perf_counter() - phase_started_at
+            candidate_trace.mess_ratios = md_ratios
+
+        if interrupted:
+            log.log(
+                TRACE,
+                "Detection cancelled or out of time while measuring %s. Using results found so far.",
+                encoding_iana,
+            )
+            if candidate_trace is not None:
+                candidate_trace.conclude("interrupted", None)
+            break
+
         # We might want to check the sequence again with the whole content
         # Only if initial MD tests passes
         if (
             not lazy_str_hard_failure
             and is_too_large_sequence
             and not is_multi_byte_decoder
+            and not trust_sample
         ):
-            try:
-                sequences[int(50e3) :].decode(encoding_iana, errors="strict")
-            except UnicodeDecodeError as e:
-                logger.log(
+            final_lookup_error: str | None = None
+
+            if speculation is not None:
+                final_lookup_error = speculation.decode_error(encoding_iana, int(50e3))
+            else:
+                try:
+                    windowed_decode_length(sequences, encoding_iana, int(50e3))
+                except UnicodeDecodeError as e:
+                    final_lookup_error = str(e)
+
+            if final_lookup_error is not None:
+                log.log(
                     TRACE,
                     "LazyStr Loading: After final lookup, code page %s does not fit given bytes sequence at ALL. %s",
                     encoding_iana,
-                    str(e),
+                    final_lookup_error,
                 )
                 tested_but_hard_failure.append(encoding_iana)
+                if candidate_trace is not None:
+                    candidate_trace.conclude(
+                        "hard_failure", "decode_error", final_lookup_error
+                    )
                 continue
 
         mean_mess_ratio: float = sum(md_ratios) / len(md_ratios) if md_ratios else 0.0
         if mean_mess_ratio >= threshold or early_stop_count >= max_chunk_gave_up:
             tested_but_soft_failure.append(encoding_iana)
+            if candidate_trace is not None:
+                candidate_trace.conclude(
+                    "soft_failure",
+                    "decode_error" if lazy_str_hard_failure else "chaos",
+                )
+            if seven_bit_only and encoding_iana == "ascii":
+                ascii_soft_failure = True
+            if identity_key is not None and not lazy_str_hard_failure:
+                identity_verdicts.setdefault(identity_key, (encoding_iana, None))
             if encoding_iana in IANA_SUPPORTED_SIMILAR:
                 soft_failure_skip.update(IANA_SUPPORTED_SIMILAR[encoding_iana])
             # Cache this soft-failure so identical decoding from other encodings
@@ -514,7 +1173,7 @@ def from_bytes(
                 payload_result_cache.setdefault(
                     hash(decoded_payload), (mean_mess_ratio, [], False)
                 )
-            logger.log(
+            log.log(
                 TRACE,
                 "%s was excluded because of initial chaos probing. Gave up %i time(s). "
                 "Computed mean chaos is %f %%.",
@@ -533,26 +1192,31 @@ def from_bytes(
                 # We've missed a UnicodeDecodeError proof
                 # while issuing release 3.4.8
                 # see https://github.com/jawah/charset_normalizer/issues/771
-                if decoded_payload is None:
+                if decoded_payload is None and not trust_sample:
                     try:
-                        decoded_payload = str(
-                            (
-                                sequences
-                                if not strip_sig_or_bom
-                                else sequences[len(sig_payload) :]
-                            ),
-                            encoding=encoding_iana,
-                        )
+                        if is_too_large_sequence:
+                            # Don't allocate huge payload in RAM.
+                            windowed_decode_length(
+                                sequences,
+                                encoding_iana,
+                                0 if not strip_sig_or_bom else len(sig_payload),
+                            )
+                        else:
+                            decoded_payload = str(
+                                (
+                                    sequences
+                                    if not strip_sig_or_bom
+                                    else memoryview(sequences)[len(sig_payload) :]
+                                ),
+                                encoding=encoding_iana,
+                            )
                     except (UnicodeDecodeError, LookupError):
-                        logger.log(
+                        log.log(
                             TRACE,
                             "%s does not decode the whole payload: fallback entry withheld.",
                             encoding_iana,
                         )
                         continue
-                    if is_too_large_sequence:
-                        # Don't retain huge payload in RAM.
-                        decoded_payload = None
 
                 fallback_entry = CharsetMatch(
                     sequences,
@@ -572,6 +1236,8 @@ def from_bytes(
             continue
 
         if deferred_decoding:
+            if candidate_trace is not None:
+                phase_started_at = perf_counter()
             # The candidate passed chaos probing: perform the whole payload
             # decode (validation + payload reuse) that was deferred earlier.
             try:
@@ -579,26 +1245,34 @@ def from_bytes(
                     (
                         sequences
                         if not strip_sig_or_bom
-                        else sequences[len(sig_payload) :]
+                        else memoryview(sequences)[len(sig_payload) :]
                     ),
                     encoding=encoding_iana,
                 )
             except (UnicodeDecodeError, LookupError) as e:
-                logger.log(
+                log.log(
                     TRACE,
                     "Code page %s does not fit given bytes sequence at ALL. %s",
                     encoding_iana,
                     str(e),
                 )
                 tested_but_hard_failure.append(encoding_iana)
+                if candidate_trace is not None:
+                    candidate_trace.decode_time += perf_counter() - phase_started_at
+                    candidate_trace.conclude("hard_failure", "decode_error", str(e))
                 continue
 
+            if candidate_trace is not None:
+                candidate_trace.decode_time += perf_counter() - phase_started_at
+
         # Payload-hash deduplication: if another encoding already decoded to the
         # exact same string, reuse its mess_ratio and coherence results entirely.
         # This is strictly more general than the old IANA_SUPPORTED_SIMILAR approach
         # because it catches ALL identical decoding, not just pre-mapped ones.
+        payload_hash: int | None = None
+
         if decoded_payload is not None and not is_multi_byte_decoder:
-            payload_hash: int = hash(decoded_payload)
+            payload_hash = hash(decoded_payload)
             cached = payload_result_cache.get(payload_hash)
             if cached is not None:
                 cached_mess, cached_cd, cached_passed = cached
@@ -620,10 +1294,15 @@ def from_bytes(
                             else None
                         ),
                         preemptive_declaration=specified_encoding,
+                        fingerprint=payload_hash,
                     )
                     results.append(fast_match)
                     success_fast_tracked.add(encoding_iana)
-                    logger.log(
+                    counters["payload_fast_tracked"] += 1
+                    if candidate_trace is not None:
+                        candidate_trace.coherence = cached_cd
+                        candidate_trace.conclude("fast_tracked", "identical_payload")
+                    log.log(
                         TRACE,
                         "%s fast-tracked (identical decoded payload to a prior encoding, chaos=%f %%).",
                         encoding_iana,
@@ -635,14 +1314,15 @@ def from_bytes(
                         and cached_mess < 0.1
                     ):
                         if cached_mess == 0.0:
-                            logger.debug(
+                            log.debug(
                                 "Encoding detection: %s is most likely the one.",
                                 fast_match.encoding,
                             )
-                            if explain:
-                                logger.removeHandler(explain_handler)
-                                logger.setLevel(previous_logger_level)
-                            return CharsetMatches([fast_match])
+                            if speculation is not None:
+                                speculation.close()
+                            return _finish_detection(
+                                CharsetMatches([fast_match]), tracer, trace, counters
+                            )
                         early_stop_results.append(fast_match)
 
                     if (
@@ -652,14 +1332,15 @@ def from_bytes(
                         and "utf_8" in tested
                     ):
                         probable_result: CharsetMatch = early_stop_results.best()  # type: ignore[assignment]
-                        logger.debug(
+                        log.debug(
                             "Encoding detection: %s is most likely the one.",
                             probable_result.encoding,
                         )
-                        if explain:
-                            logger.removeHandler(explain_handler)
-                            logger.setLevel(previous_logger_level)
-                        return CharsetMatches([probable_result])
+                        if speculation is not None:
+                            speculation.close()
+                        return _finish_detection(
+                            CharsetMatches([probable_result]), tracer, trace, counters
+                        )
 
                     continue
                 else:
@@ -668,7 +1349,10 @@ def from_bytes(
                     # probing on the identical payload (deterministic ratios),
                     # kept for structural parity with the historic flow.
                     tested_but_soft_failure.append(encoding_iana)
-                    logger.log(
+                    counters["payload_fast_skipped"] += 1
+                    if candidate_trace is not None:
+                        candidate_trace.conclude("soft_failure", "identical_payload")
+                    log.log(
                         TRACE,
                         "%s fast-skipped (identical decoded payload to a prior encoding that failed chaos probing).",
                         encoding_iana,
@@ -698,7 +1382,7 @@ def from_bytes(
                             fallback_u8 = fallback_entry
                     continue
 
-        logger.log(
+        log.log(
             TRACE,
             "%s passed initial chaos probing. Mean measured chaos is %f %%",
             encoding_iana,
@@ -711,14 +1395,18 @@ def from_bytes(
             target_languages = mb_encoding_languages(encoding_iana)
 
         if target_languages:
-            logger.log(
+            log.log(
                 TRACE,
-                "{} should target any language(s) of {}".format(
-                    encoding_iana, str(target_languages)
-                ),
+                "%s should target any language(s) of %s",
+                encoding_iana,
+                target_languages,
             )
 
         cd_ratios = []
+        counters["coherence_measured"] += 1
+
+        if candidate_trace is not None:
+            phase_started_at = perf_counter()
 
         # Run coherence detection on all chunks. We previously tried limiting to
         # 1-2 chunks for post-definitive encodings to save time, but this caused
@@ -732,23 +1420,49 @@ def from_bytes(
                 ",".join(target_languages) if target_languages else None
             )
 
-            for chunk in md_chunks:
-                chunk_languages = cached_coherence_ratio(
-                    chunk,
-                    language_threshold,
-                    lg_inclusion,
-                )
+            # Single byte code pages: a cache miss is computed from the byte histogram
+            # of the probed chunk through the decoding table, no str work at all.
+            chunk_histograms: list[tuple[list[tuple[int, int]], int]] = []
+
+            if not is_multi_byte_decoder and not bom_or_sig_available:
+                if probe_histograms is None:
+                    probe_histograms = _probe_histograms(
+                        sequences, r_, chunk_size, is_too_large_sequence
+                    )
+                if len(probe_histograms) == len(md_chunks):
+                    chunk_histograms = probe_histograms
+
+            for chunk_index, chunk in enumerate(md_chunks):
+                if chunk_histograms:
+                    chunk_languages = cached_coherence_ratio(
+                        chunk,
+                        language_threshold,
+                        lg_inclusion,
+                        chunk_histograms[chunk_index][0],
+                        single_byte_decoding_table(encoding_iana),
+                    )
+                else:
+                    chunk_languages = cached_coherence_ratio(
+                        chunk,
+                        language_threshold,
+                        lg_inclusion,
+                    )
 
                 cd_ratios.append(chunk_languages)
 
         cd_ratios_merged = merge_coherence_ratios(cd_ratios)
 
+        if candidate_trace is not None:
+            candidate_trace.cd_time = perf_counter() - phase_started_at
+            candidate_trace.coherence = cd_ratios_merged
+            candidate_trace.conclude("passed", None)
+
         if cd_ratios_merged:
-            logger.log(
+            log.log(
                 TRACE,
-                "We detected language {} using {}".format(
-                    cd_ratios_merged, encoding_iana
-                ),
+                "We detected language %s using %s",
+                cd_ratios_merged,
+                encoding_iana,
             )
 
         current_match = CharsetMatch(
@@ -766,14 +1480,18 @@ def from_bytes(
                 else None
             ),
             preemptive_declaration=specified_encoding,
+            fingerprint=payload_hash,
         )
 
         results.append(current_match)
 
+        if identity_key is not None:
+            identity_verdicts.setdefault(identity_key, (encoding_iana, current_match))
+
         # Cache the successful result for payload-hash deduplication.
-        if decoded_payload is not None and not is_multi_byte_decoder:
+        if payload_hash is not None:
             payload_result_cache.setdefault(
-                hash(decoded_payload),
+                payload_hash,
                 (mean_mess_ratio, cd_ratios_merged, True),
             )
 
@@ -795,14 +1513,15 @@ def from_bytes(
         ):
             # If md says nothing to worry about, then... stop immediately!
             if mean_mess_ratio == 0.0:
-                logger.debug(
+                log.debug(
                     "Encoding detection: %s is most likely the one.",
                     current_match.encoding,
                 )
-                if explain:  # Defensive: ensure exit path clean handler
-                    logger.removeHandler(explain_handler)
-                    logger.setLevel(previous_logger_level)
-                return CharsetMatches([current_match])
+                if speculation is not None:
+                    speculation.close()
+                return _finish_detection(
+                    CharsetMatches([current_match]), tracer, trace, counters
+                )
 
             early_stop_results.append(current_match)
 
@@ -813,15 +1532,16 @@ def from_bytes(
             and "utf_8" in tested
         ):
             probable_result = early_stop_results.best()  # type: ignore[assignment]
-            logger.debug(
+            log.debug(
                 "Encoding detection: %s is most likely the one.",
                 probable_result.encoding,  # type: ignore[union-attr]
             )
-            if explain:  # Defensive: ensure exit path clean handler
-                logger.removeHandler(explain_handler)
-                logger.setLevel(previous_logger_level)
+            if speculation is not None:
+                speculation.close()
 
-            return CharsetMatches([probable_result])
+            return _finish_detection(
+                CharsetMatches([probable_result]), tracer, trace, counters
+            )
 
         # Once we find a result with good coherence (>= 0.5) after testing the
         # prioritized encodings (ascii, utf_8), activate "definitive mode": skip
@@ -839,7 +1559,7 @@ def from_bytes(
             if best_coherence >= 0.5 and "ascii" in tested and "utf_8" in tested:
                 definitive_match_found = True
                 definitive_target_languages.update(target_languages)
-                logger.log(
+                log.log(
                     TRACE,
                     "Definitive match found: %s (chaos=%.3f, coherence=%.2f). Encodings targeting different language families will be skipped.",
                     encoding_iana,
@@ -855,8 +1575,7 @@ def from_bytes(
             not mb_definitive_match_found
             and is_multi_byte_decoder
             and multi_byte_bonus
-            and decoded_payload is not None
-            and len(decoded_payload) < length * 0.98
+            and decoded_ratio < 0.98
             and encoding_iana
             not in {
                 "utf_8",
@@ -873,36 +1592,38 @@ def from_bytes(
             and "utf_8" in tested
         ):
             mb_definitive_match_found = True
-            logger.log(
+            log.log(
                 TRACE,
-                "Multi-byte definitive match: %s (chaos=%.3f, decoded=%d/%d=%.1f%%). Single-byte encodings will be skipped.",
+                "Multi-byte definitive match: %s (chaos=%.3f, decoded=%.1f%%). Single-byte encodings will be skipped.",
                 encoding_iana,
                 mean_mess_ratio,
-                len(decoded_payload),
-                length,
-                len(decoded_payload) / length * 100,
+                decoded_ratio * 100,
             )
 
         if encoding_iana == sig_encoding:
-            logger.debug(
+            log.debug(
                 "Encoding detection: %s is most likely the one as we detected a BOM or SIG within "
                 "the beginning of the sequence.",
                 encoding_iana,
             )
-            if explain:  # Defensive: ensure exit path clean handler
-                logger.removeHandler(explain_handler)
-                logger.setLevel(previous_logger_level)
-            return CharsetMatches([results[encoding_iana]])
+            if speculation is not None:
+                speculation.close()
+            return _finish_detection(
+                CharsetMatches([results[encoding_iana]]), tracer, trace, counters
+            )
+
+    if speculation is not None:
+        speculation.close()
 
     if len(results) == 0:
         if fallback_u8 or fallback_ascii or fallback_specified:
-            logger.log(
+            log.log(
                 TRACE,
                 "Nothing got out of the detection process. Using ASCII/UTF-8/Specified fallback.",
             )
 
         if fallback_specified:
-            logger.debug(
+            log.debug(
                 "Encoding detection: %s will be used as a fallback match",
                 fallback_specified.encoding,
             )
@@ -916,29 +1637,360 @@ def from_bytes(
             )
             or (fallback_u8 is not None)
         ):
-            logger.debug("Encoding detection: utf_8 will be used as a fallback match")
+            log.debug("Encoding detection: utf_8 will be used as a fallback match")
             results.append(fallback_u8)
         elif fallback_ascii:
-            logger.debug("Encoding detection: ascii will be used as a fallback match")
+            log.debug("Encoding detection: ascii will be used as a fallback match")
             results.append(fallback_ascii)
 
+    if interrupted:
+        results._truncated = True
+
     if results:
-        logger.debug(
+        log.debug(
             "Encoding detection: Found %s as plausible (best-candidate) for content. With %i alternatives.",
             results.best().encoding,  # type: ignore
             len(results) - 1,
         )
     else:
-        logger.debug("Encoding detection: Unable to determine any suitable charset.")
+        log.debug("Encoding detection: Unable to determine any suitable charset.")
 
-    if explain:
-        logger.removeHandler(explain_handler)
-        logger.setLevel(previous_logger_level)
+    # Only the best guess keep its decoded str, the alternatives decode it again on demand.
+    for alternative_match in results._results[1:]:
+        alternative_match._unload()
 
-    return results
+    return _finish_detection(results, tracer, trace, counters)
 
 
-def from_fp(
+def _attach_trace(
+    results: CharsetMatches, tracer: DetectionTrace | None
+) -> CharsetMatches:
+    if tracer is not None:
+        tracer.finish()
+        results._trace = tracer
+    return results
+
+
+def _finish_detection(
+    results: CharsetMatches,
+    tracer: DetectionTrace | None,
+    trace: bool,
+    counters: dict[str, int],
+) -> CharsetMatches:
+    """
+    Common exit of a detection: merge its counters into the process-wide ones, hand the phases timings to the
+    registered hooks and attach the trace when asked for.
+    """
+    counters["detections"] += 1
+
+    if results.truncated:
+        counters["truncated"] += 1
+
+    record_counters(counters)
+
+    if tracer is None:
+        return results
+
+    tracer.finish()
+
+    hooks = phase_hooks()
+
+    if hooks:
+        emit_phases(hooks, tracer, results)
+
+    if trace:
+        results._trace = tracer
+
+    return results
+
+
+def _probe_chunks(
+    sequences: bytes | bytearray | memoryview,
+    offsets: range,
+    chunk_size: int,
+    lazy_str: bool,
+) -> list[bytes | bytearray | memoryview]:
+    """
+    Byte chunks that cut_sequence_chunks would probe for a single byte code page.
+    """
+    chunks: list[bytes | bytearray | memoryview] = []
+
+    for i in offsets:
+        if lazy_str and i + chunk_size > len(sequences) + 8:
+            continue
+
+        cut_sequence = sequences[i : i + chunk_size]
+
+        if not cut_sequence:
+            break
+
+        chunks.append(cut_sequence)
+
+    return chunks
+
+
+def _probe_histograms(
+    sequences: bytes | bytearray | memoryview,
+    offsets: range,
+    chunk_size: int,
+    lazy_str: bool,
+) -> list[tuple[list[tuple[int, int]], int]]:
+    """
+    Byte histogram (byte value, count) in order of first appearance, and length of each chunk that
+    cut_sequence_chunks would probe for a single byte code page.
+    """
+    return [
+        (list(Counter(cut_sequence).items()), len(cut_sequence))
+        for cut_sequence in _probe_chunks(sequences, offsets, chunk_size, lazy_str)
+    ]
+
+
+def _rank_candidates(
+    candidate_encodings: list[str],
+    present_bytes_mask: int,
+    chunks: list[bytes | bytearray | memoryview],
+    max_candidates: int,
+    log: logging.Logger = logger,
+) -> list[str]:
+    """
+    Keep the multi byte candidates as is, then the max_candidates single byte ones that best fit the byte
+    unigram and ASCII letter neighbourhood statistics of given chunks according to their
+    single_byte_language_profile, best first.
+    """
+    histogram: Counter[int] = Counter()
+    latin_neighbours: Counter[int] = Counter()
+
+    for chunk in chunks:
+        histogram.update(chunk)
+        latin_neighbours.update(b"".join(RE_LATIN_NEIGHBOUR.findall(chunk)))
+
+    histogram_items: list[tuple[int, int]] = list(histogram.items())
+    latin_neighbours_items: list[tuple[int, int]] = list(latin_neighbours.items())
+
+    multi_byte: list[str] = []
+    scored: list[tuple[float, str]] = []
+
+    for encoding_iana in dict.fromkeys(candidate_encodings):
+        try:
+            if is_multi_byte_encoding(encoding_iana):
+                multi_byte.append(encoding_iana)
+                continue
+            if single_byte_undefined_mask(encoding_iana) & present_bytes_mask:
+                continue
+            score: float = byte_profile_score(
+                histogram_items,
+                latin_neighbours_items,
+                single_byte_language_profile(encoding_iana),
+            )
+        except (LookupError, ImportError):  # Defensive: unavailable codec.
+            continue
+
+        scored.append((score, encoding_iana))
+
+    # Stable: ties keep the prescreen order.
+    scored.sort(key=lambda item: item[0], reverse=True)
+
+    log.log(
+        TRACE,
+        "Byte ranker kept %i single byte code page(s) out of %i: %s",
+        min(max_candidates, len(scored)),
+        len(scored),
+        ", ".join(encoding_iana for _, encoding_iana in scored[:max_candidates]),
+    )
+
+    return multi_byte + [encoding_iana for _, encoding_iana in scored[:max_candidates]]
+
+
+def _free_threaded() -> bool:
+    """
+    Tell whether the interpreter runs without the GIL (free-threaded build, PEP 703).
+    """
+    is_gil_enabled: Callable[[], bool] | None = getattr(sys, "_is_gil_enabled", None)
+
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+# Pools reused by every _SpeculativeValidation of the process, keyed by (free-threaded, workers).
+# Created on first use, shut down at interpreter exit.
+_SPECULATION_POOLS: dict[tuple[bool, int], Executor] = {}
+_SPECULATION_POOLS_PID: int = 0
+_SPECULATION_POOLS_LOCK: Lock = Lock()
+
+
+def _speculation_pool(workers: int) -> Executor:
+    global _SPECULATION_POOLS_PID
+
+    free_threaded: bool = _free_threaded()
+
+    with _SPECULATION_POOLS_LOCK:
+        if _SPECULATION_POOLS_PID != getpid():
+            # Never registered yet, or inherited from a forked parent whose workers are not ours.
+            if not _SPECULATION_POOLS_PID:
+                atexit.register(_shutdown_speculation_pools)
+
+            _SPECULATION_POOLS.clear()
+            _SPECULATION_POOLS_PID = getpid()
+
+        executor: Executor | None = _SPECULATION_POOLS.get((free_threaded, workers))
+
+        if executor is None:
+            executor = _SPECULATION_POOLS[(free_threaded, workers)] = (
+                ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="charset_normalizer"
+                )
+                if free_threaded
+                else ProcessPoolExecutor(max_workers=workers)
+            )
+
+        return executor
+
+
+def _discard_speculation_pool(executor: Executor) -> None:
+    """
+    Forget a pool that broke (a worker died abruptly), the next call creates a new one.
+    """
+    with _SPECULATION_POOLS_LOCK:
+        for key, pooled in list(_SPECULATION_POOLS.items()):
+            if pooled is executor:
+                del _SPECULATION_POOLS[key]
+
+    executor.shutdown(wait=False)
+
+
+def _shutdown_speculation_pools() -> None:
+    with _SPECULATION_POOLS_LOCK:
+        executors: list[Executor] = list(_SPECULATION_POOLS.values())
+        _SPECULATION_POOLS.clear()
+
+    for executor in executors:
+        executor.shutdown(wait=True)
+
+
+def _shared_payload_decode_error(
+    encoding_iana: str, start: int, name: str, length: int
+) -> str | None:
+    """
+    Worker process side of _payload_decode_error, the payload is read in place from the named shared memory block.
+    """
+    segment: SharedMemory = SharedMemory(name=name)
+
+    try:
+        with segment.buf[:length] as sequences:  # type: ignore[index]
+            return _payload_decode_error(encoding_iana, start, sequences)
+    finally:
+        segment.close()
+
+
+def _payload_decode_error(
+    encoding_iana: str, start: int, sequences: bytes | bytearray | memoryview
+) -> str | None:
+    """
+    Strictly decode the payload from given offset. Return the error message (empty if the codec is unavailable),
+    None if it decoded fine.
+    """
+    try:
+        windowed_decode_length(sequences, encoding_iana, start)
+    except UnicodeDecodeError as e:
+        return str(e)
+    except LookupError:  # Defensive:
+        return ""
+
+    return None
+
+
+class _SpeculativeValidation:
+    """
+    Whole payload decode validation of the upcoming candidates of a from_bytes call, run ahead in a pool.
+    Verdicts are requested in the detection loop order, the ones it went past are cancelled.
+    """
+
+    def __init__(
+        self,
+        sequences: bytes | bytearray,
+        workers: int,
+        tasks: list[tuple[str, int]],
+    ):
+        self._sequences: bytes | bytearray = sequences
+        self._executor: Executor = _speculation_pool(workers)
+        self._futures: dict[str, Future[str | None]] = {}
+
+        # Worker processes read the payload in place from a shared memory block instead of
+        # receiving a pickled copy. Threads of a free-threaded build share it as-is.
+        self._segment: SharedMemory | None = None
+
+        if isinstance(self._executor, ProcessPoolExecutor):
+            self._segment = SharedMemory(create=True, size=max(len(sequences), 1))
+            self._segment.buf[: len(sequences)] = sequences  # type: ignore[index]
+
+        for encoding_iana, start in tasks:
+            if self._segment is not None:
+                self._futures[encoding_iana] = self._executor.submit(
+                    _shared_payload_decode_error,
+                    encoding_iana,
+                    start,
+                    self._segment.name,
+                    len(sequences),
+                )
+            else:
+                self._futures[encoding_iana] = self._executor.submit(
+                    _payload_decode_error, encoding_iana, start, sequences
+                )
+
+        self._order: list[str] = list(self._futures)
+        self._positions: dict[str, int] = {
+            encoding_iana: position
+            for position, encoding_iana in enumerate(self._order)
+        }
+        self._cursor: int = 0
+
+    def decode_error(
+        self, encoding_iana: str, start: int = 0, wait: bool = True
+    ) -> str | None:
+        """
+        Return the error message of the strict decode of the payload from given offset, None if it decoded fine.
+        A verdict that did not start yet is computed right away instead of waiting its turn. Without wait,
+        None is returned whenever the verdict is not already known.
+        """
+        future: Future[str | None] | None = self._futures.get(encoding_iana)
+
+        if future is not None:
+            position: int = self._positions[encoding_iana]
+
+            # The detection loop went past those candidates, their verdict is not needed.
+            for left_behind in self._order[self._cursor : position]:
+                self._futures[left_behind].cancel()
+
+            self._cursor = max(self._cursor, position + 1)
+
+            if not future.cancelled():
+                if future.done() or (wait and not future.cancel()):
+                    try:
+                        return future.result()
+                    except BrokenExecutor:  # Defensive: a worker died abruptly.
+                        _discard_speculation_pool(self._executor)
+                else:
+                    future.cancel()
+
+        if not wait:
+            return None
+
+        return _payload_decode_error(encoding_iana, start, self._sequences)
+
+    def close(self) -> None:
+        """
+        Cancel the verdicts not started yet and release the shared payload. The pool is kept for the next call.
+        Verdicts already running in a worker process keep their own mapping of the payload until they end.
+        """
+        for future in self._futures.values():
+            future.cancel()
+
+        if self._segment is not None:
+            self._segment.close()
+            self._segment.unlink()
+            self._segment = None
+
+
+def from_fp(
     fp: BinaryIO,
     steps: int = 5,
     chunk_size: int = 512,
@@ -949,13 +2001,101 @@ def from_fp(
     explain: bool = False,
     language_threshold: float = 0.1,
     enable_fallback: bool = True,
+    partial_read: bool = False,
+    trust_sample: bool = False,
+    timeout: float | None = None,
+    cancel_token: Event | None = None,
+    max_candidates: int | None = None,
+    workers: int | None = None,
+    workers_threshold: int = TOO_BIG_SEQUENCE,
+    materialize: bool = True,
+    cache: DetectionCache | PersistentDetectionCache | None = None,
+    trace: bool = False,
 ) -> CharsetMatches:
     """
     Same thing than the function from_bytes but using a file pointer that is already ready.
     Will not close the file pointer.
+
+    With partial_read set to True, a large seekable file (see TOO_BIG_SEQUENCE) is memory mapped instead of
+    being read at once, so that only the byte windows needed by the detection are loaded. Combine it with
+    trust_sample to skip the whole payload validation. The matches raw payload is then the mmap object.
+    The optional timeout does not include the time spent reading the file.
+
+    With a PersistentDetectionCache as cache, the identity of a regular file (device, inode, size, mtime) is
+    recorded along the verdict. The next call on the unchanged file reuse it without hashing nor detecting the
+    content.
     """
+
+    file_key: FileKey | None = (
+        cache.file_key(fp) if isinstance(cache, PersistentDetectionCache) else None
+    )
+
+    if isinstance(cache, PersistentDetectionCache) and file_key is not None:
+        parameters: tuple[Any, ...] = _cache_parameters(
+            steps,
+            chunk_size,
+            threshold,
+            cp_isolation,
+            cp_exclusion,
+            preemptive_behaviour,
+            language_threshold,
+            enable_fallback,
+            trust_sample,
+            max_candidates,
+        )
+
+        # Loaded just like without a cache: an unchanged file is matched from its identity alone,
+        # without hashing nor detecting its content, and no map outlives the call unless asked.
+        mapped: mmap | None = _map_file(fp) if partial_read else None
+        sequences: bytes = mapped if mapped is not None else fp.read()  # type: ignore[assignment]
+
+        results: CharsetMatches | None = cache.lookup_file(
+            file_key, parameters, sequences
+        )
+        tracer: DetectionTrace | None = DetectionTrace(cached=True) if trace else None
+
+        if results is None:
+            cache_key: PersistentKey = cache.key(sequences, *parameters)
+            results = cache.lookup(cache_key, sequences)
+
+            if results is None:
+                results = from_bytes(
+                    sequences,
+                    steps,
+                    chunk_size,
+                    threshold,
+                    cp_isolation,
+                    cp_exclusion,
+                    preemptive_behaviour,
+                    explain,
+                    language_threshold,
+                    enable_fallback,
+                    cancel_token=cancel_token,
+                    trust_sample=trust_sample,
+                    timeout=timeout,
+                    max_candidates=max_candidates,
+                    workers=workers,
+                    workers_threshold=workers_threshold,
+                    trace=trace,
+                )
+
+                # An interrupted detection is not a verdict worth remembering.
+                if results.truncated:
+                    return _release_matches(results, materialize)
+
+                cache.store(cache_key, results)
+                # The fresh detection carries its own trace.
+                tracer = None
+
+            cache.store_file(file_key, cache_key)
+
+        return _release_matches(_attach_trace(results, tracer), materialize)
+
+    payload: mmap | None = _map_file(fp) if partial_read else None
+    sequences = payload if payload is not None else fp.read()  # type: ignore[assignment]
+
     return from_bytes(
-        fp.read(),
+        sequences,
         steps,
         chunk_size,
         threshold,
@@ -965,9 +2105,53 @@ def from_fp(
         explain,
         language_threshold,
         enable_fallback,
+        cancel_token=cancel_token,
+        trust_sample=trust_sample,
+        timeout=timeout,
+        max_candidates=max_candidates,
+        workers=workers,
+        workers_threshold=workers_threshold,
+        materialize=materialize,
+        cache=cache,
+        trace=trace,
     )
 
 
+def _release_matches(results: CharsetMatches, materialize: bool) -> CharsetMatches:
+    """
+    Drop the decoded str of the matches, as from_bytes would have for the given materialize value.
+    """
+    for match in results._results[0 if not materialize else 1 :]:
+        match._unload(materialize)
+
+    return results
+
+
+def _map_file(fp: BinaryIO, minimum_size: int = TOO_BIG_SEQUENCE) -> mmap | None:
+    """
+    Memory map the remaining content of given file pointer if it is large enough (minimum_size) to benefit from it.
+    Return None when the file cannot be mapped (pipe, socket, in-memory buffer, ...).
+    """
+    try:
+        if not fp.seekable() or fp.tell() != 0:
+            return None
+
+        fileno: int = fp.fileno()
+        size: int = fstat(fileno).st_size
+
+        if size < minimum_size:
+            return None
+
+        mapped: mmap = mmap(fileno, 0, access=ACCESS_READ)
+    except (AttributeError, OSError, UnsupportedOperation, ValueError):
+        return None
+
+    # Mimic fp.read() by moving the cursor at the end.
+    fp.seek(0, 2)
+
+    return mapped
+
+
 def from_path(
     path: str | bytes | PathLike,  # type: ignore[type-arg]
     steps: int = 5,
@@ -979,6 +2163,16 @@ def from_path(
     explain: bool = False,
     language_threshold: float = 0.1,
     enable_fallback: bool = True,
+    partial_read: bool = False,
+    trust_sample: bool = False,
+    timeout: float | None = None,
+    cancel_token: Event | None = None,
+    max_candidates: int | None = None,
+    workers: int | None = None,
+    workers_threshold: int = TOO_BIG_SEQUENCE,
+    materialize: bool = True,
+    cache: DetectionCache | PersistentDetectionCache | None = None,
+    trace: bool = False,
 ) -> CharsetMatches:
     """
     Same thing than the function from_bytes but with one extra step. Opening and reading given file path in binary mode.
@@ -996,6 +2190,16 @@ def from_path(
             explain,
             language_threshold,
             enable_fallback,
+            partial_read,
+            trust_sample,
+            timeout,
+            cancel_token,
+            max_candidates,
+            workers,
+            workers_threshold,
+            materialize,
+            cache,
+            trace,
         )
 
 
@@ -1010,6 +2214,10 @@ def is_binary(
     explain: bool = False,
     language_threshold: float = 0.1,
     enable_fallback: bool = False,
+    partial_read: bool = False,
+    trust_sample: bool = False,
+    timeout: float | None = None,
+    cancel_token: Event | None = None,
 ) -> bool:
     """
     Detect if the given input (file, bytes, or path) points to a binary file. aka. not a string.
@@ -1028,6 +2236,10 @@ def is_binary(
             explain=explain,
             language_threshold=language_threshold,
             enable_fallback=enable_fallback,
+            partial_read=partial_read,
+            trust_sample=trust_sample,
+            timeout=timeout,
+            cancel_token=cancel_token,
         )
     elif isinstance(
         fp_or_path_or_payload,
@@ -1047,6 +2259,9 @@ def is_binary(
             explain=explain,
             language_threshold=language_threshold,
             enable_fallback=enable_fallback,
+            trust_sample=trust_sample,
+            timeout=timeout,
+            cancel_token=cancel_token,
         )
     else:
         guesses = from_fp(
@@ -1060,6 +2275,261 @@ def is_binary(
             explain=explain,
             language_threshold=language_threshold,
             enable_fallback=enable_fallback,
+            partial_read=partial_read,
+            trust_sample=trust_sample,
+            timeout=timeout,
+            cancel_token=cancel_token,
+        )
+
+    return not guesses
+
+
+# Bounded pool running the detections scheduled by the asyncio entry points
+# (afrom_bytes, afrom_path, ais_binary). Created lazily on first use.
+_ASYNC_EXECUTOR: ThreadPoolExecutor | None = None
+_ASYNC_EXECUTOR_LOCK: Lock = Lock()
+
+
+def _async_executor() -> ThreadPoolExecutor:
+    global _ASYNC_EXECUTOR
+
+    with _ASYNC_EXECUTOR_LOCK:
+        if _ASYNC_EXECUTOR is None:
+            _ASYNC_EXECUTOR = ThreadPoolExecutor(
+                max_workers=min(4, cpu_count() or 1),
+                thread_name_prefix="charset_normalizer",
+            )
+        return _ASYNC_EXECUTOR
+
+
+def _read_path(path: str | bytes | PathLike) -> bytes:  # type: ignore[type-arg]
+    with open(path, "rb") as fp:
+        return fp.read()
+
+
+async def afrom_bytes(
+    sequences: bytes | bytearray,
+    steps: int = 5,
+    chunk_size: int = 512,
+    threshold: float = 0.2,
+    cp_isolation: list[str] | None = None,
+    cp_exclusion: list[str] | None = None,
+    preemptive_behaviour: bool = True,
+    explain: bool = False,
+    language_threshold: float = 0.1,
+    enable_fallback: bool = True,
+    executor: Executor | None = None,
+) -> CharsetMatches:
+    """
+    Asyncio flavour of the function from_bytes. The detection runs in a bounded thread pool (or in the given
+    executor) so that the event loop is never blocked.
+    Cancelling the awaiting task also stops the detection itself as soon as the current code page is evaluated.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    cancel_token = Event()
+
+    try:
+        return await loop.run_in_executor(
+            executor or _async_executor(),
+            partial(
+                from_bytes,
+                sequences,
+                steps,
+                chunk_size,
+                threshold,
+                cp_isolation,
+                cp_exclusion,
+                preemptive_behaviour,
+                explain,
+                language_threshold,
+                enable_fallback,
+                cancel_token=cancel_token,
+            ),
+        )
+    except asyncio.CancelledError:
+        cancel_token.set()
+        raise
+
+
+async def afrom_path(
+    path: str | bytes | PathLike,  # type: ignore[type-arg]
+    steps: int = 5,
+    chunk_size: int = 512,
+    threshold: float = 0.20,
+    cp_isolation: list[str] | None = None,
+    cp_exclusion: list[str] | None = None,
+    preemptive_behaviour: bool = True,
+    explain: bool = False,
+    language_threshold: float = 0.1,
+    enable_fallback: bool = True,
+    executor: Executor | None = None,
+) -> CharsetMatches:
+    """
+    Asyncio flavour of the function from_path. The file is read without blocking the event loop.
+    Can raise IOError.
+    """
+    import asyncio
+
+    sequences: bytes = await asyncio.get_running_loop().run_in_executor(
+        executor or _async_executor(), _read_path, path
+    )
+
+    return await afrom_bytes(
+        sequences,
+        steps,
+        chunk_size,
+        threshold,
+        cp_isolation,
+        cp_exclusion,
+        preemptive_behaviour,
+        explain,
+        language_threshold,
+        enable_fallback,
+        executor,
+    )
+
+
+async def ais_binary(
+    fp_or_path_or_payload: PathLike | str | BinaryIO | bytes,  # type: ignore[type-arg]
+    steps: int = 5,
+    chunk_size: int = 512,
+    threshold: float = 0.20,
+    cp_isolation: list[str] | None = None,
+    cp_exclusion: list[str] | None = None,
+    preemptive_behaviour: bool = True,
+    explain: bool = False,
+    language_threshold: float = 0.1,
+    enable_fallback: bool = False,
+    executor: Executor | None = None,
+) -> bool:
+    """
+    Asyncio flavour of the function is_binary. Files and file pointers are read without blocking the event loop.
+    """
+    import asyncio
+
+    sequences: bytes | bytearray
+
+    if isinstance(fp_or_path_or_payload, (str, PathLike)):
+        sequences = await asyncio.get_running_loop().run_in_executor(
+            executor or _async_executor(), _read_path, fp_or_path_or_payload
         )
+    elif isinstance(
+        fp_or_path_or_payload,
+        (
+            bytes,
+            bytearray,
+        ),
+    ):
+        sequences = fp_or_path_or_payload
+    else:
+        sequences = await asyncio.get_running_loop().run_in_executor(
+            executor or _async_executor(), fp_or_path_or_payload.read
+        )
+
+    guesses = await afrom_bytes(
+        sequences,
+        steps,
+        chunk_size,
+        threshold,
+        cp_isolation,
+        cp_exclusion,
+        preemptive_behaviour,
+        explain,
+        language_threshold,
+        enable_fallback,
+        executor,
+    )
 
     return not guesses
+
+
+def from_bytes_many(
+    payloads: Iterable[bytes | bytearray],
+    steps: int = 5,
+    chunk_size: int = 512,
+    threshold: float = 0.2,
+    cp_isolation: list[str] | None = None,
+    cp_exclusion: list[str] | None = None,
+    preemptive_behaviour: bool = True,
+    language_threshold: float = 0.1,
+    enable_fallback: bool = True,
+    max_workers: int | None = None,
+    batch_size: int = 16,
+    ordered: bool = True,
+    cache: PersistentDetectionCache | None = None,
+) -> Iterator[tuple[int, CompactCharsetMatch | None]]:
+    """
+    Detect the charset of many raw bytes sequences at once using a pool of worker processes.
+    Yield tuples (index, best_guess) where index is the position of the payload in the given iterable and
+    best_guess a CompactCharsetMatch (or None if the payload is most likely binary).
+    Payloads are sent to the workers by batches of batch_size. When ordered is False, results are yielded
+    as soon as they are available instead of following the input order.
+    max_workers defaults to the number of CPUs available.
+    Give a PersistentDetectionCache as cache to share the verdicts between the workers and with later calls.
+    """
+    # The batch helpers import this module, hence the late import.
+    from .batch import batch_detect, detect_compact
+
+    return batch_detect(
+        detect_compact,
+        payloads,
+        {
+            "steps": steps,
+            "chunk_size": chunk_size,
+            "threshold": threshold,
+            "cp_isolation": cp_isolation,
+            "cp_exclusion": cp_exclusion,
+            "preemptive_behaviour": preemptive_behaviour,
+            "language_threshold": language_threshold,
+            "enable_fallback": enable_fallback,
+            "cache": cache,
+        },
+        max_workers,
+        batch_size,
+        ordered,
+    )
+
+
+def from_paths(
+    paths: Iterable[str | bytes | PathLike],  # type: ignore[type-arg]
+    steps: int = 5,
+    chunk_size: int = 512,
+    threshold: float = 0.20,
+    cp_isolation: list[str] | None = None,
+    cp_exclusion: list[str] | None = None,
+    preemptive_behaviour: bool = True,
+    language_threshold: float = 0.1,
+    enable_fallback: bool = True,
+    max_workers: int | None = None,
+    batch_size: int = 16,
+    ordered: bool = True,
+    cache: PersistentDetectionCache | None = None,
+) -> Iterator[tuple[int, CompactCharsetMatch | None]]:
+    """
+    Same thing than the function from_bytes_many but the workers open and read the given file paths themselves.
+    Only the paths and the compact results cross the process boundary. With a PersistentDetectionCache as cache,
+    unchanged files (same device, inode, size and mtime) are not detected again.
+    Can raise IOError.
+    """
+    from .batch import batch_detect, detect_path_compact
+
+    return batch_detect(
+        detect_path_compact,
+        paths,
+        {
+            "steps": steps,
+            "chunk_size": chunk_size,
+            "threshold": threshold,
+            "cp_isolation": cp_isolation,
+            "cp_exclusion": cp_exclusion,
+            "preemptive_behaviour": preemptive_behaviour,
+            "language_threshold": language_threshold,
+            "enable_fallback": enable_fallback,
+            "cache": cache,
+        },
+        max_workers,
+        batch_size,
+        ordered,
+    )
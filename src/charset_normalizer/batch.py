@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from os import PathLike, cpu_count
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from .api import IANA_SUPPORTED_MB_FIRST, from_bytes, from_path
+from .cd import encoding_languages
+from .md import mess_ratio
+from .models import CompactCharsetMatch
+from .utils import is_multi_byte_encoding
+
+# Helpers that run the detection of many payloads (or paths) in a pool of worker processes.
+# Shared by from_bytes_many, from_paths, the CLI and the detection server.
+
+
+def batch_worker_initializer() -> None:
+    """
+    Warm up, once per worker process, the per-codepoint and per-codec caches that the detection
+    would otherwise build lazily on the first few payloads.
+    """
+    for encoding_iana in IANA_SUPPORTED_MB_FIRST:
+        try:
+            if is_multi_byte_encoding(encoding_iana):
+                continue
+            encoding_languages(encoding_iana)
+            mess_ratio(bytes(range(128, 256)).decode(encoding_iana, errors="ignore"))
+        except (
+            LookupError,
+            ImportError,
+        ):  # Defensive: codec unavailable on this build.
+            continue
+
+
+def detect_compact(
+    payload: bytes | bytearray, kwargs: dict[str, Any]
+) -> CompactCharsetMatch | None:
+    best_guess = from_bytes(payload, **kwargs).best()
+    return best_guess.compact() if best_guess is not None else None
+
+
+def detect_path_compact(
+    path: str | bytes | PathLike,  # type: ignore[type-arg]
+    kwargs: dict[str, Any],
+) -> CompactCharsetMatch | None:
+    best_guess = from_path(path, **kwargs).best()
+    return best_guess.compact() if best_guess is not None else None
+
+
+_T = TypeVar("_T")
+
+
+def detect_batch(
+    task: Callable[[Any, dict[str, Any]], _T],
+    batch: list[tuple[int, Any]],
+    kwargs: dict[str, Any],
+) -> list[tuple[int, _T]]:
+    return [(index, task(item, kwargs)) for index, item in batch]
+
+
+def batch_detect(
+    task: Callable[[Any, dict[str, Any]], CompactCharsetMatch | None],
+    items: Iterable[Any],
+    kwargs: dict[str, Any],
+    max_workers: int | None,
+    batch_size: int,
+    ordered: bool,
+) -> Iterator[tuple[int, CompactCharsetMatch | None]]:
+    if batch_size < 1:
+        raise ValueError("batch_size must be greater or equal to 1")
+
+    if max_workers is None:
+        max_workers = cpu_count() or 1
+    elif max_workers < 1:
+        raise ValueError("max_workers must be greater or equal to 1")
+
+    return iter_batch_results(task, items, kwargs, max_workers, batch_size, ordered)
+
+
+def iter_batch_results(
+    task: Callable[[Any, dict[str, Any]], _T],
+    items: Iterable[Any],
+    kwargs: dict[str, Any],
+    max_workers: int,
+    batch_size: int,
+    ordered: bool,
+) -> Iterator[tuple[int, _T]]:
+    indexed_items = enumerate(items)
+
+    # Only keep a bounded amount of batches in flight: the input iterable may be
+    # huge (or endless) and we do not want to hold every payload in RAM at once.
+    max_in_flight: int = 2 * max_workers
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=batch_worker_initializer
+    ) as executor:
+        in_flight: deque[Future[list[tuple[int, _T]]]] = deque()
+
+        def submit_next() -> bool:
+            batch = list(islice(indexed_items, batch_size))
+            if not batch:
+                return False
+            in_flight.append(executor.submit(detect_batch, task, batch, kwargs))
+            return True
+
+        exhausted: bool = False
+
+        while True:
+            while not exhausted and len(in_flight) < max_in_flight:
+                exhausted = not submit_next()
+
+            if not in_flight:
+                break
+
+            if ordered:
+                yield from in_flight.popleft().result()
+                continue
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                in_flight.remove(future)
+                yield from future.result()
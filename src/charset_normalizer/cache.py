@@ -0,0 +1,725 @@
+from __future__ import annotations
+
+import json
+from collections import OrderedDict
+from hashlib import blake2b
+from io import UnsupportedOperation
+from os import PathLike, fspath, fstat, getpid, stat
+from stat import S_ISREG
+from sys import getsizeof
+from threading import Lock, local
+from time import monotonic, time, time_ns
+from typing import TYPE_CHECKING, Any, BinaryIO, Hashable, Tuple
+
+from .cd import coherence_ratio, histogram_coherence_ratio
+from .md import mess_ratio
+from .models import CharsetMatch, CharsetMatches, CoherenceMatches
+
+if TYPE_CHECKING:
+    import sqlite3
+
+# Rough per entry overhead (key, OrderedDict node, tuple, floats...) in byte(s).
+# Used to estimate the memory footprint of an entry, not meant to be exact.
+ENTRY_OVERHEAD: int = 256
+
+
+class BoundedCache:
+    """
+    Thread-safe LRU mapping bounded by the (estimated) size in byte(s) of what it holds.
+    Entries may expire after ttl second(s). Keep track of hits, misses and evictions.
+    """
+
+    def __init__(self, max_size: int, ttl: float | None = None):
+        if max_size <= 0:
+            raise ValueError("max_size must be a positive integer")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be a positive number of seconds or None")
+
+        self.max_size: int = max_size
+        self.ttl: float | None = ttl
+
+        self._lock: Lock = Lock()
+        self._entries: OrderedDict[Hashable, tuple[Any, int, float | None]] = (
+            OrderedDict()
+        )
+        self._size: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[2] is not None and entry[2] <= monotonic():
+                self._discard(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        # Something larger than the whole cache would evict everything else, for nothing.
+        if size > self.max_size:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+
+            self._entries[key] = (
+                value,
+                size,
+                monotonic() + self.ttl if self.ttl is not None else None,
+            )
+            self._size += size
+
+            while self._size > self.max_size:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Drop every entry and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self, reset: bool = False) -> dict[str, int]:
+        """
+        Snapshot of the counters and occupancy. With reset set to True, the counters are zeroed in the same
+        step (the entries are kept).
+        """
+        with self._lock:
+            snapshot = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size": self._size,
+                "max_size": self.max_size,
+            }
+
+            if reset:
+                self.hits = 0
+                self.misses = 0
+                self.evictions = 0
+
+            return snapshot
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _discard(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+
+# (encoding, chaos, bom, languages, preemptive_declaration)
+FrozenMatch = Tuple[str, float, bool, CoherenceMatches, "str | None"]
+
+
+class DetectionCache(BoundedCache):
+    """
+    Opt-in cache of detection results shared across from_bytes calls. Pass it using the cache argument.
+    Results are keyed by a digest of the payload and the detection parameters. Neither the payload nor the
+    decoded str are retained, only the verdict. Bounded by max_size byte(s) (estimated), entries can expire
+    after ttl second(s). Safe to share between threads.
+    """
+
+    def __init__(self, max_size: int = 4 * 1024 * 1024, ttl: float | None = None):
+        super().__init__(max_size, ttl)
+
+    @staticmethod
+    def key(sequences: bytes | bytearray | memoryview, *parameters: Any) -> Hashable:
+        """
+        Compute the cache key of a payload given the detection parameters (must be hashable).
+        """
+        return blake2b(sequences, digest_size=16).digest(), len(sequences), parameters
+
+    def lookup(
+        self, key: Hashable, sequences: bytes | bytearray | memoryview
+    ) -> CharsetMatches | None:
+        """
+        Rebuild the CharsetMatches stored under given key, bound to given payload. None if absent.
+        """
+        entry: tuple[tuple[FrozenMatch, tuple[FrozenMatch, ...]], ...] | None = (
+            self.get(key)
+        )
+
+        if entry is None:
+            return None
+
+        return _thaw_results(entry, sequences)
+
+    def store(self, key: Hashable, results: CharsetMatches) -> None:
+        """
+        Save the verdict (not the payload) of given results under key.
+        """
+        entry = _freeze_results(results)
+
+        self.put(
+            key,
+            entry,
+            ENTRY_OVERHEAD
+            + sum(
+                ENTRY_OVERHEAD * (1 + len(frozen_submatches))
+                + 64 * len(frozen_match[3])
+                for frozen_match, frozen_submatches in entry
+            ),
+        )
+
+
+def _freeze_results(
+    results: CharsetMatches,
+) -> tuple[tuple[FrozenMatch, tuple[FrozenMatch, ...]], ...]:
+    return tuple(
+        (_freeze(match), tuple(_freeze(submatch) for submatch in match.submatch))
+        for match in results
+    )
+
+
+def _thaw_results(
+    entry: Any, sequences: bytes | bytearray | memoryview
+) -> CharsetMatches:
+    results: CharsetMatches = CharsetMatches()
+
+    for frozen_match, frozen_submatches in entry:
+        match: CharsetMatch = _thaw(frozen_match, sequences)
+
+        for frozen_submatch in frozen_submatches:
+            match.add_submatch(_thaw(frozen_submatch, sequences))
+
+        # The stored order is already the sorted one.
+        results._results.append(match)
+
+    return results
+
+
+def _freeze(match: CharsetMatch) -> FrozenMatch:
+    return (
+        match.encoding,
+        match.chaos,
+        match.bom,
+        match._languages,
+        match._preemptive_declaration,
+    )
+
+
+def _thaw(
+    frozen: FrozenMatch, sequences: bytes | bytearray | memoryview
+) -> CharsetMatch:
+    encoding, chaos, bom, languages, preemptive_declaration = frozen
+
+    return CharsetMatch(
+        sequences,
+        encoding,
+        chaos,
+        bom,
+        # Verdicts loaded from a PersistentDetectionCache went through JSON, tuples came back as lists.
+        [(language, ratio) for language, ratio in languages],
+        None,
+        preemptive_declaration=preemptive_declaration,
+    )
+
+
+# (st_dev, st_ino, st_size, st_mtime_ns)
+FileKey = Tuple[int, int, int, int]
+# (payload digest, payload length, parameters repr)
+PersistentKey = Tuple[bytes, int, str]
+
+# A file modified less than this amount of nanosecond(s) ago may still change without its mtime moving
+# (coarse timestamps), its identity is not recorded yet.
+RACY_MTIME_WINDOW: int = 2 * 10**9
+
+_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    digest BLOB NOT NULL,
+    length INTEGER NOT NULL,
+    parameters TEXT NOT NULL,
+    verdict TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (digest, length, parameters)
+);
+CREATE INDEX IF NOT EXISTS verdicts_last_used ON verdicts (last_used);
+CREATE TABLE IF NOT EXISTS files (
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    parameters TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest BLOB NOT NULL,
+    PRIMARY KEY (device, inode, parameters),
+    FOREIGN KEY (digest, size, parameters)
+        REFERENCES verdicts (digest, length, parameters) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS files_verdict ON files (digest, size, parameters);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT NOT NULL PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO counters SELECT 'verdicts', COUNT(*) FROM verdicts
+    WHERE NOT EXISTS (SELECT 1 FROM counters WHERE name = 'verdicts');
+CREATE TRIGGER IF NOT EXISTS verdicts_inserted AFTER INSERT ON verdicts BEGIN
+    UPDATE counters SET value = value + 1 WHERE name = 'verdicts';
+END;
+CREATE TRIGGER IF NOT EXISTS verdicts_deleted AFTER DELETE ON verdicts BEGIN
+    UPDATE counters SET value = value - 1 WHERE name = 'verdicts';
+END;
+"""
+
+# One SQLite connection per (thread, database), shared by every PersistentDetectionCache instance
+# (including the copies unpickled in worker processes) of that thread. Dropped after a fork.
+_CONNECTIONS: local = local()
+
+
+class PersistentDetectionCache:
+    """
+    Opt-in on-disk (SQLite) cache of detection results, shared across calls, processes and runs. Pass it using
+    the cache argument, just like a DetectionCache. Only the verdict is stored, keyed by a digest of the payload
+    and the detection parameters.
+
+    Through from_fp, from_path and from_paths it also records the identity of the files (device, inode, size and
+    mtime): an unchanged file is matched without reading its content. Holds at most max_entries verdicts, the least
+    recently used ones are evicted first. Safe to share between threads and processes (SQLite WAL journal), it can
+    be pickled to be sent to worker processes. The hits and misses counters are per process.
+    """
+
+    def __init__(
+        self,
+        path: str | PathLike,  # type: ignore[type-arg]
+        max_entries: int = 100_000,
+        timeout: float = 30.0,
+    ):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be a positive integer")
+
+        self.path: str = fspath(path)
+        self.max_entries: int = max_entries
+        self.timeout: float = timeout
+
+        self._lock: Lock = Lock()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+        # Fail early if the database cannot be opened.
+        self._connection()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "max_entries": self.max_entries,
+            "timeout": self.timeout,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    def _connection(self) -> sqlite3.Connection:
+        import sqlite3
+
+        connections: dict[str, tuple[int, sqlite3.Connection]] | None = getattr(
+            _CONNECTIONS, "connections", None
+        )
+
+        if connections is None:
+            connections = _CONNECTIONS.connections = {}
+
+        entry = connections.get(self.path)
+
+        if entry is not None and entry[0] == getpid():
+            return entry[1]
+
+        connection = sqlite3.connect(
+            self.path, timeout=self.timeout, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        connection.executescript(_SCHEMA)
+
+        connections[self.path] = (getpid(), connection)
+
+        return connection
+
+    @staticmethod
+    def key(
+        sequences: bytes | bytearray | memoryview, *parameters: Any
+    ) -> PersistentKey:
+        """
+        Compute the cache key of a payload given the detection parameters (must have a stable repr).
+        """
+        return (
+            blake2b(sequences, digest_size=16).digest(),
+            len(sequences),
+            repr(parameters),
+        )
+
+    @staticmethod
+    def file_key(
+        file: BinaryIO | str | bytes | PathLike,  # type: ignore[type-arg]
+    ) -> FileKey | None:
+        """
+        Identify a regular file, given its path or a file pointer positioned at its start. None if it cannot be.
+        """
+        try:
+            if isinstance(file, (str, bytes, PathLike)):
+                stat_result = stat(file)
+            else:
+                if not file.seekable() or file.tell() != 0:
+                    return None
+                stat_result = fstat(file.fileno())
+        except (AttributeError, OSError, UnsupportedOperation, ValueError):
+            return None
+
+        if not S_ISREG(stat_result.st_mode):
+            return None
+
+        return (
+            stat_result.st_dev,
+            stat_result.st_ino,
+            stat_result.st_size,
+            stat_result.st_mtime_ns,
+        )
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def lookup(
+        self, key: Hashable, sequences: bytes | bytearray | memoryview
+    ) -> CharsetMatches | None:
+        """
+        Rebuild the CharsetMatches stored under given key, bound to given payload. None if absent.
+        """
+        import sqlite3
+
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                "SELECT verdict FROM verdicts WHERE digest = ? AND length = ? AND parameters = ?",
+                key,  # type: ignore[arg-type]
+            ).fetchone()
+
+            if row is not None:
+                connection.execute(
+                    "UPDATE verdicts SET last_used = ? WHERE digest = ? AND length = ? AND parameters = ?",
+                    (time(), *key),  # type: ignore[misc]
+                )
+        except sqlite3.DatabaseError:  # Defensive: an unusable cache is a missed one.
+            row = None
+
+        self._count(row is not None)
+
+        if row is None:
+            return None
+
+        return _thaw_results(json.loads(row[0]), sequences)
+
+    def lookup_file(
+        self,
+        file_key: FileKey,
+        parameters: tuple[Any, ...],
+        sequences: bytes | bytearray | memoryview,
+    ) -> CharsetMatches | None:
+        """
+        Rebuild the CharsetMatches recorded for given file identity and detection parameters, bound to given
+        payload (the content of the file). None if the file is unknown or changed since.
+        """
+        import sqlite3
+
+        if len(sequences) != file_key[2]:
+            return None
+
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                "SELECT verdicts.verdict, verdicts.digest FROM files JOIN verdicts"
+                " ON verdicts.digest = files.digest AND verdicts.length = files.size"
+                " AND verdicts.parameters = files.parameters"
+                " WHERE files.device = ? AND files.inode = ? AND files.parameters = ?"
+                " AND files.size = ? AND files.mtime_ns = ?",
+                (file_key[0], file_key[1], repr(parameters), file_key[2], file_key[3]),
+            ).fetchone()
+
+            if row is not None:
+                connection.execute(
+                    "UPDATE verdicts SET last_used = ? WHERE digest = ? AND length = ? AND parameters = ?",
+                    (time(), row[1], file_key[2], repr(parameters)),
+                )
+        except sqlite3.DatabaseError:  # Defensive: an unusable cache is a missed one.
+            return None
+
+        # A miss is not counted, the caller fallback on the digest lookup.
+        if row is None:
+            return None
+
+        self._count(True)
+
+        return _thaw_results(json.loads(row[0]), sequences)
+
+    def store(self, key: Hashable, results: CharsetMatches) -> None:
+        """
+        Save the verdict (not the payload) of given results under key, evicting the least recently used
+        verdicts beyond max_entries.
+        """
+        import sqlite3
+
+        try:
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR IGNORE INTO verdicts VALUES (?, ?, ?, ?, ?)",
+                (*key, json.dumps(_freeze_results(results)), time()),  # type: ignore[misc]
+            )
+
+            # Kept up to date by triggers, unlike COUNT(*) it does not scan the table.
+            excess: int = self._entries(connection) - self.max_entries
+
+            if excess > 0:
+                connection.execute(
+                    "DELETE FROM verdicts WHERE rowid IN"
+                    " (SELECT rowid FROM verdicts ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+
+                with self._lock:
+                    self.evictions += excess
+        except (
+            sqlite3.DatabaseError
+        ):  # Defensive: a verdict that is not saved will be computed again.
+            pass
+
+    def store_file(self, file_key: FileKey, key: PersistentKey) -> None:
+        """
+        Record that the file identified by file_key has the content (and parameters) of given stored key.
+        """
+        import sqlite3
+
+        # Coarse timestamps: the file could still change without its mtime moving.
+        if time_ns() - file_key[3] < RACY_MTIME_WINDOW:
+            return
+
+        digest, length, parameters = key
+
+        if length != file_key[2]:
+            return
+
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                (file_key[0], file_key[1], parameters, length, file_key[3], digest),
+            )
+        except (
+            sqlite3.DatabaseError
+        ):  # Defensive: including a verdict not stored (e.g. truncated detection).
+            pass
+
+    def clear(self) -> None:
+        """
+        Drop every entry and reset the counters.
+        """
+        self._connection().execute("DELETE FROM verdicts")
+
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self),
+                "files": self._connection()
+                .execute("SELECT COUNT(*) FROM files")
+                .fetchone()[0],
+                "max_entries": self.max_entries,
+            }
+
+    @staticmethod
+    def _entries(connection: sqlite3.Connection) -> int:
+        return connection.execute(  # type: ignore[no-any-return]
+            "SELECT value FROM counters WHERE name = 'verdicts'"
+        ).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._entries(self._connection())
+
+
+class ShardedBoundedCache:
+    """
+    BoundedCache split into shards picked by the key hash, each one with its own lock and an equal part of
+    max_size. Concurrent threads seldom wait on the same lock while the whole stays bounded by max_size.
+    """
+
+    def __init__(
+        self, max_size: int, shard_min_size: int = 512 * 1024, shards: int = 16
+    ):
+        if max_size <= 0:
+            raise ValueError("max_size must be a positive integer")
+
+        self._shard_min_size: int = shard_min_size
+        self._shards_count: int = shards
+        self._shards: list[BoundedCache] = self._new_shards(max_size)
+
+    def _new_shards(self, max_size: int) -> list[BoundedCache]:
+        # A small cache is not worth splitting, each shard must fit more than a handful of entries.
+        count: int = max(1, min(self._shards_count, max_size // self._shard_min_size))
+
+        return [
+            BoundedCache(max_size // count + (1 if i < max_size % count else 0))
+            for i in range(count)
+        ]
+
+    @property
+    def max_size(self) -> int:
+        return sum(shard.max_size for shard in self._shards)
+
+    @max_size.setter
+    def max_size(self, max_size: int) -> None:
+        # Readers either see the previous shards or the new (empty) ones, never a mix.
+        self._shards = self._new_shards(max_size)
+
+    def get(self, key: Hashable) -> Any | None:
+        shards = self._shards
+        return shards[hash(key) % len(shards)].get(key)
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        shards = self._shards
+        shards[hash(key) % len(shards)].put(key, value, size)
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            shard.clear()
+
+    def stats(self, reset: bool = False) -> dict[str, int]:
+        """
+        Counters and occupancy summed over the shards. With reset set to True, the counters are zeroed.
+        """
+        snapshot: dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "entries": 0,
+            "size": 0,
+            "max_size": 0,
+        }
+
+        for shard in self._shards:
+            for key, value in shard.stats(reset).items():
+                snapshot[key] += value
+
+        return snapshot
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
+# Process-wide caches of the per chunk measurements, shared by every from_bytes call.
+# Identical chunks (boilerplate, license headers, markup skeletons) are measured once.
+# Sharded so that concurrent detections (free-threaded builds) rarely contend on a lock.
+MESS_RATIO_CACHE: ShardedBoundedCache = ShardedBoundedCache(8 * 1024 * 1024)
+COHERENCE_RATIO_CACHE: ShardedBoundedCache = ShardedBoundedCache(8 * 1024 * 1024)
+
+_CHUNK_CACHES_LOCK: Lock = Lock()
+_CHUNK_CACHES_ENABLED: bool = True
+
+
+def configure_chunk_caches(enabled: bool = True, max_size: int | None = None) -> None:
+    """
+    Enable or disable the process-wide mess_ratio and coherence_ratio chunk caches, and optionally set the
+    maximum (estimated) size in byte(s) of each one. When disabled, a fresh cache is used per from_bytes call.
+    Changing the configuration drop what was cached so far.
+    """
+    global _CHUNK_CACHES_ENABLED
+
+    if max_size is not None and max_size <= 0:
+        raise ValueError("max_size must be a positive integer")
+
+    with _CHUNK_CACHES_LOCK:
+        for chunk_cache in (MESS_RATIO_CACHE, COHERENCE_RATIO_CACHE):
+            chunk_cache.clear()
+            if max_size is not None:
+                chunk_cache.max_size = max_size
+
+        _CHUNK_CACHES_ENABLED = enabled
+
+
+def chunk_caches_enabled() -> bool:
+    return _CHUNK_CACHES_ENABLED
+
+
+def chunk_caches_stats(reset: bool = False) -> dict[str, dict[str, int]]:
+    """
+    Hits, misses, evictions and size of the process-wide chunk caches. Optionally reset the counters.
+    """
+    return {
+        "mess_ratio": MESS_RATIO_CACHE.stats(reset),
+        "coherence_ratio": COHERENCE_RATIO_CACHE.stats(reset),
+    }
+
+
+def cached_mess_ratio(
+    decoded_sequence: str, maximum_threshold: float = 0.2, debug: bool = False
+) -> float:
+    # The debug mode is all about its side effect (logging), never skip it.
+    if debug:
+        return mess_ratio(decoded_sequence, maximum_threshold, debug)
+
+    key = (decoded_sequence, maximum_threshold)
+    ratio: float | None = MESS_RATIO_CACHE.get(key)
+
+    if ratio is None:
+        ratio = mess_ratio(decoded_sequence, maximum_threshold)
+        MESS_RATIO_CACHE.put(key, ratio, ENTRY_OVERHEAD + getsizeof(decoded_sequence))
+
+    return ratio
+
+
+def cached_coherence_ratio(
+    decoded_sequence: str,
+    threshold: float = 0.1,
+    lg_inclusion: str | None = None,
+    byte_histogram: list[tuple[int, int]] | None = None,
+    decoding_table: tuple[str | None, ...] | None = None,
+    chunk_cache: BoundedCache | ShardedBoundedCache = COHERENCE_RATIO_CACHE,
+) -> CoherenceMatches:
+    """
+    coherence_ratio through a chunk cache (the process-wide one by default). For a chunk decoded with a single
+    byte code page, give its byte_histogram and the decoding_table so that a miss is computed without str work.
+    """
+    key = (decoded_sequence, threshold, lg_inclusion)
+    languages: CoherenceMatches | None = chunk_cache.get(key)
+
+    if languages is None:
+        if byte_histogram is not None and decoding_table is not None:
+            languages = histogram_coherence_ratio(
+                byte_histogram, decoding_table, threshold, lg_inclusion
+            )
+        if languages is None:
+            languages = coherence_ratio(decoded_sequence, threshold, lg_inclusion)
+        chunk_cache.put(
+            key,
+            languages,
+            ENTRY_OVERHEAD + getsizeof(decoded_sequence) + 64 * len(languages),
+        )
+
+    return languages
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import importlib
 from codecs import IncrementalDecoder
-from functools import lru_cache
 
 from .constant import (
     FREQUENCIES,
+    IANA_SUPPORTED_COUNT,
     KO_NAMES,
     LANGUAGE_SUPPORTED_COUNT,
     TOO_SMALL_SEQUENCE,
@@ -13,11 +13,20 @@ from .constant import (
     _FREQUENCIES_SET,
     _FREQUENCIES_RANK,
 )
-from .md import _ASCII_CHAR_INFO, _char_info, is_suspiciously_successive_range
+from .md import (
+    _ASCII_CHAR_INFO,
+    _CHAR_INFO_CACHE,
+    _CHAR_INFO_LOOKUPS,
+    CharInfo,
+    _char_info,
+    is_suspiciously_successive_range,
+)
 from .models import CoherenceMatches
 from .utils import (
+    _memoized,
     is_multi_byte_encoding,
     is_unicode_range_secondary,
+    single_byte_decoding_table,
 )
 
 
@@ -86,7 +95,7 @@ def unicode_range_languages(primary_range: str) -> list[str]:
     return languages
 
 
-@lru_cache()
+@_memoized(maxsize=128)
 def encoding_languages(iana_name: str) -> list[str]:
     """
     Single-byte encoding language association. Some code page are heavily linked to particular language(s).
@@ -110,7 +119,94 @@ def encoding_languages(iana_name: str) -> list[str]:
     return unicode_range_languages(primary_range)
 
 
-@lru_cache()
+@_memoized(maxsize=IANA_SUPPORTED_COUNT)
+def single_byte_language_profile(
+    iana_name: str,
+) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    """
+    Compact byte profile of a single byte code page, derived from FREQUENCIES, as two 256 entries tables.
+    The first one weight each byte that does not decode as in ASCII by the popularity rank of the letter it decode
+    into among the languages the code page targets (1. for the most common lower case one); foreign letters weight
+    nothing, symbols and undefined or unprintable characters are penalized. The second one tell whether a 8-bit
+    byte is expected next to an ASCII letter: 1. when it decode into a Latin letter, -1. for any other letter.
+    """
+    target_languages: list[str] = encoding_languages(iana_name)
+
+    if "Latin Based" in target_languages:
+        target_languages = [
+            language for language in FREQUENCIES if get_target_features(language)[1]
+        ]
+
+    best_ranks: dict[str, float] = {}
+
+    for language in target_languages:
+        language_characters: list[str] = FREQUENCIES[language]
+
+        for rank, character in enumerate(language_characters):
+            weight: float = 1.0 - rank / len(language_characters)
+
+            if weight > best_ranks.get(character, 0.0):
+                best_ranks[character] = weight
+
+    letter_weights: list[float] = []
+    latin_affinity: list[float] = []
+
+    for i, decoded in enumerate(single_byte_decoding_table(iana_name)):
+        if i < 0x80 and decoded == chr(i):
+            letter_weights.append(0.0)
+            latin_affinity.append(0.0)
+            continue
+
+        if decoded is None:
+            letter_weights.append(-1.0)
+            latin_affinity.append(-1.0)
+            continue
+
+        info: CharInfo = _char_info(decoded)
+
+        if info.alpha:
+            # Running text is mostly lower case.
+            letter_weights.append(
+                best_ranks.get(decoded.lower(), 0.0) * (0.25 if info.upper else 1.0)
+            )
+            latin_affinity.append(1.0 if info.latin else -1.0)
+        else:
+            letter_weights.append(
+                -1.0 if not info.printable and not info.space else -0.5
+            )
+            latin_affinity.append(0.0)
+
+    return tuple(letter_weights), tuple(latin_affinity)
+
+
+def byte_profile_score(
+    histogram: list[tuple[int, int]],
+    latin_neighbours: list[tuple[int, int]],
+    profile: tuple[tuple[float, ...], tuple[float, ...]],
+) -> float:
+    """
+    Score a byte histogram (byte value, count) against a single_byte_language_profile. latin_neighbours count,
+    for each 8-bit byte value, how many times it was seen next to an ASCII letter. The higher, the better.
+    """
+    letter_weights, latin_affinity = profile
+
+    score: float = 0.0
+    byte_count: int = 0
+
+    for byte_value, count in histogram:
+        score += letter_weights[byte_value] * count
+        byte_count += count
+
+    if not byte_count:
+        return 0.0
+
+    for byte_value, count in latin_neighbours:
+        score += latin_affinity[byte_value] * count
+
+    return score / byte_count
+
+
+@_memoized(maxsize=128)
 def mb_encoding_languages(iana_name: str) -> list[str]:
     """
     Multi-byte encoding language association. Some code page are heavily linked to particular language(s).
@@ -131,7 +227,7 @@ def mb_encoding_languages(iana_name: str) -> list[str]:
     return []
 
 
-@lru_cache(maxsize=LANGUAGE_SUPPORTED_COUNT)
+@_memoized(maxsize=LANGUAGE_SUPPORTED_COUNT)
 def get_target_features(language: str) -> tuple[bool, bool]:
     """
     Determine main aspects from a supported language if it contains accents and if is pure Latin.
@@ -296,6 +392,8 @@ def alpha_unicode_split(decoded_sequence: str) -> list[str]:
     prev_character_range: str | None = None
     prev_layer_target: str | None = None
 
+    char_info_hits: int = 0
+
     for character in decoded_sequence:
         # Reuse the per-codepoint CharInfo cache: info.alpha and info.range
         # are computed with the very same str.isalpha() / unicode_range()
@@ -304,7 +402,12 @@ def alpha_unicode_split(decoded_sequence: str) -> list[str]:
         if codepoint < 128:
             info = _ASCII_CHAR_INFO[codepoint]
         else:
-            info = _char_info(character)
+            cached_info = _CHAR_INFO_CACHE.get(character)
+            if cached_info is not None:
+                info = cached_info
+                char_info_hits += 1
+            else:
+                info = _char_info(character)
 
         if not info.alpha:
             continue
@@ -349,6 +452,8 @@ def alpha_unicode_split(decoded_sequence: str) -> list[str]:
         prev_character_range = character_range
         prev_layer_target = layer_target_range
 
+    _CHAR_INFO_LOOKUPS[0] += char_info_hits
+
     return ["".join(chars).lower() for chars in layers.values()]
 
 
@@ -414,7 +519,88 @@ def coherence_ratio(
     Detect ANY language that can be identified in given sequence. The sequence will be analysed by layers.
     A layer = Character extraction by alphabets/ranges.
     """
+    layers_counts: list[dict[str, int]] = []
+
+    for layer in alpha_unicode_split(decoded_sequence):
+        # Native counting + stable sort reproduce Counter.most_common()
+        # ordering exactly (ties keep first-appearance order) without the
+        # interpreted Counter machinery in the compiled hot path.
+        char_counts: dict[str, int] = {}
+        for layer_character in layer:
+            char_counts[layer_character] = char_counts.get(layer_character, 0) + 1
+
+        layers_counts.append(char_counts)
+
+    return _layers_coherence(layers_counts, threshold, lg_inclusion)
+
+
+def histogram_coherence_ratio(
+    histogram: list[tuple[int, int]],
+    decoding_table: tuple[str | None, ...],
+    threshold: float = 0.1,
+    lg_inclusion: str | None = None,
+) -> CoherenceMatches | None:
+    """
+    Same as coherence_ratio, for a chunk decoded with a single byte code page, computed from its byte histogram
+    (byte value, count) in order of first appearance and the decoding table of the code page. No str is built.
+    Return None when it cannot be computed that way (undefined byte, context sensitive lowercasing).
+    """
+    layers_counts: dict[str, dict[str, int]] = {}
+    range_layers: dict[str, str] = {}
+
+    for byte_value, count in histogram:
+        character: str | None = decoding_table[byte_value]
+
+        if character is None:
+            return None
+
+        codepoint: int = ord(character)
+        info: CharInfo = (
+            _ASCII_CHAR_INFO[codepoint] if codepoint < 128 else _char_info(character)
+        )
 
+        if not info.alpha:
+            continue
+
+        character_range: str | None = info.range
+
+        if character_range is None:
+            continue
+
+        # The final sigma rule of str.lower() depends on what follow.
+        if character == "\u03a3":
+            return None
+
+        # A range is bound to a layer on its first appearance and stay there,
+        # see alpha_unicode_split.
+        layer_target_range: str | None = range_layers.get(character_range)
+
+        if layer_target_range is None:
+            for discovered_range in layers_counts:
+                if not is_suspiciously_successive_range(
+                    discovered_range, character_range
+                ):
+                    layer_target_range = discovered_range
+                    break
+            else:
+                layer_target_range = character_range
+                layers_counts[layer_target_range] = {}
+
+            range_layers[character_range] = layer_target_range
+
+        char_counts: dict[str, int] = layers_counts[layer_target_range]
+
+        for layer_character in character.lower():
+            char_counts[layer_character] = char_counts.get(layer_character, 0) + count
+
+    return _layers_coherence(list(layers_counts.values()), threshold, lg_inclusion)
+
+
+def _layers_coherence(
+    layers_counts: list[dict[str, int]],
+    threshold: float,
+    lg_inclusion: str | None,
+) -> CoherenceMatches:
     results: list[tuple[str, float]] = []
     ignore_non_latin: bool = False
 
@@ -425,15 +611,8 @@ def coherence_ratio(
         ignore_non_latin = True
         lg_inclusion_list.remove("Latin Based")
 
-    for layer in alpha_unicode_split(decoded_sequence):
-        # Native counting + stable sort reproduce Counter.most_common()
-        # ordering exactly (ties keep first-appearance order) without the
-        # interpreted Counter machinery in the compiled hot path.
-        char_counts: dict[str, int] = {}
-        for layer_character in layer:
-            char_counts[layer_character] = char_counts.get(layer_character, 0) + 1
-
-        character_count: int = len(layer)
+    for char_counts in layers_counts:
+        character_count: int = sum(char_counts.values())
 
         if character_count <= TOO_SMALL_SEQUENCE:
             continue
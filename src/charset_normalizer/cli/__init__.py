@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 from .__main__ import cli_detect, query_yes_no
+from .serve import DetectionServer, cli_serve
 
 __all__ = (
+    "DetectionServer",
     "cli_detect",
+    "cli_serve",
     "query_yes_no",
 )
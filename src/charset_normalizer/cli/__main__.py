@@ -3,12 +3,31 @@ from __future__ import annotations
 import argparse
 import sys
 import typing
-from os.path import abspath, basename, dirname, join, realpath
+from contextlib import nullcontext
+from fnmatch import fnmatch
+from json import dumps
+from os import environ, makedirs, remove, replace, walk
+from os.path import (
+    abspath,
+    basename,
+    dirname,
+    expanduser,
+    isdir,
+    isfile,
+    join,
+    realpath,
+    relpath,
+)
 from platform import python_version
+from shutil import copymode
+from tempfile import NamedTemporaryFile
 from unicodedata import unidata_version
 
 import charset_normalizer.md as md_module
 from charset_normalizer import from_fp
+from charset_normalizer.batch import iter_batch_results
+from charset_normalizer.cache import PersistentDetectionCache
+from charset_normalizer.cli.serve import cli_serve
 from charset_normalizer.models import CliDetectionResult
 from charset_normalizer.version import __version__
 
@@ -87,12 +106,242 @@ class FileType:
         return f"{type(self).__name__}({args_str})"
 
 
+def default_cache_path() -> str:
+    """Location of the CLI on-disk detection cache, within the user cache directory."""
+    if sys.platform == "win32":
+        cache_home = environ.get("LOCALAPPDATA") or expanduser("~\\AppData\\Local")
+    else:
+        cache_home = environ.get("XDG_CACHE_HOME") or expanduser("~/.cache")
+
+    return join(cache_home, "charset_normalizer", "detections.sqlite3")
+
+
+def _matches_any(path: str, patterns: list[str]) -> bool:
+    """Tell if either the file name or the given relative path matches one of the glob patterns."""
+    name = basename(path)
+    return any(fnmatch(name, pattern) or fnmatch(path, pattern) for pattern in patterns)
+
+
+def iter_input_paths(
+    entries: list[str],
+    recursive: bool = False,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+) -> typing.Iterator[str]:
+    """
+    Lazily yield the files to be analysed. Directories are walked (in a stable order) when recursive is set.
+    The include/exclude glob patterns are matched against the name and the path relative to the walked directory
+    of the files found while walking, excluded directories are not descended into.
+    Files given explicitly are always yielded.
+    """
+    for entry in entries:
+        if not recursive or not isdir(entry):
+            yield entry
+            continue
+
+        for root, dir_names, file_names in walk(entry):
+            if exclude:
+                dir_names[:] = [
+                    dir_name
+                    for dir_name in dir_names
+                    if not _matches_any(
+                        relpath(join(root, dir_name), entry).replace("\\", "/"),
+                        exclude,
+                    )
+                ]
+
+            dir_names.sort()
+
+            for file_name in sorted(file_names):
+                file_path = join(root, file_name)
+                relative_path = relpath(file_path, entry).replace("\\", "/")
+
+                if include and not _matches_any(relative_path, include):
+                    continue
+                if exclude and _matches_any(relative_path, exclude):
+                    continue
+                if not isfile(file_path):
+                    continue
+
+                yield file_path
+
+
+def _write_atomically(match: typing.Any, source_path: str, target_path: str) -> None:
+    """
+    Write the unicode output of the match next to the target then rename it over the target,
+    so that a reader never sees a partially written file, even when the source itself is replaced.
+    """
+    with NamedTemporaryFile(
+        "wb",
+        dir=dirname(target_path),
+        prefix="." + basename(target_path) + ".",
+        suffix=".tmp",
+        delete=False,
+    ) as fp:
+        tmp_path = fp.name
+
+        try:
+            match.output_to(fp)
+        except BaseException:
+            fp.close()
+            remove(tmp_path)
+            raise
+
+    try:
+        copymode(source_path, tmp_path)
+        replace(tmp_path, target_path)
+    except BaseException:
+        remove(tmp_path)
+        raise
+
+
+def detect_file(
+    path: str, options: dict[str, typing.Any]
+) -> tuple[list[dict[str, typing.Any]], bool]:
+    """
+    Detect (and normalize if asked) a single file. Return its CliDetectionResult entries as plain dict, ready
+    to be serialized, and whether an I/O error occurred. Runs either in the main process or in a worker one.
+    """
+    file_name: str = "<stdin>"
+
+    try:
+        with (
+            nullcontext(sys.stdin.buffer) if path == "-" else open(path, "rb")
+        ) as my_file:
+            if path != "-":
+                file_name = my_file.name
+
+            matches = from_fp(
+                my_file,
+                threshold=options["threshold"],
+                explain=options["verbose"],
+                preemptive_behaviour=options["no_preemptive"] is False,
+                cache=options["cache"],
+            )
+    except OSError as e:
+        print(str(e), file=sys.stderr)
+        return [], True
+
+    best_guess = matches.best()
+
+    if best_guess is None:
+        print(
+            'Unable to identify originating encoding for "{}". {}'.format(
+                file_name,
+                (
+                    "Maybe try increasing maximum amount of chaos."
+                    if options["threshold"] < 1.0
+                    else ""
+                ),
+            ),
+            file=sys.stderr,
+        )
+        return [
+            CliDetectionResult(
+                abspath(file_name),
+                None,
+                [],
+                [],
+                "Unknown",
+                [],
+                False,
+                1.0,
+                0.0,
+                None,
+                True,
+            ).__dict__
+        ], False
+
+    cli_result = CliDetectionResult(
+        abspath(file_name),
+        best_guess.encoding,
+        best_guess.encoding_aliases,
+        [cp for cp in best_guess.could_be_from_charset if cp != best_guess.encoding],
+        best_guess.language,
+        best_guess.alphabets,
+        best_guess.bom,
+        best_guess.percent_chaos,
+        best_guess.percent_coherence,
+        None,
+        True,
+    )
+    x_ = [cli_result]
+
+    if len(matches) > 1 and options["alternatives"]:
+        for el in matches:
+            if el != best_guess:
+                x_.append(
+                    CliDetectionResult(
+                        abspath(file_name),
+                        el.encoding,
+                        el.encoding_aliases,
+                        [cp for cp in el.could_be_from_charset if cp != el.encoding],
+                        el.language,
+                        el.alphabets,
+                        el.bom,
+                        el.percent_chaos,
+                        el.percent_coherence,
+                        None,
+                        False,
+                    )
+                )
+
+    failed: bool = False
+
+    if options["normalize"] is True:
+        if best_guess.encoding.startswith("utf") is True:
+            print(
+                '"{}" file does not need to be normalized, as it already came from unicode.'.format(
+                    file_name
+                ),
+                file=sys.stderr,
+            )
+        elif path == "-":
+            print("Cannot normalize the standard input.", file=sys.stderr)
+        else:
+            dir_path = dirname(realpath(file_name))
+            o_: list[str] = basename(realpath(file_name)).split(".")
+
+            if options["replace"] is False:
+                o_.insert(-1, best_guess.encoding)
+
+            if (
+                options["replace"] is False
+                or options["force"] is True
+                or query_yes_no(
+                    'Are you sure to normalize "{}" by replacing it ?'.format(
+                        file_name
+                    ),
+                    "no",
+                )
+                is True
+            ):
+                try:
+                    cli_result.unicode_path = join(dir_path, ".".join(o_))
+                    _write_atomically(
+                        best_guess, realpath(file_name), cli_result.unicode_path
+                    )
+                except OSError as e:  # Defensive:
+                    print(str(e), file=sys.stderr)
+                    cli_result.unicode_path = None
+                    failed = True
+
+    return [el.__dict__ for el in x_], failed
+
+
 def cli_detect(argv: list[str] | None = None) -> int:
     """
     CLI assistant using ARGV and ArgumentParser
     :param argv:
     :return: 0 if everything is fine, anything else equal trouble
     """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # A file named "serve" can still be analysed as ./serve
+    if argv and argv[0] == "serve":
+        return cli_serve(argv[1:])
+
     parser = argparse.ArgumentParser(
         description="The Real First Universal Charset Detector. "
         "Discover originating encoding used on text file. "
@@ -100,7 +349,9 @@ def cli_detect(argv: list[str] | None = None) -> int:
     )
 
     parser.add_argument(
-        "files", type=FileType("rb"), nargs="+", help="File(s) to be analysed"
+        "files",
+        nargs="+",
+        help="File(s) to be analysed, or directories along with --recursive",
     )
     parser.add_argument(
         "-v",
@@ -125,7 +376,8 @@ def cli_detect(argv: list[str] | None = None) -> int:
         action="store_true",
         default=False,
         dest="normalize",
-        help="Permit to normalize input file. If not set, program does not write anything.",
+        help="Permit to normalize input file. If not set, program does not write anything "
+        "(but the detection cache, when enabled).",
     )
     parser.add_argument(
         "-m",
@@ -168,6 +420,70 @@ def cli_detect(argv: list[str] | None = None) -> int:
         dest="threshold",
         help="Define a custom maximum amount of noise allowed in decoded content. 0. <= noise <= 1.",
     )
+    parser.add_argument(
+        "-R",
+        "--recursive",
+        action="store_true",
+        default=False,
+        dest="recursive",
+        help="Walk the given directories and analyse every file found in them.",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        dest="include",
+        metavar="GLOB",
+        help="Only analyse the files found in directories matching this pattern. Can be repeated.",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        dest="exclude",
+        metavar="GLOB",
+        help="Skip the files and directories matching this pattern while walking directories. Can be repeated.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        default=1,
+        type=int,
+        dest="jobs",
+        help="Number of worker processes analysing (and normalizing) the files in parallel.",
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        default=False,
+        dest="jsonl",
+        help="Output one JSON object per line as soon as each file is analysed, in completion order.",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        default=False,
+        dest="cache",
+        help="Reuse and record detection results in an on-disk cache, "
+        "charset_normalizer/detections.sqlite3 in the user cache directory.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        dest="no_cache",
+        help="Neither reuse nor record detection results in the on-disk cache. "
+        "Takes precedence over --cache and --cache-path.",
+    )
+    parser.add_argument(
+        "--cache-path",
+        action="store",
+        default=None,
+        dest="cache_path",
+        metavar="PATH",
+        help="Location of the on-disk cache of detection results. Implies --cache.",
+    )
     parser.add_argument(
         "--version",
         action="version",
@@ -182,181 +498,118 @@ def cli_detect(argv: list[str] | None = None) -> int:
 
     args = parser.parse_args(argv)
 
+    for entry in args.files:
+        if args.recursive and isdir(entry):
+            continue
+        # Fail early, the same way an argument of type FileType would.
+        try:
+            my_file = FileType("rb")(entry)
+        except argparse.ArgumentTypeError as e:
+            parser.error(f"argument files: {e}")
+        if my_file is not sys.stdin.buffer:
+            my_file.close()
+
     if args.replace is True and args.normalize is False:
-        if args.files:
-            for my_file in args.files:
-                my_file.close()
         print("Use --replace in addition of --normalize only.", file=sys.stderr)
         return 1
 
     if args.force is True and args.replace is False:
-        if args.files:
-            for my_file in args.files:
-                my_file.close()
         print("Use --force in addition of --replace only.", file=sys.stderr)
         return 1
 
     if args.threshold < 0.0 or args.threshold > 1.0:
-        if args.files:
-            for my_file in args.files:
-                my_file.close()
         print("--threshold VALUE should be between 0. AND 1.", file=sys.stderr)
         return 1
 
-    x_ = []
+    if args.jobs < 1:
+        print("--jobs VALUE should be greater or equal to 1.", file=sys.stderr)
+        return 1
 
-    for my_file in args.files:
-        matches = from_fp(
-            my_file,
-            threshold=args.threshold,
-            explain=args.verbose,
-            preemptive_behaviour=args.no_preemptive is False,
+    if args.jobs > 1 and args.replace is True and args.force is False:
+        print(
+            "Use --force along with --replace when --jobs is greater than 1.",
+            file=sys.stderr,
         )
+        return 1
+
+    if args.jobs > 1 and "-" in args.files:
+        print(
+            "The standard input cannot be analysed along with --jobs.", file=sys.stderr
+        )
+        return 1
 
-        best_guess = matches.best()
+    cache: PersistentDetectionCache | None = None
 
-        if best_guess is None:
+    if (args.cache is True or args.cache_path is not None) and args.no_cache is False:
+        # Only required along with the detection cache, like PersistentDetectionCache does.
+        import sqlite3
+
+        cache_path: str = args.cache_path or default_cache_path()
+
+        try:
+            makedirs(dirname(abspath(cache_path)), exist_ok=True)
+            cache = PersistentDetectionCache(cache_path)
+        except (OSError, sqlite3.Error) as e:
             print(
-                'Unable to identify originating encoding for "{}". {}'.format(
-                    my_file.name,
-                    (
-                        "Maybe try increasing maximum amount of chaos."
-                        if args.threshold < 1.0
-                        else ""
-                    ),
-                ),
+                f"Unable to use the detection cache at {cache_path}: {e}",
                 file=sys.stderr,
             )
-            x_.append(
-                CliDetectionResult(
-                    abspath(my_file.name),
-                    None,
-                    [],
-                    [],
-                    "Unknown",
-                    [],
-                    False,
-                    1.0,
-                    0.0,
-                    None,
-                    True,
-                )
-            )
-        else:
-            cli_result = CliDetectionResult(
-                abspath(my_file.name),
-                best_guess.encoding,
-                best_guess.encoding_aliases,
-                [
-                    cp
-                    for cp in best_guess.could_be_from_charset
-                    if cp != best_guess.encoding
-                ],
-                best_guess.language,
-                best_guess.alphabets,
-                best_guess.bom,
-                best_guess.percent_chaos,
-                best_guess.percent_coherence,
-                None,
-                True,
-            )
-            x_.append(cli_result)
-
-            if len(matches) > 1 and args.alternatives:
-                for el in matches:
-                    if el != best_guess:
-                        x_.append(
-                            CliDetectionResult(
-                                abspath(my_file.name),
-                                el.encoding,
-                                el.encoding_aliases,
-                                [
-                                    cp
-                                    for cp in el.could_be_from_charset
-                                    if cp != el.encoding
-                                ],
-                                el.language,
-                                el.alphabets,
-                                el.bom,
-                                el.percent_chaos,
-                                el.percent_coherence,
-                                None,
-                                False,
-                            )
-                        )
-
-            if args.normalize is True:
-                if best_guess.encoding.startswith("utf") is True:
-                    print(
-                        '"{}" file does not need to be normalized, as it already came from unicode.'.format(
-                            my_file.name
-                        ),
-                        file=sys.stderr,
-                    )
-                    if my_file.closed is False:
-                        my_file.close()
-                    continue
 
-                dir_path = dirname(realpath(my_file.name))
-                file_name = basename(realpath(my_file.name))
-
-                o_: list[str] = file_name.split(".")
-
-                if args.replace is False:
-                    o_.insert(-1, best_guess.encoding)
-                    if my_file.closed is False:
-                        my_file.close()
-                elif (
-                    args.force is False
-                    and query_yes_no(
-                        'Are you sure to normalize "{}" by replacing it ?'.format(
-                            my_file.name
-                        ),
-                        "no",
-                    )
-                    is False
-                ):
-                    if my_file.closed is False:
-                        my_file.close()
-                    continue
+    options: dict[str, typing.Any] = {
+        "threshold": args.threshold,
+        "verbose": args.verbose,
+        "no_preemptive": args.no_preemptive,
+        "alternatives": args.alternatives,
+        "normalize": args.normalize,
+        "replace": args.replace,
+        "force": args.force,
+        "cache": cache,
+    }
 
-                try:
-                    cli_result.unicode_path = join(dir_path, ".".join(o_))
+    paths = iter_input_paths(args.files, args.recursive, args.include, args.exclude)
 
-                    with open(cli_result.unicode_path, "wb") as fp:
-                        fp.write(best_guess.output())
-                except OSError as e:  # Defensive:
-                    print(str(e), file=sys.stderr)
-                    if my_file.closed is False:
-                        my_file.close()
-                    return 2
+    results: typing.Iterable[tuple[int, tuple[list[dict[str, typing.Any]], bool]]]
 
-        if my_file.closed is False:
-            my_file.close()
+    if args.jobs == 1:
+        results = ((i, detect_file(path, options)) for i, path in enumerate(paths))
+    else:
+        results = iter_batch_results(
+            detect_file,
+            paths,
+            options,
+            args.jobs,
+            1,
+            args.jsonl is False,
+        )
+
+    x_: list[dict[str, typing.Any]] = []
+    failed: bool = False
 
-    if args.minimal is False:
-        from json import dumps
+    for _, (file_results, file_failed) in results:
+        failed = failed or file_failed
 
+        if args.jsonl is True:
+            for el in file_results:
+                print(dumps(el, ensure_ascii=True), flush=True)
+        elif args.minimal is True:
+            if file_results:
+                print(
+                    ", ".join([el["encoding"] or "undefined" for el in file_results]),
+                    flush=True,
+                )
+        else:
+            x_.extend(file_results)
+
+    if args.jsonl is False and args.minimal is False:
         print(
             dumps(
-                [el.__dict__ for el in x_] if len(x_) > 1 else x_[0].__dict__,
+                x_ if len(x_) != 1 else x_[0],
                 ensure_ascii=True,
                 indent=4,
             )
         )
-    else:
-        for my_file in args.files:
-            print(
-                ", ".join(
-                    [
-                        el.encoding or "undefined"
-                        for el in x_
-                        if el.path == abspath(my_file.name)
-                    ]
-                )
-            )
 
-    return 0
+    return 2 if failed else 0
 
 
 if __name__ == "__main__":  # Defensive:
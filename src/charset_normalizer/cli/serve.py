@@ -0,0 +1,740 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import signal
+import sys
+from bisect import bisect_left
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor
+from functools import partial
+from hashlib import blake2b
+from json import dumps
+from multiprocessing import get_all_start_methods, get_context
+from os import cpu_count
+from time import monotonic
+from types import TracebackType
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+from charset_normalizer.batch import (
+    batch_worker_initializer,
+    detect_batch,
+    detect_compact,
+)
+from charset_normalizer.cache import ENTRY_OVERHEAD, BoundedCache
+from charset_normalizer.models import CompactCharsetMatch
+
+if TYPE_CHECKING:
+    if sys.version_info >= (3, 11):
+        from typing import Self
+    else:
+        from typing_extensions import Self
+
+# Upper bounds in second(s) of the request latency histogram buckets.
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+HTTP_REASONS: dict[int, str] = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    411: "Length Required",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+ENDPOINTS: tuple[str, ...] = ("/detect", "/metrics", "/health")
+
+
+class ServerMetrics:
+    """
+    Counters and request latency histogram of a DetectionServer, rendered in the Prometheus text format.
+    """
+
+    def __init__(self) -> None:
+        self.started_at: float = monotonic()
+
+        self.requests: dict[tuple[str, int], int] = {}
+        self.latency_buckets: list[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum: float = 0.0
+
+        # Detections actually run by the workers (cache misses that were not coalesced).
+        self.detections: int = 0
+        self.detected_bytes: int = 0
+        self.coalesced: int = 0
+        self.batches: int = 0
+        self.batched_payloads: int = 0
+
+    def observe_request(self, endpoint: str, status: int, duration: float) -> None:
+        key = (endpoint, status)
+        self.requests[key] = self.requests.get(key, 0) + 1
+        self.latency_buckets[bisect_left(LATENCY_BUCKETS, duration)] += 1
+        self.latency_sum += duration
+
+    def render(self, cache_stats: dict[str, int], in_flight: int) -> str:
+        lines: list[str] = [
+            "# TYPE charset_normalizer_uptime_seconds gauge",
+            f"charset_normalizer_uptime_seconds {monotonic() - self.started_at:.3f}",
+            "# TYPE charset_normalizer_requests_total counter",
+        ]
+
+        for (endpoint, status), count in sorted(self.requests.items()):
+            lines.append(
+                f'charset_normalizer_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}'
+            )
+
+        lines.append("# TYPE charset_normalizer_request_duration_seconds histogram")
+
+        cumulative: int = 0
+
+        for bound, count in zip(
+            [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"], self.latency_buckets
+        ):
+            cumulative += count
+            lines.append(
+                f'charset_normalizer_request_duration_seconds_bucket{{le="{bound}"}} {cumulative}'
+            )
+
+        lines += [
+            f"charset_normalizer_request_duration_seconds_sum {self.latency_sum:.6f}",
+            f"charset_normalizer_request_duration_seconds_count {cumulative}",
+            "# TYPE charset_normalizer_detections_total counter",
+            f"charset_normalizer_detections_total {self.detections}",
+            "# TYPE charset_normalizer_detected_bytes_total counter",
+            f"charset_normalizer_detected_bytes_total {self.detected_bytes}",
+            "# TYPE charset_normalizer_coalesced_total counter",
+            f"charset_normalizer_coalesced_total {self.coalesced}",
+            "# TYPE charset_normalizer_batches_total counter",
+            f"charset_normalizer_batches_total {self.batches}",
+            "# TYPE charset_normalizer_batched_payloads_total counter",
+            f"charset_normalizer_batched_payloads_total {self.batched_payloads}",
+            "# TYPE charset_normalizer_in_flight gauge",
+            f"charset_normalizer_in_flight {in_flight}",
+            "# TYPE charset_normalizer_cache_hits_total counter",
+            f"charset_normalizer_cache_hits_total {cache_stats['hits']}",
+            "# TYPE charset_normalizer_cache_misses_total counter",
+            f"charset_normalizer_cache_misses_total {cache_stats['misses']}",
+            "# TYPE charset_normalizer_cache_evictions_total counter",
+            f"charset_normalizer_cache_evictions_total {cache_stats['evictions']}",
+            "# TYPE charset_normalizer_cache_entries gauge",
+            f"charset_normalizer_cache_entries {cache_stats['entries']}",
+        ]
+
+        return "\n".join(lines) + "\n"
+
+
+def result_document(best_guess: CompactCharsetMatch | None) -> dict[str, Any]:
+    """
+    The JSON document answered for a detection, shaped like the CLI output (minus the file related entries).
+    """
+    if best_guess is None:
+        return {
+            "encoding": None,
+            "encoding_aliases": [],
+            "alternative_encodings": [],
+            "language": "Unknown",
+            "has_sig_or_bom": False,
+            "chaos": 1.0,
+            "coherence": 0.0,
+        }
+
+    return {
+        "encoding": best_guess.encoding,
+        "encoding_aliases": best_guess.encoding_aliases,
+        "alternative_encodings": best_guess.submatch,
+        "language": best_guess.language,
+        "has_sig_or_bom": best_guess.bom,
+        "chaos": best_guess.percent_chaos,
+        "coherence": best_guess.percent_coherence,
+    }
+
+
+class DetectionServer:
+    """
+    Asyncio HTTP/1.1 server exposing the detection on a TCP port and/or a Unix domain socket.
+
+    POST /detect with the raw payload as body to get the best guess as JSON. GET /metrics for the Prometheus
+    metrics, GET /health to check that the server is up.
+
+    Detections run in a pool of worker processes with warmed up caches (unless an executor is given).
+    Payloads smaller than batch_threshold byte(s) are gathered for up to batch_delay second(s), or batch_size
+    payloads, and sent to the workers together. Concurrent requests for an identical payload share a single
+    detection, and the verdicts are kept in a cache of cache_size byte(s) (estimated) keyed by a digest.
+
+    A connection waits up to keep_alive_timeout second(s) for the next request line, then the headers and the body
+    must be received within request_timeout second(s). Requests with more than max_headers header fields are
+    rejected.
+    """
+
+    def __init__(
+        self,
+        jobs: int | None = None,
+        threshold: float = 0.2,
+        preemptive_behaviour: bool = True,
+        cache_size: int = 16 * 1024 * 1024,
+        batch_threshold: int = 64 * 1024,
+        batch_size: int = 16,
+        batch_delay: float = 0.002,
+        max_body_size: int = 64 * 1024 * 1024,
+        keep_alive_timeout: float = 15.0,
+        request_timeout: float = 60.0,
+        max_headers: int = 100,
+        executor: Executor | None = None,
+    ):
+        if jobs is not None and jobs < 1:
+            raise ValueError("jobs must be a positive integer or None")
+        if batch_size < 1:
+            raise ValueError("batch_size must be greater or equal to 1")
+
+        self.batch_threshold: int = batch_threshold
+        self.batch_size: int = batch_size
+        self.batch_delay: float = batch_delay
+        self.max_body_size: int = max_body_size
+        self.keep_alive_timeout: float = keep_alive_timeout
+        self.request_timeout: float = request_timeout
+        self.max_headers: int = max_headers
+
+        self._kwargs: dict[str, Any] = {
+            "threshold": threshold,
+            "preemptive_behaviour": preemptive_behaviour,
+        }
+
+        self._owns_executor: bool = executor is None
+        self._executor: Executor = (
+            executor
+            if executor is not None
+            else ProcessPoolExecutor(
+                max_workers=jobs or cpu_count() or 1,
+                # Workers are started on demand: forked ones would inherit the open sockets.
+                mp_context=get_context(
+                    "forkserver" if "forkserver" in get_all_start_methods() else None
+                ),
+                initializer=batch_worker_initializer,
+            )
+        )
+
+        self._cache: BoundedCache = BoundedCache(cache_size)
+        self._in_flight: dict[tuple[bytes, int], asyncio.Future[Any]] = {}
+        self._pending: list[tuple[bytes, asyncio.Future[Any]]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._servers: list[asyncio.AbstractServer] = []
+
+        self.metrics: ServerMetrics = ServerMetrics()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def start(
+        self,
+        host: str | None = None,
+        port: int | None = None,
+        unix_path: str | None = None,
+    ) -> None:
+        """
+        Start listening on the TCP host:port and/or on the Unix domain socket unix_path.
+        """
+        if unix_path is not None:
+            self._servers.append(
+                await asyncio.start_unix_server(self._handle_connection, path=unix_path)
+            )
+
+        if port is not None:
+            self._servers.append(
+                await asyncio.start_server(self._handle_connection, host, port)
+            )
+
+    async def close(self) -> None:
+        """
+        Stop listening, then shut the worker pool down (if owned).
+        """
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+
+        self._servers.clear()
+
+        if self._owns_executor:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._executor.shutdown
+            )
+
+    async def detect(
+        self, payload: bytes | bytearray | memoryview
+    ) -> CompactCharsetMatch | None:
+        """
+        Detect the charset of given payload through the cache, the in flight detections and the workers.
+        """
+        key = (blake2b(payload, digest_size=16).digest(), len(payload))
+
+        cached: tuple[CompactCharsetMatch | None] | None = self._cache.get(key)
+
+        if cached is not None:
+            return cached[0]
+
+        pending = self._in_flight.get(key)
+
+        if pending is not None:
+            self.metrics.coalesced += 1
+            return await asyncio.shield(pending)  # type: ignore[no-any-return]
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        self._in_flight[key] = future
+
+        self.metrics.detections += 1
+        self.metrics.detected_bytes += len(payload)
+
+        try:
+            if len(payload) < self.batch_threshold:
+                best_guess = await self._detect_batched(bytes(payload))
+            else:
+                best_guess = await loop.run_in_executor(
+                    self._executor, detect_compact, bytes(payload), self._kwargs
+                )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieved here: nobody else may be waiting for it.
+            future.exception()
+            raise
+        else:
+            future.set_result(best_guess)
+            self._cache.put(
+                key,
+                (best_guess,),
+                ENTRY_OVERHEAD
+                + (
+                    64 * (len(best_guess._languages) + len(best_guess.submatch))
+                    if best_guess is not None
+                    else 0
+                ),
+            )
+        finally:
+            del self._in_flight[key]
+
+        return best_guess  # type: ignore[no-any-return]
+
+    async def _detect_batched(self, payload: bytes) -> CompactCharsetMatch | None:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+
+        self._pending.append((payload, future))
+
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_delay, self._flush)
+
+        return await future  # type: ignore[no-any-return]
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+
+        if not batch:
+            return
+
+        self.metrics.batches += 1
+        self.metrics.batched_payloads += len(batch)
+
+        futures = [future for _, future in batch]
+
+        try:
+            outcome = asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                detect_batch,
+                detect_compact,
+                [(index, payload) for index, (payload, _) in enumerate(batch)],
+                self._kwargs,
+            )
+        except (BrokenExecutor, RuntimeError) as e:  # The pool is broken or shut down.
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        outcome.add_done_callback(partial(self._dispatch_batch, futures))
+
+    @staticmethod
+    def _dispatch_batch(
+        futures: list[asyncio.Future[Any]], outcome: asyncio.Future[Any]
+    ) -> None:
+        if outcome.cancelled():
+            for future in futures:
+                future.cancel()
+            return
+
+        error = outcome.exception()
+
+        if error is not None:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for index, best_guess in outcome.result():
+            if not futures[index].done():
+                futures[index].set_result(best_guess)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(
+                        reader.readline(), self.keep_alive_timeout
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+                if not request_line:
+                    break
+
+                started_at = monotonic()
+
+                (
+                    endpoint,
+                    status,
+                    content_type,
+                    body,
+                    keep_alive,
+                ) = await self._handle_request(request_line, reader)
+
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                        f"Content-Type: {content_type}\r\n"
+                        f"Content-Length: {len(body)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    ).encode("latin_1")
+                    + body
+                )
+                await writer.drain()
+
+                self.metrics.observe_request(endpoint, status, monotonic() - started_at)
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            # The client went away, or sent a line beyond the stream limit.
+            pass
+        finally:
+            writer.close()
+
+    async def _read_headers(
+        self, reader: asyncio.StreamReader
+    ) -> dict[str, str] | None:
+        """
+        Read the header fields up to the blank line. None if there are more than max_headers of them.
+        """
+        headers: dict[str, str] = {}
+        count: int = 0
+
+        while True:
+            line = await reader.readline()
+
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+
+            count += 1
+
+            if count > self.max_headers:
+                return None
+
+            name, _, value = line.decode("latin_1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    async def _handle_request(
+        self, request_line: bytes, reader: asyncio.StreamReader
+    ) -> tuple[str, int, str, bytes, bool]:
+        """
+        Read the rest of the request then answer it. Return the endpoint, status, content type, body and whether
+        the connection can be kept alive.
+        """
+        try:
+            method, target, version = (
+                request_line.decode("latin_1").rstrip("\r\n").split(" ", 2)
+            )
+        except ValueError:
+            return "other", 400, "text/plain", b"Malformed request line.\n", False
+
+        path = urlsplit(target).path
+        endpoint = path if path in ENDPOINTS else "other"
+
+        # A slow (or stalled) client must not hold the connection forever.
+        deadline: float = monotonic() + self.request_timeout
+
+        try:
+            headers: dict[str, str] | None = await asyncio.wait_for(
+                self._read_headers(reader), self.request_timeout
+            )
+        except asyncio.TimeoutError:
+            return endpoint, 408, "text/plain", b"Request timeout.\n", False
+
+        if headers is None:
+            return endpoint, 431, "text/plain", b"Too many header fields.\n", False
+
+        connection = headers.get("connection", "").lower()
+        keep_alive: bool = (
+            connection != "close"
+            if version == "HTTP/1.1"
+            else connection == "keep-alive"
+        )
+
+        if "transfer-encoding" in headers:
+            return endpoint, 411, "text/plain", b"Content-Length is required.\n", False
+
+        try:
+            content_length = int(headers.get("content-length", "0"))
+        except ValueError:
+            return endpoint, 400, "text/plain", b"Invalid Content-Length.\n", False
+
+        if path != "/detect":
+            if content_length:
+                # Not worth reading a body that nobody expects.
+                keep_alive = False
+
+            if method != "GET":
+                return endpoint, 405, "text/plain", b"Method not allowed.\n", keep_alive
+            if path == "/metrics":
+                return (
+                    endpoint,
+                    200,
+                    "text/plain; version=0.0.4",
+                    self.metrics.render(
+                        self._cache.stats(), len(self._in_flight)
+                    ).encode("ascii"),
+                    keep_alive,
+                )
+            if path == "/health":
+                return endpoint, 200, "text/plain", b"ok\n", keep_alive
+
+            return endpoint, 404, "text/plain", b"Not found.\n", keep_alive
+
+        if method != "POST":
+            return endpoint, 405, "text/plain", b"Use POST.\n", False
+
+        if "content-length" not in headers:
+            return endpoint, 411, "text/plain", b"Content-Length is required.\n", False
+
+        if content_length > self.max_body_size:
+            return endpoint, 413, "text/plain", b"Payload too large.\n", False
+
+        try:
+            payload = await asyncio.wait_for(
+                reader.readexactly(content_length), max(0.0, deadline - monotonic())
+            )
+        except asyncio.TimeoutError:
+            return endpoint, 408, "text/plain", b"Request timeout.\n", False
+
+        try:
+            best_guess = await self.detect(payload)
+        except Exception as e:  # noqa: BLE001
+            # A worker died abruptly, the pool is shut down, or the detection itself failed.
+            # The details are for the server side only, the client gets a fixed message.
+            print(f"Detection failed: {e!r}", file=sys.stderr)
+            return (
+                endpoint,
+                500,
+                "application/json",
+                b'{"error": "Detection failed."}',
+                keep_alive,
+            )
+
+        return (
+            endpoint,
+            200,
+            "application/json",
+            dumps(result_document(best_guess), ensure_ascii=True).encode("ascii"),
+            keep_alive,
+        )
+
+
+async def _serve_forever(
+    server: DetectionServer, host: str, port: int | None, unix_path: str | None
+) -> None:
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    try:
+        loop.add_signal_handler(signal.SIGTERM, stopped.set)
+    except (NotImplementedError, AttributeError):  # Defensive: Windows.
+        pass
+
+    async with server:
+        await server.start(host, port, unix_path)
+
+        for listening in (
+            f"unix:{unix_path}" if unix_path is not None else None,
+            f"http://{host}:{port}" if port is not None else None,
+        ):
+            if listening is not None:
+                print(f"Listening on {listening}", file=sys.stderr)
+
+        await stopped.wait()
+
+
+def cli_serve(argv: list[str] | None = None) -> int:
+    """
+    Run the detection server until interrupted, see DetectionServer.
+    :param argv:
+    :return: 0 if everything is fine, anything else equal trouble
+    """
+    parser = argparse.ArgumentParser(
+        prog="normalizer serve",
+        description="Serve the charset detection over HTTP, "
+        "on a TCP port and/or a Unix domain socket.",
+    )
+
+    parser.add_argument(
+        "--host",
+        action="store",
+        default="127.0.0.1",
+        dest="host",
+        help="Address to listen on. Default to 127.0.0.1.",
+    )
+    parser.add_argument(
+        "--port",
+        action="store",
+        default=None,
+        type=int,
+        dest="port",
+        help="TCP port to listen on. Default to 8080 when --unix is not given.",
+    )
+    parser.add_argument(
+        "--unix",
+        action="store",
+        default=None,
+        dest="unix_path",
+        metavar="PATH",
+        help="Listen on this Unix domain socket.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        default=None,
+        type=int,
+        dest="jobs",
+        help="Number of worker processes. Default to the number of CPUs.",
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        action="store",
+        default=0.2,
+        type=float,
+        dest="threshold",
+        help="Define a custom maximum amount of noise allowed in decoded content. 0. <= noise <= 1.",
+    )
+    parser.add_argument(
+        "-i",
+        "--no-preemptive",
+        action="store_true",
+        default=False,
+        dest="no_preemptive",
+        help="Disable looking at a charset declaration to hint the detector.",
+    )
+    parser.add_argument(
+        "--cache-size",
+        action="store",
+        default=16 * 1024 * 1024,
+        type=int,
+        dest="cache_size",
+        help="Maximum (estimated) size in byte(s) of the cached verdicts.",
+    )
+    parser.add_argument(
+        "--max-body-size",
+        action="store",
+        default=64 * 1024 * 1024,
+        type=int,
+        dest="max_body_size",
+        help="Largest payload accepted, in byte(s).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        action="store",
+        default=16,
+        type=int,
+        dest="batch_size",
+        help="Maximum amount of small payloads sent to a worker at once.",
+    )
+    parser.add_argument(
+        "--batch-delay",
+        action="store",
+        default=0.002,
+        type=float,
+        dest="batch_delay",
+        help="How long, in second(s), small payloads wait for others to be sent along.",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.threshold < 0.0 or args.threshold > 1.0:
+        print("--threshold VALUE should be between 0. AND 1.", file=sys.stderr)
+        return 1
+
+    if args.jobs is not None and args.jobs < 1:
+        print("--jobs VALUE should be greater or equal to 1.", file=sys.stderr)
+        return 1
+
+    if args.batch_size < 1 or args.cache_size < 1:
+        print(
+            "--batch-size and --cache-size VALUE should be greater or equal to 1.",
+            file=sys.stderr,
+        )
+        return 1
+
+    port: int | None = args.port
+
+    if port is None and args.unix_path is None:
+        port = 8080
+
+    server = DetectionServer(
+        jobs=args.jobs,
+        threshold=args.threshold,
+        preemptive_behaviour=args.no_preemptive is False,
+        cache_size=args.cache_size,
+        batch_size=args.batch_size,
+        batch_delay=args.batch_delay,
+        max_body_size=args.max_body_size,
+    )
+
+    try:
+        asyncio.run(_serve_forever(server, args.host, port, args.unix_path))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+
+    return 0
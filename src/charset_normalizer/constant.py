@@ -22,6 +22,9 @@ ENCODING_MARKS: dict[str, bytes | list[bytes]] = {
 TOO_SMALL_SEQUENCE: int = 32
 TOO_BIG_SEQUENCE: int = int(10e6)
 
+# Size of the windows fed to the incremental decoders when validating payloads above TOO_BIG_SEQUENCE.
+DECODE_WINDOW_SIZE: int = 2**20
+
 UTF8_MAXIMAL_ALLOCATION: int = 1_112_064
 
 # Up-to-date Unicode ucd/17.0.0
@@ -399,6 +402,9 @@ RE_POSSIBLE_ENCODING_INDICATION = re_compile(
     IGNORECASE,
 )
 
+# A 8-bit byte right before or after an ASCII letter.
+RE_LATIN_NEIGHBOUR = re_compile(rb"(?<=[A-Za-z])[\x80-\xff]|[\x80-\xff](?=[A-Za-z])")
+
 IANA_NO_ALIASES = [
     "cp720",
     "cp737",
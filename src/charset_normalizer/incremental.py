@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+import codecs
+import logging
+from codecs import BOM_UTF16_LE
+
+from .api import IANA_SUPPORTED_MB_FIRST, from_bytes
+from .constant import TRACE
+from .md import mess_ratio
+from .models import CharsetMatches
+from .stream import _align_tail
+from .utils import (
+    any_specified_encoding,
+    iana_name,
+    identify_sig_or_bom,
+    is_multi_byte_encoding,
+    single_byte_decoding_table,
+    truncate_sequence,
+)
+
+logger = logging.getLogger("charset_normalizer")
+
+
+class IncrementalDetector:
+    """
+    Detect the charset of a payload that is received as a stream of chunks. Feed it chunk by chunk, then call
+    close() to get the CharsetMatches.
+
+    Every fed chunk is checked against each candidate code page: a code page that cannot decode it is pruned
+    right away. Only a sample is retained for the final measurements: the head of the stream (the declaration
+    search zone, at least 2 * steps * chunk_size byte(s)) then at most 2 * steps windows of chunk_size byte(s),
+    evenly spread over the remaining of the stream. The flag done is set as soon as the SIG/BOM,
+    ascii/utf_8/declared encoding early-stop rules of from_bytes are satisfied, measured on each window as it
+    is completed. There is no need to feed the remaining chunks from that point.
+    """
+
+    def __init__(
+        self,
+        steps: int = 5,
+        chunk_size: int = 512,
+        threshold: float = 0.2,
+        cp_isolation: list[str] | None = None,
+        cp_exclusion: list[str] | None = None,
+        preemptive_behaviour: bool = True,
+        language_threshold: float = 0.1,
+        enable_fallback: bool = True,
+    ):
+        self._steps: int = steps
+        self._chunk_size: int = chunk_size
+        self._threshold: float = threshold
+        self._cp_isolation: list[str] | None = cp_isolation
+        self._cp_exclusion: list[str] | None = cp_exclusion
+        self._preemptive_behaviour: bool = preemptive_behaviour
+        self._language_threshold: float = language_threshold
+        self._enable_fallback: bool = enable_fallback
+        self._head_size: int = max(8192, 2 * steps * chunk_size)
+
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget everything that was fed so far. The instance can be reused for another stream.
+        """
+        isolation: list[str] = [iana_name(cp, False) for cp in self._cp_isolation or []]
+        exclusion: list[str] = [iana_name(cp, False) for cp in self._cp_exclusion or []]
+
+        self._head: bytearray = bytearray()
+        # Windows sampled past the head: (offset within the stream, bytes).
+        self._windows: list[tuple[int, bytes]] = []
+        self._stride: int = self._chunk_size
+        # Window being filled, and its offset.
+        self._window: bytearray | None = None
+        self._window_at: int = 0
+        self._length: int = 0
+        self._done: bool = False
+        self._results: CharsetMatches | None = None
+
+        # Early-stop bookkeeping: mess ratio of the measured windows per prioritized code page.
+        self._measured: int = 0
+        self._mess_ratios: dict[str, list[float]] = {}
+
+        self._decoders: dict[str, codecs.IncrementalDecoder] = {}
+        self._undefined_bytes: dict[str, frozenset[int]] = {}
+
+        for encoding_iana in IANA_SUPPORTED_MB_FIRST:
+            if isolation and encoding_iana not in isolation:
+                continue
+            if encoding_iana in exclusion:
+                continue
+
+            try:
+                if is_multi_byte_encoding(encoding_iana):
+                    self._decoders[encoding_iana] = codecs.getincrementaldecoder(
+                        encoding_iana
+                    )(errors="strict")
+                else:
+                    self._undefined_bytes[encoding_iana] = frozenset(
+                        i
+                        for i, character in enumerate(
+                            single_byte_decoding_table(encoding_iana)
+                        )
+                        if character is None
+                    )
+            except (LookupError, ImportError):  # Defensive: unavailable codec.
+                continue
+
+        # Bytes that every single-byte candidate define can be dropped before
+        # looking for undefined bytes in a chunk (most of the ASCII range).
+        self._commonly_defined: bytes = bytes(
+            i
+            for i in range(256)
+            if not any(i in undefined for undefined in self._undefined_bytes.values())
+        )
+
+    @property
+    def done(self) -> bool:
+        """
+        True once the detector reached a verdict. Further fed chunks are ignored.
+        """
+        return self._done
+
+    @property
+    def candidates(self) -> list[str]:
+        """
+        Code pages that are still able to decode everything fed so far.
+        """
+        return [
+            encoding_iana
+            for encoding_iana in IANA_SUPPORTED_MB_FIRST
+            if encoding_iana in self._decoders or encoding_iana in self._undefined_bytes
+        ]
+
+    def feed(self, chunk: bytes | bytearray) -> None:
+        """
+        Consume the next chunk of the stream.
+        """
+        if self._done or self._results is not None or not chunk:
+            return
+
+        self._prune(chunk, False)
+
+        for window in self._sample(chunk):
+            self._measure(window)
+
+        self._done = self._early_stop_reached()
+
+    def close(self) -> CharsetMatches:
+        """
+        Signal the end of the stream and return the detection results.
+        """
+        if self._results is not None:
+            return self._results
+
+        if not self._done:
+            self._prune(b"", True)
+
+        if self._window:
+            self._windows.append((self._window_at, bytes(self._window)))
+            self._window = None
+
+        candidates: list[str] = self.candidates
+
+        if not candidates:
+            logger.log(
+                TRACE,
+                "No code page was able to decode the fed stream. Unable to determine any suitable charset.",
+            )
+            self._results = CharsetMatches()
+        else:
+            self._results = from_bytes(
+                self._stitch(),
+                self._steps,
+                self._chunk_size,
+                self._threshold,
+                self._cp_isolation,
+                self._cp_exclusion,
+                self._preemptive_behaviour,
+                False,
+                self._language_threshold,
+                self._enable_fallback,
+                _candidates=candidates,
+            )
+
+        self._done = True
+
+        return self._results
+
+    @property
+    def results(self) -> CharsetMatches | None:
+        """
+        Detection results, available once close() was called.
+        """
+        return self._results
+
+    def _prune(self, chunk: bytes | bytearray, final: bool) -> None:
+        for encoding_iana, decoder in list(self._decoders.items()):
+            try:
+                decoder.decode(chunk, final)
+            except UnicodeError as e:  # utf_16/utf_32 raise UnicodeError on missing BOM
+                logger.log(
+                    TRACE,
+                    "Code page %s does not fit the fed stream at ALL. %s",
+                    encoding_iana,
+                    str(e),
+                )
+                del self._decoders[encoding_iana]
+
+        if not chunk or not self._undefined_bytes:
+            return
+
+        present: set[int] = set(chunk.translate(None, self._commonly_defined))
+
+        if not present:
+            return
+
+        for encoding_iana, undefined in list(self._undefined_bytes.items()):
+            if not undefined.isdisjoint(present):
+                logger.log(
+                    TRACE,
+                    "Code page %s does not fit the fed stream at ALL. Undefined byte(s) found.",
+                    encoding_iana,
+                )
+                del self._undefined_bytes[encoding_iana]
+
+    def _sample(self, chunk: bytes | bytearray) -> list[bytes]:
+        """
+        Retain what belongs to the head or to a sampled window in given chunk. Return the windows (head blocks of
+        chunk_size byte(s) included) completed by it.
+        """
+        completed: list[bytes] = []
+        position: int = 0
+
+        if len(self._head) < self._head_size:
+            position = min(len(chunk), self._head_size - len(self._head))
+            self._head += chunk[:position]
+
+            while len(self._head) >= (self._measured + 1) * self._chunk_size:
+                completed.append(
+                    bytes(
+                        self._head[
+                            self._measured * self._chunk_size : (self._measured + 1)
+                            * self._chunk_size
+                        ]
+                    )
+                )
+                self._measured += 1
+
+        while position < len(chunk):
+            offset: int = self._length + position
+
+            if self._window is None:
+                # Next window start at a multiple of the stride past the head.
+                relative: int = offset - self._head_size
+                next_at: int = offset + (-relative % self._stride)
+
+                if next_at >= self._length + len(chunk):
+                    break
+
+                position += next_at - offset
+                self._window = bytearray()
+                self._window_at = next_at
+
+            missing: int = self._chunk_size - len(self._window)
+            self._window += chunk[position : position + missing]
+            position += missing
+
+            if len(self._window) == self._chunk_size:
+                window: bytes = bytes(self._window)
+                completed.append(window)
+
+                self._windows.append((self._window_at, window))
+                self._window = None
+
+                if len(self._windows) > 2 * self._steps:
+                    # Keep one window out of two, spaced by twice the stride.
+                    self._stride *= 2
+                    self._windows = [
+                        (window_at, retained)
+                        for window_at, retained in self._windows
+                        if (window_at - self._head_size) % self._stride == 0
+                    ]
+
+        self._length += len(chunk)
+
+        return completed
+
+    def _measure(self, window: bytes) -> None:
+        candidates: list[str] = self.candidates
+
+        for encoding_iana in self._prioritized():
+            if encoding_iana not in candidates:
+                continue
+
+            self._mess_ratios.setdefault(encoding_iana, []).append(
+                mess_ratio(window.decode(encoding_iana, "ignore"), self._threshold)
+            )
+
+    def _prioritized(self) -> list[str]:
+        specified_encoding: str | None = (
+            any_specified_encoding(self._head) if self._preemptive_behaviour else None
+        )
+
+        return [
+            encoding_iana
+            for encoding_iana in (specified_encoding, "ascii", "utf_8")
+            if encoding_iana is not None
+        ]
+
+    def _stitch(self) -> bytes:
+        """
+        Sample given to from_bytes: the head followed by the windows, each cut on character boundaries where
+        they are not contiguous, or where the stream was left unfinished.
+        """
+        sig_encoding, sig_payload = identify_sig_or_bom(self._head)
+
+        sample: bytearray = bytearray(self._head)
+        end: int = len(self._head)
+
+        for window_at, window in self._windows:
+            if window_at != end:
+                sample = bytearray(_align_end(sample, end, sig_encoding, sig_payload))
+                sample += _align_tail(window, window_at, sig_encoding, len(sig_payload))
+            else:
+                sample += window
+
+            end = window_at + len(window)
+
+        # Stopped early, the sample end in the middle of the stream.
+        if self._done:
+            return bytes(_align_end(sample, end, sig_encoding, sig_payload))
+
+        return bytes(sample)
+
+    def _early_stop_reached(self) -> bool:
+        """
+        Tell whether from_bytes would have stopped the search on a prioritized encoding (SIG/BOM, declared, ascii,
+        utf_8) given the windows measured so far.
+        """
+        if self._measured < self._steps and len(self._head) < self._head_size:
+            return False
+
+        candidates: list[str] = self.candidates
+        sig_encoding, _ = identify_sig_or_bom(self._head)
+
+        if sig_encoding is not None and sig_encoding in candidates:
+            return True
+
+        for encoding_iana in self._prioritized():
+            mess_ratios: list[float] | None = self._mess_ratios.get(encoding_iana)
+
+            if (
+                encoding_iana in candidates
+                and mess_ratios
+                and sum(mess_ratios) / len(mess_ratios) < 0.1
+            ):
+                return True
+
+        return False
+
+
+def _align_end(
+    sample: bytes | bytearray, end: int, sig_encoding: str | None, sig_payload: bytes
+) -> bytes | bytearray:
+    """
+    Drop the trailing bytes of a sample that ends at given offset within the whole stream, so that it ends on a
+    character boundary.
+    """
+    if sig_encoding in {"utf_16", "utf_32"}:
+        code_unit: int = 2 if sig_encoding == "utf_16" else 4
+        limit: int = len(sample) - (end - len(sig_payload)) % code_unit
+
+        if code_unit == 2 and limit >= 2:
+            last_unit: bytes = bytes(sample[limit - 2 : limit])
+            high_byte: int = (
+                last_unit[1] if sig_payload == BOM_UTF16_LE else last_unit[0]
+            )
+            if 0xD8 <= high_byte <= 0xDB:
+                limit -= 2
+
+        return sample[:limit]
+
+    return truncate_sequence(sample, len(sample) - 1)
@@ -5,10 +5,13 @@ from warnings import warn
 
 from .api import from_bytes
 from .constant import CHARDET_CORRESPONDENCE, TOO_SMALL_SEQUENCE
+from .incremental import IncrementalDetector
 
 if TYPE_CHECKING:
     from typing import TypedDict
 
+    from .models import CharsetMatch
+
     class ResultDict(TypedDict):
         encoding: str | None
         language: str
@@ -42,8 +45,14 @@ def detect(
     if isinstance(byte_str, bytearray):
         byte_str = bytes(byte_str)
 
-    r = from_bytes(byte_str).best()
+    return _as_result_dict(
+        from_bytes(byte_str).best(), len(byte_str), should_rename_legacy
+    )
+
 
+def _as_result_dict(
+    r: CharsetMatch | None, length: int, should_rename_legacy: bool
+) -> ResultDict:
     encoding = r.encoding if r is not None else None
     language = r.language if r is not None and r.language != "Unknown" else ""
     confidence = 1.0 - r.chaos if r is not None else None
@@ -60,7 +69,7 @@ def detect(
             "ascii",
         }
         and not r.bom  # type: ignore[union-attr]
-        and len(byte_str) < TOO_SMALL_SEQUENCE
+        and length < TOO_SMALL_SEQUENCE
     ):
         confidence -= 0.2
 
@@ -77,3 +86,55 @@ def detect(
         "language": language,
         "confidence": confidence,
     }
+
+
+class UniversalDetector:
+    """
+    chardet legacy class
+    Incremental counterpart of the legacy detect() function. Feed it with chunks, check done to know whether
+    feeding more is useless, then call close() to obtain the same dict that detect() would return.
+    This class is meant to ease the migration of projects that rely on chardet.UniversalDetector.
+    """
+
+    def __init__(self, should_rename_legacy: bool = False) -> None:
+        self._should_rename_legacy = should_rename_legacy
+        self._detector = IncrementalDetector()
+        self._length: int = 0
+        # Same initial value as chardet.
+        self.result: ResultDict = {
+            "encoding": None,
+            "confidence": 0.0,
+            "language": None,  # type: ignore[typeddict-item]
+        }
+
+    @property
+    def done(self) -> bool:
+        return self._detector.done
+
+    def reset(self) -> None:
+        self._detector.reset()
+        self._length = 0
+        self.result = {
+            "encoding": None,
+            "confidence": 0.0,
+            "language": None,  # type: ignore[typeddict-item]
+        }
+
+    def feed(self, byte_str: bytes | bytearray) -> None:
+        if not isinstance(byte_str, (bytearray, bytes)):
+            raise TypeError(  # pragma: nocover
+                f"Expected object of type bytes or bytearray, got: {type(byte_str)}"
+            )
+
+        if self._detector.done:
+            return
+
+        self._length += len(byte_str)
+        self._detector.feed(byte_str)
+
+    def close(self) -> ResultDict:
+        self.result = _as_result_dict(
+            self._detector.close().best(), self._length, self._should_rename_legacy
+        )
+
+        return self.result
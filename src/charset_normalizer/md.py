@@ -1,8 +1,6 @@
 from __future__ import annotations
 
 import sys
-from functools import lru_cache
-from logging import getLogger
 
 if sys.version_info >= (3, 8):
     from typing import final
@@ -18,6 +16,7 @@ else:
 from .constant import (
     COMMON_CJK_CHARACTERS,
     COMMON_SAFE_ASCII_CHARACTERS,
+    IANA_SUPPORTED_COUNT,
     TRACE,
     UNICODE_SECONDARY_RANGE_KEYWORD,
     _ACCENTUATED,
@@ -32,11 +31,14 @@ from .constant import (
 )
 from .utils import (
     _character_flags,
+    _memoized,
+    explain_logger,
     is_emoticon,
     is_punctuation,
     is_separator,
     is_symbol,
     remove_accent,
+    single_byte_decoding_table,
     unicode_range,
 )
 
@@ -213,11 +215,28 @@ class CharInfo:
 
 
 # Per-codepoint cache of CharInfo instances
-# At most UTF-8 size allocated.
-@lru_cache(maxsize=None)
+# At most UTF-8 size allocated. A plain dict rather than lru_cache: a hit is
+# a lock-free read that never contend between threads on free-threaded builds.
+_CHAR_INFO_CACHE: dict[str, CharInfo] = {}
+
+# [hits, misses] of the _CHAR_INFO_CACHE lookups, for metrics.stats(). The hot loops
+# count their hits locally and add them once per call. Not locked: concurrent
+# updates may (rarely) lose a count, it is only meant to give a rate.
+_CHAR_INFO_LOOKUPS: list[int] = [0, 0]
+
+
 def _char_info(character: str) -> CharInfo:
     """Build (once per codepoint) and cache the CharInfo for *character*."""
-    return CharInfo(character)
+    info: CharInfo | None = _CHAR_INFO_CACHE.get(character)
+
+    if info is None:
+        _CHAR_INFO_LOOKUPS[1] += 1
+        # Racing threads may build it twice, the first one stored is kept.
+        info = _CHAR_INFO_CACHE.setdefault(character, CharInfo(character))
+    else:
+        _CHAR_INFO_LOOKUPS[0] += 1
+
+    return info
 
 
 # ASCII table indexed by codepoint.
@@ -777,13 +796,34 @@ class ArabicIsolatedFormPlugin(MessDetectorPlugin):
         return isolated_form_usage
 
 
-@lru_cache(maxsize=1024)
+# Verdicts of is_suspiciously_successive_range, for up to 1024 pairs of Unicode ranges.
+_SUCCESSIVE_RANGE_CACHE: dict[tuple[str | None, str | None], bool] = {}
+
+
 def is_suspiciously_successive_range(
     unicode_range_a: str | None, unicode_range_b: str | None
 ) -> bool:
     """
     Determine if two Unicode range seen next to each other can be considered as suspicious.
     """
+    verdict: bool | None = _SUCCESSIVE_RANGE_CACHE.get(
+        (unicode_range_a, unicode_range_b)
+    )
+
+    if verdict is None:
+        verdict = _is_suspiciously_successive_range(unicode_range_a, unicode_range_b)
+
+        if len(_SUCCESSIVE_RANGE_CACHE) < 1024:
+            verdict = _SUCCESSIVE_RANGE_CACHE.setdefault(
+                (unicode_range_a, unicode_range_b), verdict
+            )
+
+    return verdict
+
+
+def _is_suspiciously_successive_range(
+    unicode_range_a: str | None, unicode_range_b: str | None
+) -> bool:
     if unicode_range_a is None or unicode_range_b is None:
         return True
 
@@ -851,6 +891,116 @@ def is_suspiciously_successive_range(
     return True
 
 
+# Flags of the single byte code pages property tables, see single_byte_property_table.
+_SB_NON_ASCII: int = 1
+_SB_UNPRINTABLE: int = 1 << 1
+_SB_ALPHA: int = 1 << 2
+_SB_ACCENTUATED: int = 1 << 3
+_SB_CJK: int = 1 << 4
+_SB_UNCOMMON_CJK: int = 1 << 5
+_SB_ARABIC: int = 1 << 6
+_SB_ARABIC_ISOLATED_FORM: int = 1 << 7
+
+
+@_memoized(maxsize=IANA_SUPPORTED_COUNT)
+def single_byte_property_table(iana_name: str) -> tuple[int, ...]:
+    """
+    For each of the 256 byte values, the properties (as _SB_* flags) of the character a single byte code page
+    decode it into. Only what the order insensitive detectors need. Undefined bytes have no flag.
+    """
+    table: list[int] = []
+
+    for character in single_byte_decoding_table(iana_name):
+        flags: int = 0
+
+        if character is not None:
+            info: CharInfo = _char_info(character)
+
+            if not info.is_ascii:
+                flags |= _SB_NON_ASCII
+            if (
+                not info.space
+                and not info.printable
+                and character != "\x1a"
+                and character != "\ufeff"
+            ):
+                flags |= _SB_UNPRINTABLE
+            if info.alpha:
+                flags |= _SB_ALPHA
+                if info.accentuated:
+                    flags |= _SB_ACCENTUATED
+                if info.is_cjk:
+                    flags |= _SB_CJK
+                    if not info.common_cjk:
+                        flags |= _SB_UNCOMMON_CJK
+                if info.is_arabic:
+                    flags |= _SB_ARABIC
+                    if info.flags & _ARABIC_ISOLATED_FORM:
+                        flags |= _SB_ARABIC_ISOLATED_FORM
+
+        table.append(flags)
+
+    return tuple(table)
+
+
+def histogram_mess_ratio(
+    histogram: list[tuple[int, int]], length: int, property_table: tuple[int, ...]
+) -> float:
+    """
+    Compute, from the byte histogram (byte value, count) of a chunk and the property table of a single byte code
+    page, the ratios of the detectors that only depend on character counts: UnprintablePlugin,
+    TooManyAccentuatedPlugin, CjkUncommonPlugin and ArabicIsolatedFormPlugin. No decode needed.
+    The order sensitive detectors can only add to it, so it is a lower bound of the mess_ratio of that decoded chunk.
+    """
+    non_ascii_count: int = 0
+    unprintable_count: int = 0
+    alpha_count: int = 0
+    accentuated_count: int = 0
+    cjk_count: int = 0
+    uncommon_cjk_count: int = 0
+    arabic_count: int = 0
+    isolated_form_count: int = 0
+
+    for byte_value, count in histogram:
+        flags: int = property_table[byte_value]
+
+        if not flags:
+            continue
+
+        if flags & _SB_NON_ASCII:
+            non_ascii_count += count
+        if flags & _SB_UNPRINTABLE:
+            unprintable_count += count
+        if flags & _SB_ALPHA:
+            alpha_count += count
+            if flags & _SB_ACCENTUATED:
+                accentuated_count += count
+            if flags & _SB_CJK:
+                cjk_count += count
+                if flags & _SB_UNCOMMON_CJK:
+                    uncommon_cjk_count += count
+            if flags & _SB_ARABIC:
+                arabic_count += count
+                if flags & _SB_ARABIC_ISOLATED_FORM:
+                    isolated_form_count += count
+
+    # mess_ratio flush a trailing line feed into UnprintablePlugin once the whole chunk is consumed.
+    ratio: float = (unprintable_count * 8) / (length + 1)
+
+    # The other detectors are not fed at all on pure ASCII decoded chunk.
+    if not non_ascii_count:
+        return ratio
+
+    if alpha_count >= 8 and accentuated_count / alpha_count >= 0.35:
+        ratio += accentuated_count / alpha_count
+    if cjk_count >= 8 and uncommon_cjk_count / cjk_count > 0.5:
+        ratio += uncommon_cjk_count / cjk_count / 10
+    if arabic_count >= 8:
+        ratio += isolated_form_count / arabic_count
+
+    return ratio
+
+
 def mess_ratio(
     decoded_sequence: str, maximum_threshold: float = 0.2, debug: bool = False
 ) -> float:
@@ -874,9 +1024,10 @@ def mess_ratio(
 
     # Cached per-codepoint character properties (see CharInfo). ASCII
     # characters resolve through the immutable import-time table; anything
-    # else goes through the lru_cache-backed slow path.
+    # else goes through the per-codepoint dict (built on first sight).
     ascii_info = _ASCII_CHAR_INFO
-    char_info = _char_info
+    char_info_cache = _CHAR_INFO_CACHE
+    char_info_hits: int = 0
 
     mean_mess_ratio: float
     info: CharInfo
@@ -916,7 +1067,12 @@ def mess_ratio(
             if codepoint < 128:
                 info = ascii_info[codepoint]
             else:
-                info = char_info(character)
+                cached_info = char_info_cache.get(character)
+                if cached_info is not None:
+                    info = cached_info
+                    char_info_hits += 1
+                else:
+                    info = _char_info(character)
 
             # Detectors with eligible() == always True
             d_up_feed(character, info)
@@ -982,8 +1138,10 @@ def mess_ratio(
             + d_ai.ratio
         )
 
+    _CHAR_INFO_LOOKUPS[0] += char_info_hits
+
     if debug:  # Defensive:
-        logger = getLogger("charset_normalizer")
+        logger = explain_logger
 
         logger.log(
             TRACE,
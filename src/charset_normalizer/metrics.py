@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable
+
+from .cache import chunk_caches_stats
+from .md import _CHAR_INFO_CACHE, _CHAR_INFO_LOOKUPS
+
+if TYPE_CHECKING:
+    from .models import CharsetMatches, DetectionTrace
+
+# Called with (phase, encoding, duration in second(s)). phase is one of "decode", "mess", "coherence"
+# for a given code page, or "detection" for the whole call along with the best guess encoding (if any).
+PhaseHook = Callable[[str, "str | None", float], None]
+
+COUNTERS: tuple[str, ...] = (
+    # Detections that went through the code pages (not served by a DetectionCache).
+    "detections",
+    # Detections cancelled or out of time.
+    "truncated",
+    # Code pages considered, whatever the outcome.
+    "candidates",
+    # Single byte code pages that inherited the verdict of one decoding the present bytes identically.
+    "identical_bytes_reused",
+    # Code pages that decoded to an already measured str, reusing its verdict.
+    "payload_fast_tracked",
+    "payload_fast_skipped",
+    # Code pages not tested because of a definitive (single byte or multi byte) match.
+    "definitive_match_pruned",
+    "mb_definitive_match_pruned",
+    # Code pages that passed the chaos probing and had their coherence measured.
+    "coherence_measured",
+)
+
+_LOCK: Lock = Lock()
+_COUNTERS: dict[str, int] = dict.fromkeys(COUNTERS, 0)
+
+_PHASE_HOOKS: tuple[PhaseHook, ...] = ()
+
+
+def new_counters() -> dict[str, int]:
+    """
+    Blank per call counters, to be merged into the process-wide ones using record_counters.
+    """
+    return dict.fromkeys(COUNTERS, 0)
+
+
+def record_counters(counters: dict[str, int]) -> None:
+    with _LOCK:
+        for name, value in counters.items():
+            if value:
+                _COUNTERS[name] += value
+
+
+def stats(reset: bool = False) -> dict[str, Any]:
+    """
+    Snapshot of the process-wide detection counters (see COUNTERS) along with the chunk caches statistics and the
+    per character properties cache ("char_info") hits, misses, hit rate and number of distinct characters held.
+    With reset set to True, the counters (not the caches content) are zeroed in the same step.
+    """
+    with _LOCK:
+        snapshot: dict[str, Any] = dict(_COUNTERS)
+
+        if reset:
+            for name in COUNTERS:
+                _COUNTERS[name] = 0
+
+    snapshot.update(chunk_caches_stats(reset))
+
+    hits, misses = _CHAR_INFO_LOOKUPS
+
+    if reset:
+        _CHAR_INFO_LOOKUPS[0] -= hits
+        _CHAR_INFO_LOOKUPS[1] -= misses
+
+    snapshot["char_info"] = {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        "entries": len(_CHAR_INFO_CACHE),
+    }
+
+    return snapshot
+
+
+def add_phase_hook(hook: PhaseHook) -> None:
+    """
+    Register a callable receiving the duration of each detection phase (see PhaseHook), e.g. to feed a
+    Prometheus histogram or an OpenTelemetry meter. Hooks are called in the detecting thread once the detection
+    is over, in the order they were added. They are registered per process: worker processes used by the batch
+    API and the CLI do not inherit them. Phases are only timed while at least one hook is registered.
+    """
+    global _PHASE_HOOKS
+
+    with _LOCK:
+        if hook not in _PHASE_HOOKS:
+            _PHASE_HOOKS = _PHASE_HOOKS + (hook,)
+
+
+def remove_phase_hook(hook: PhaseHook) -> None:
+    """
+    Unregister a hook previously given to add_phase_hook. Does nothing if it is not registered.
+    """
+    global _PHASE_HOOKS
+
+    with _LOCK:
+        _PHASE_HOOKS = tuple(
+            registered for registered in _PHASE_HOOKS if registered != hook
+        )
+
+
+def phase_hooks() -> tuple[PhaseHook, ...]:
+    return _PHASE_HOOKS
+
+
+def emit_phases(
+    hooks: tuple[PhaseHook, ...], trace: DetectionTrace, results: CharsetMatches
+) -> None:
+    best_guess = results.best()
+
+    for hook in hooks:
+        for candidate_trace in trace:
+            if candidate_trace.decode_time:
+                hook("decode", candidate_trace.encoding, candidate_trace.decode_time)
+            if candidate_trace.md_time:
+                hook("mess", candidate_trace.encoding, candidate_trace.md_time)
+            if candidate_trace.cd_time:
+                hook("coherence", candidate_trace.encoding, candidate_trace.cd_time)
+
+        hook(
+            "detection",
+            best_guess.encoding if best_guess is not None else None,
+            trace.elapsed,
+        )
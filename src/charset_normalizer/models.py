@@ -1,25 +1,33 @@
 from __future__ import annotations
 
+from bisect import insort
+from codecs import getincrementaldecoder, getincrementalencoder
 from encodings.aliases import aliases
 from re import sub
-from typing import Any, Iterator, List, Tuple
-
-from .constant import RE_POSSIBLE_ENCODING_INDICATION, TOO_BIG_SEQUENCE
+from time import perf_counter
+from typing import Any, BinaryIO, Iterator, List, Tuple
+
+from .constant import (
+    DECODE_WINDOW_SIZE,
+    RE_POSSIBLE_ENCODING_INDICATION,
+    TOO_BIG_SEQUENCE,
+)
 from .utils import iana_name, is_multi_byte_encoding, unicode_range
 
 
 class CharsetMatch:
     def __init__(
         self,
-        payload: bytes | bytearray,
+        payload: bytes | bytearray | memoryview,
         guessed_encoding: str,
         mean_mess_ratio: float,
         has_sig_or_bom: bool,
         languages: CoherenceMatches,
         decoded_payload: str | None = None,
         preemptive_declaration: str | None = None,
+        fingerprint: int | None = None,
     ):
-        self._payload: bytes | bytearray = payload
+        self._payload: bytes | bytearray | memoryview = payload
 
         self._encoding: str = guessed_encoding
         self._mean_mess_ratio: float = mean_mess_ratio
@@ -37,6 +45,15 @@ class CharsetMatch:
 
         self._preemptive_declaration: str | None = preemptive_declaration
 
+        # Once unloaded with materialized=False, the decoded str and the output are never retained.
+        self._materialized: bool = True
+
+        # Computed once, they outlive the decoded str.
+        self._fingerprint: int | None = fingerprint
+        self._decoded_length: int | None = (
+            len(decoded_payload) if decoded_payload is not None else None
+        )
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, CharsetMatch):
             if isinstance(other, str):
@@ -76,23 +93,27 @@ class CharsetMatch:
         raw_len = len(self.raw)
         if raw_len == 0:
             return 0.0
-        return 1.0 - (len(str(self)) / raw_len)
+        if self._decoded_length is None:
+            self._decoded_length = len(str(self))
+        return 1.0 - (self._decoded_length / raw_len)
 
     def __str__(self) -> str:
+        if self._string is not None:
+            return self._string
+
         # Lazy Str Loading
-        if self._string is None:
-            self._string = str(self._payload, self._encoding, "strict")
-            # UTF-7 BOM is encoded in modified Base64 whose byte boundary
-            # can overlap with the next character, so raw-byte stripping
-            # is unreliable. Strip the decoded BOM character instead.
-            if (
-                self._has_sig_or_bom
-                and self._encoding == "utf_7"
-                and self._string
-                and self._string[0] == "\ufeff"
-            ):
-                self._string = self._string[1:]
-        return self._string
+        decoded_string: str = str(self._payload, self._encoding, "strict")
+        # Strip the decoded BOM character, the SIG is never part of the str.
+        # UTF-7 BOM is encoded in modified Base64 whose byte boundary
+        # can overlap with the next character, so raw-byte stripping
+        # is unreliable.
+        if self._has_sig_or_bom and decoded_string and decoded_string[0] == "\ufeff":
+            decoded_string = decoded_string[1:]
+
+        if self._materialized:
+            self._string = decoded_string
+
+        return decoded_string
 
     def __repr__(self) -> str:
         return f"<CharsetMatch '{self.encoding}' fp({self.fingerprint})>"
@@ -105,9 +126,24 @@ class CharsetMatch:
                 )
             )
 
-        other._string = None  # Unload RAM usage; dirty trick.
+        # A submatch released by materialize=False shall not start retaining its str again.
+        other._unload(other._materialized)
         self._leaves.append(other)
 
+    def _unload(self, materialized: bool = True) -> None:
+        """
+        Release the decoded str and output held by this match, they are computed again on demand. With materialized
+        set to False, they will not be retained anymore, neither by its submatches.
+        """
+        self._string = None
+        self._output_payload = None
+        self._output_encoding = None
+        self._materialized = materialized
+
+        if not materialized:
+            for leaf in self._leaves:
+                leaf._unload(materialized)
+
     @property
     def encoding(self) -> str:
         return self._encoding
@@ -117,13 +153,7 @@ class CharsetMatch:
         """
         Encoding name are known by many name, using this could help when searching for IBM855 when it's listed as CP855.
         """
-        also_known_as: list[str] = []
-        for u, p in aliases.items():
-            if self.encoding == u:
-                also_known_as.append(p)
-            elif self.encoding == p:
-                also_known_as.append(u)
-        return also_known_as
+        return _encoding_aliases(self.encoding)
 
     @property
     def bom(self) -> bool:
@@ -148,24 +178,7 @@ class CharsetMatch:
         "Unknown".
         """
         if not self._languages:
-            # Trying to infer the language based on the given encoding
-            # Its either English or we should not pronounce ourselves in certain cases.
-            if "ascii" in self.could_be_from_charset:
-                return "English"
-
-            # doing it there to avoid circular import
-            from charset_normalizer.cd import encoding_languages, mb_encoding_languages
-
-            languages = (
-                mb_encoding_languages(self.encoding)
-                if is_multi_byte_encoding(self.encoding)
-                else encoding_languages(self.encoding)
-            )
-
-            if len(languages) == 0 or "Latin Based" in languages:
-                return "Unknown"
-
-            return languages[0]
+            return _infer_language(self.encoding, self.could_be_from_charset)
 
         return self._languages[0][0]
 
@@ -188,7 +201,7 @@ class CharsetMatch:
         return round(self.coherence * 100, ndigits=3)
 
     @property
-    def raw(self) -> bytes | bytearray:
+    def raw(self) -> bytes | bytearray | memoryview:
         """
         Original untouched bytes.
         """
@@ -227,35 +240,230 @@ class CharsetMatch:
         Any errors will be simply ignored by the encoder NOT replaced.
         """
         if self._output_encoding is None or self._output_encoding != encoding:
-            self._output_encoding = encoding
             decoded_string = str(self)
-            if (
-                self._preemptive_declaration is not None
-                and self._preemptive_declaration.lower()
-                not in ["utf-8", "utf8", "utf_8"]
-            ):
-                patched_header = sub(
-                    RE_POSSIBLE_ENCODING_INDICATION,
-                    lambda m: m.string[m.span()[0] : m.span()[1]].replace(
-                        m.groups()[0],
-                        iana_name(self._output_encoding).replace("_", "-"),  # type: ignore[arg-type]
-                    ),
-                    decoded_string[:8192],
-                    count=1,
+            if self._should_patch_header:
+                decoded_string = (
+                    self._patch_header(decoded_string[:8192], encoding)
+                    + decoded_string[8192:]
                 )
 
-                decoded_string = patched_header + decoded_string[8192:]
+            if not self._materialized:
+                return decoded_string.encode(encoding, "replace")
 
+            self._output_encoding = encoding
             self._output_payload = decoded_string.encode(encoding, "replace")
 
         return self._output_payload  # type: ignore
 
+    def iter_output(
+        self, encoding: str = "utf_8", chunk_size: int = DECODE_WINDOW_SIZE
+    ) -> Iterator[bytes]:
+        """
+        Same as output() but yield the re-encoded payload piece by piece. The raw payload is decoded and encoded
+        incrementally, chunk_size byte(s) at a time, so that the whole str and output are never held in memory.
+        Can raise UnicodeDecodeError midway if the payload does not decode with the guessed encoding.
+        """
+        encoder = getincrementalencoder(encoding)(errors="replace")
+        pending_header: str | None = "" if self._should_patch_header else None
+
+        for decoded_piece in self._iter_decoded(chunk_size):
+            if pending_header is not None:
+                # The encoding declaration is only looked for within the first 8192 characters.
+                pending_header += decoded_piece
+
+                if len(pending_header) < 8192:
+                    continue
+
+                decoded_piece = (
+                    self._patch_header(pending_header[:8192], encoding)
+                    + pending_header[8192:]
+                )
+                pending_header = None
+
+            output_piece: bytes = encoder.encode(decoded_piece)
+
+            if output_piece:
+                yield output_piece
+
+        output_piece = encoder.encode(
+            self._patch_header(pending_header, encoding)
+            if pending_header is not None
+            else "",
+            True,
+        )
+
+        if output_piece:
+            yield output_piece
+
+    def output_to(
+        self,
+        fp: BinaryIO,
+        encoding: str = "utf_8",
+        chunk_size: int = DECODE_WINDOW_SIZE,
+    ) -> int:
+        """
+        Write the re-encoded payload (see output()) into given binary file pointer, within a memory footprint bounded
+        by chunk_size. Return the count of byte(s) written.
+        """
+        written: int = 0
+
+        for output_piece in self.iter_output(encoding, chunk_size):
+            fp.write(output_piece)
+            written += len(output_piece)
+
+        return written
+
+    def _iter_decoded(self, chunk_size: int) -> Iterator[str]:
+        """
+        Yield str(self) piece by piece, without decoding the whole payload at once unless it is already.
+        """
+        if self._string is not None:
+            for i in range(0, len(self._string), chunk_size):
+                yield self._string[i : i + chunk_size]
+            return
+
+        decoder = getincrementaldecoder(self._encoding)(errors="strict")
+        leading: bool = self._has_sig_or_bom
+
+        with memoryview(self._payload) as view:
+            for i in range(0, len(view), chunk_size):
+                decoded_piece: str = decoder.decode(view[i : i + chunk_size], False)
+
+                if leading and decoded_piece:
+                    # The SIG is never part of the str, see __str__.
+                    if decoded_piece[0] == "\ufeff":
+                        decoded_piece = decoded_piece[1:]
+                    leading = False
+
+                yield decoded_piece
+
+        yield decoder.decode(b"", True)
+
+    @property
+    def _should_patch_header(self) -> bool:
+        return (
+            self._preemptive_declaration is not None
+            and self._preemptive_declaration.lower() not in ["utf-8", "utf8", "utf_8"]
+        )
+
+    def _patch_header(self, decoded_header: str, encoding: str) -> str:
+        """
+        Replace the first encoding declaration found in given decoded head with the target encoding name.
+        """
+        return sub(
+            RE_POSSIBLE_ENCODING_INDICATION,
+            lambda m: m.string[m.span()[0] : m.span()[1]].replace(
+                m.groups()[0],
+                iana_name(encoding).replace("_", "-"),
+            ),
+            decoded_header,
+            count=1,
+        )
+
     @property
     def fingerprint(self) -> int:
         """
-        Retrieve a hash fingerprint of the decoded payload, used for deduplication.
+        Retrieve a hash fingerprint of the decoded payload, used for deduplication. Computed once.
+        """
+        if self._fingerprint is None:
+            self._fingerprint = hash(str(self))
+        return self._fingerprint
+
+    def compact(self) -> CompactCharsetMatch:
+        """
+        Return a lightweight and picklable snapshot of this match. It does not retain the payload nor the
+        decoded str.
         """
-        return hash(str(self))
+        return CompactCharsetMatch(
+            self._encoding,
+            self._mean_mess_ratio,
+            self._has_sig_or_bom,
+            self._languages,
+            [m.encoding for m in self._leaves],
+            self._preemptive_declaration,
+        )
+
+
+class CompactCharsetMatch:
+    """
+    Lightweight result of a detection. Carry the same verdict as a CharsetMatch without holding the raw payload
+    or the decoded str, so it is cheap to keep around and to send across processes.
+    """
+
+    __slots__ = (
+        "_languages",
+        "bom",
+        "chaos",
+        "encoding",
+        "preemptive_declaration",
+        "submatch",
+    )
+
+    def __init__(
+        self,
+        encoding: str,
+        chaos: float,
+        bom: bool,
+        languages: CoherenceMatches,
+        submatch: list[str],
+        preemptive_declaration: str | None = None,
+    ):
+        self.encoding: str = encoding
+        self.chaos: float = chaos
+        self.bom: bool = bom
+        self._languages: CoherenceMatches = languages
+        self.submatch: list[str] = submatch
+        self.preemptive_declaration: str | None = preemptive_declaration
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompactCharsetMatch):
+            return False
+        return (
+            self.encoding == other.encoding
+            and self.chaos == other.chaos
+            and self.bom == other.bom
+            and self._languages == other._languages
+            and self.submatch == other.submatch
+        )
+
+    def __repr__(self) -> str:
+        return f"<CompactCharsetMatch '{self.encoding}' chaos({self.chaos})>"
+
+    @property
+    def byte_order_mark(self) -> bool:
+        return self.bom
+
+    @property
+    def coherence(self) -> float:
+        if not self._languages:
+            return 0.0
+        return self._languages[0][1]
+
+    @property
+    def percent_chaos(self) -> float:
+        return round(self.chaos * 100, ndigits=3)
+
+    @property
+    def percent_coherence(self) -> float:
+        return round(self.coherence * 100, ndigits=3)
+
+    @property
+    def languages(self) -> list[str]:
+        return [e[0] for e in self._languages]
+
+    @property
+    def language(self) -> str:
+        if not self._languages:
+            return _infer_language(self.encoding, self.could_be_from_charset)
+        return self._languages[0][0]
+
+    @property
+    def could_be_from_charset(self) -> list[str]:
+        return [self.encoding] + self.submatch
+
+    @property
+    def encoding_aliases(self) -> list[str]:
+        return _encoding_aliases(self.encoding)
 
 
 class CharsetMatches:
@@ -266,6 +474,10 @@ class CharsetMatches:
 
     def __init__(self, results: list[CharsetMatch] | None = None):
         self._results: list[CharsetMatch] = sorted(results) if results else []
+        self._truncated: bool = False
+        # Submatch factoring lookup, (fingerprint, chaos) -> match. Built upon the first append.
+        self._index: dict[tuple[int, float], CharsetMatch] | None = None
+        self._trace: DetectionTrace | None = None
 
     def __iter__(self) -> Iterator[CharsetMatch]:
         yield from self._results
@@ -287,6 +499,20 @@ class CharsetMatches:
     def __len__(self) -> int:
         return len(self._results)
 
+    @property
+    def truncated(self) -> bool:
+        """
+        True if the detection was cut short (cancelled or out of time), the results may be incomplete.
+        """
+        return self._truncated
+
+    @property
+    def trace(self) -> DetectionTrace | None:
+        """
+        What happened to every tested code page, when the detection was run with trace=True. None otherwise.
+        """
+        return self._trace
+
     def __bool__(self) -> bool:
         return len(self._results) > 0
 
@@ -301,14 +527,23 @@ class CharsetMatches:
                     str(item.__class__)
                 )
             )
+        if self._index is None:
+            self._index = {}
+            for match in self._results:
+                self._index.setdefault((match.fingerprint, match.chaos), match)
+
         # We should disable the submatch factoring when the input file is too heavy (conserve RAM usage)
         if len(item.raw) < TOO_BIG_SEQUENCE:
-            for match in self._results:
-                if match.fingerprint == item.fingerprint and match.chaos == item.chaos:
-                    match.add_submatch(item)
-                    return
-        self._results.append(item)
-        self._results = sorted(self._results)
+            key: tuple[int, float] = (item.fingerprint, item.chaos)
+            identical_match: CharsetMatch | None = self._index.get(key)
+
+            if identical_match is not None:
+                identical_match.add_submatch(item)
+                return
+
+            self._index[key] = item
+
+        insort(self._results, item)
 
     def best(self) -> CharsetMatch | None:
         """
@@ -329,6 +564,147 @@ CoherenceMatch = Tuple[str, float]
 CoherenceMatches = List[CoherenceMatch]
 
 
+class CandidateTrace:
+    """
+    What happened to a single code page during a detection, see DetectionTrace.
+
+    outcome is one of "skipped" (never measured), "hard_failure" (does not decode the payload), "soft_failure"
+    (too much chaos), "fast_tracked" (verdict reused from an equivalent code page), "passed" or "interrupted".
+    reason tells why a code page was not measured or failed, e.g. "similar_soft_failure", "definitive_match_family",
+    "definitive_match_cap", "decode_error" or "chaos", and detail carries the error message if any.
+    Timings are in second(s).
+    """
+
+    __slots__ = (
+        "cd_time",
+        "coherence",
+        "decode_time",
+        "detail",
+        "encoding",
+        "md_time",
+        "mess_ratios",
+        "outcome",
+        "reason",
+    )
+
+    def __init__(self, encoding: str):
+        self.encoding: str = encoding
+        self.outcome: str = "skipped"
+        self.reason: str | None = None
+        self.detail: str | None = None
+        self.mess_ratios: list[float] = []
+        self.coherence: CoherenceMatches = []
+        self.decode_time: float = 0.0
+        self.md_time: float = 0.0
+        self.cd_time: float = 0.0
+
+    def conclude(
+        self, outcome: str, reason: str | None, detail: str | None = None
+    ) -> None:
+        self.outcome = outcome
+        self.reason = reason
+        self.detail = detail
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "encoding": self.encoding,
+            "outcome": self.outcome,
+            "reason": self.reason,
+            "detail": self.detail,
+            "mess_ratios": self.mess_ratios,
+            "coherence": self.coherence,
+            "decode_time": self.decode_time,
+            "md_time": self.md_time,
+            "cd_time": self.cd_time,
+        }
+
+    def __repr__(self) -> str:
+        return f"<CandidateTrace '{self.encoding}' {self.outcome}({self.reason})>"
+
+
+class DetectionTrace:
+    """
+    Structured record of a single detection, filled only when asked for (trace=True), in the order the code pages
+    were considered. Nothing is formatted nor timed otherwise. Iterate over it to get the CandidateTrace entries,
+    or index it by encoding.
+    """
+
+    __slots__ = ("_started_at", "cached", "candidates", "elapsed")
+
+    def __init__(self, cached: bool = False) -> None:
+        self.candidates: list[CandidateTrace] = []
+        # The verdict came from a cache, nothing was measured.
+        self.cached: bool = cached
+        self.elapsed: float = 0.0
+        self._started_at: float = perf_counter()
+
+    def candidate(self, encoding: str) -> CandidateTrace:
+        candidate_trace = CandidateTrace(encoding)
+        self.candidates.append(candidate_trace)
+        return candidate_trace
+
+    def finish(self) -> None:
+        self.elapsed = perf_counter() - self._started_at
+
+    def __getitem__(self, encoding: str) -> CandidateTrace:
+        """
+        Retrieve the entry of given code page (alias may be used here). Raise KeyError if it was not considered.
+        """
+        encoding = iana_name(encoding, False)
+        for candidate_trace in self.candidates:
+            if candidate_trace.encoding == encoding:
+                return candidate_trace
+        raise KeyError(encoding)
+
+    def __iter__(self) -> Iterator[CandidateTrace]:
+        yield from self.candidates
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "cached": self.cached,
+            "elapsed": self.elapsed,
+            "candidates": [
+                candidate_trace.to_dict() for candidate_trace in self.candidates
+            ],
+        }
+
+
+def _encoding_aliases(encoding: str) -> list[str]:
+    also_known_as: list[str] = []
+    for u, p in aliases.items():
+        if encoding == u:
+            also_known_as.append(p)
+        elif encoding == p:
+            also_known_as.append(u)
+    return also_known_as
+
+
+def _infer_language(encoding: str, could_be_from_charset: list[str]) -> str:
+    """
+    Trying to infer the language based on the given encoding when the coherence detector found nothing.
+    Its either English or we should not pronounce ourselves in certain cases.
+    """
+    if "ascii" in could_be_from_charset:
+        return "English"
+
+    # doing it there to avoid circular import
+    from charset_normalizer.cd import encoding_languages, mb_encoding_languages
+
+    languages = (
+        mb_encoding_languages(encoding)
+        if is_multi_byte_encoding(encoding)
+        else encoding_languages(encoding)
+    )
+
+    if len(languages) == 0 or "Latin Based" in languages:
+        return "Unknown"
+
+    return languages[0]
+
+
 class CliDetectionResult:
     def __init__(
         self,
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import io
+import logging
+from tempfile import TemporaryFile
+from typing import IO, BinaryIO
+
+from .api import from_bytes
+from .constant import TRACE
+from .models import CharsetMatches
+from .utils import identify_sig_or_bom, truncate_sequence
+
+logger = logging.getLogger("charset_normalizer")
+
+
+class ReplayReader(io.RawIOBase):
+    """
+    Read-only binary stream that replays the bytes consumed by the detection, then continue with the remaining
+    of the source stream. Can be wrapped into io.BufferedReader and io.TextIOWrapper.
+    Closing it will not close the source stream.
+    """
+
+    def __init__(
+        self, consumed: bytes, source: BinaryIO | None, spool: IO[bytes] | None = None
+    ):
+        super().__init__()
+
+        self._consumed: memoryview = memoryview(consumed)
+        self._cursor: int = 0
+        self._source: BinaryIO | None = source
+        self._spool: IO[bytes] | None = spool
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:  # type: ignore[override]
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+        target = memoryview(buffer).cast("B")
+
+        if not len(target):
+            return 0
+
+        if self._cursor < len(self._consumed):
+            n: int = min(len(target), len(self._consumed) - self._cursor)
+            target[:n] = self._consumed[self._cursor : self._cursor + n]
+            self._cursor += n
+            return n
+
+        upstream: IO[bytes] | BinaryIO | None = (
+            self._spool if self._spool is not None else self._source
+        )
+
+        if upstream is None:
+            return 0
+
+        chunk: bytes | None = upstream.read(len(target))
+
+        if not chunk:
+            return 0
+
+        target[: len(chunk)] = chunk
+
+        return len(chunk)
+
+    def close(self) -> None:
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
+        self._consumed = memoryview(b"")
+        self._source = None
+
+        super().close()
+
+
+def _read_at_most(fp: BinaryIO, size: int) -> bytes:
+    """
+    Read up to size byte(s) from given stream. Short reads (pipe, socket) are retried until EOF.
+    """
+    buffer = bytearray()
+
+    while len(buffer) < size:
+        chunk: bytes | None = fp.read(size - len(buffer))
+
+        if not chunk:
+            break
+
+        buffer += chunk
+
+    return bytes(buffer)
+
+
+def _align_tail(
+    tail: bytes, offset: int, sig_encoding: str | None, sig_length: int
+) -> bytes:
+    """
+    Drop the leading bytes of a tail window so that it starts on a character boundary,
+    given its offset within the whole stream.
+    """
+    if sig_encoding in {"utf_16", "utf_32"}:
+        code_unit: int = 2 if sig_encoding == "utf_16" else 4
+        return tail[(code_unit - (offset - sig_length) % code_unit) % code_unit :]
+
+    line_feed: int = tail.find(b"\n", 0, 4096)
+
+    if line_feed != -1:
+        return tail[line_feed + 1 :]
+
+    # Skip UTF-8 continuation byte(s) left by the cut.
+    i: int = 0
+
+    while i < min(len(tail), 3) and 0x80 <= tail[i] <= 0xBF:
+        i += 1
+
+    return tail[i:]
+
+
+def from_stream(
+    fp: BinaryIO,
+    head_budget: int = int(1e6),
+    tail_budget: int = 0,
+    steps: int = 5,
+    chunk_size: int = 512,
+    threshold: float = 0.2,
+    cp_isolation: list[str] | None = None,
+    cp_exclusion: list[str] | None = None,
+    preemptive_behaviour: bool = True,
+    explain: bool = False,
+    language_threshold: float = 0.1,
+    enable_fallback: bool = True,
+) -> tuple[CharsetMatches, ReplayReader]:
+    """
+    Detect the charset of a non-seekable stream (pipe, socket, stdin, ...) with a bounded memory budget.
+    At most head_budget byte(s) are read and examined. Return the CharsetMatches with a ReplayReader that
+    replays the consumed bytes followed by the remaining of the stream, so that it can be decoded afterward.
+
+    With tail_budget greater than zero, the whole stream is drained and its last tail_budget byte(s) are
+    examined along with the head. The drained bytes are spooled into a temporary file, never held in memory.
+    Matches raw payload is the examined sample, not the whole stream. Will not close the file pointer.
+    """
+    if head_budget <= 0:
+        raise ValueError("head_budget must be a positive integer")
+    if tail_budget < 0:
+        raise ValueError("tail_budget must be a positive integer or zero")
+
+    head: bytes = _read_at_most(fp, head_budget)
+    exhausted: bool = len(head) < head_budget
+
+    sig_encoding, sig_payload = identify_sig_or_bom(head)
+
+    sample: bytes = head if exhausted else bytes(truncate_sequence(head, len(head) - 1))
+    spool: IO[bytes] | None = None
+
+    try:
+        if not exhausted and tail_budget:
+            # Owned by the returned ReplayReader, closed right here on error.
+            spool = TemporaryFile()  # noqa: SIM115
+            tail = bytearray()
+            total: int = len(head)
+
+            while True:
+                chunk: bytes | None = fp.read(max(tail_budget, io.DEFAULT_BUFFER_SIZE))
+
+                if not chunk:
+                    break
+
+                spool.write(chunk)
+                total += len(chunk)
+
+                tail += chunk
+                del tail[:-tail_budget]
+
+            spool.seek(0)
+
+            if tail:
+                logger.log(
+                    TRACE,
+                    "Stream drained, %i byte(s) total. Examining the last %i byte(s) along with the head.",
+                    total,
+                    len(tail),
+                )
+                offset: int = total - len(tail)
+
+                if offset == len(head):
+                    # The tail immediately follow the head, that is the whole stream.
+                    sample = head + bytes(tail)
+                else:
+                    sample += _align_tail(
+                        bytes(tail), offset, sig_encoding, len(sig_payload)
+                    )
+
+        results: CharsetMatches = from_bytes(
+            sample,
+            steps,
+            chunk_size,
+            threshold,
+            cp_isolation,
+            cp_exclusion,
+            preemptive_behaviour,
+            explain,
+            language_threshold,
+            enable_fallback,
+        )
+    except BaseException:
+        if spool is not None:
+            spool.close()
+        raise
+
+    return results, ReplayReader(head, fp if spool is None else None, spool)
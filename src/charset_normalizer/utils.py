@@ -4,19 +4,24 @@ import importlib
 import logging
 import unicodedata
 from bisect import bisect_right
-from codecs import IncrementalDecoder
+from codecs import BOM_UTF16_LE, IncrementalDecoder, getincrementaldecoder
 from encodings.aliases import aliases
-from functools import lru_cache
+from functools import wraps
+from mmap import mmap
 from re import findall
-from typing import Generator
+from typing import Callable, Generator, TypeVar
 
 from .constant import (
+    DECODE_WINDOW_SIZE,
     ENCODING_MARKS,
+    IANA_SUPPORTED,
+    IANA_SUPPORTED_COUNT,
     IANA_SUPPORTED_SIMILAR,
     RE_POSSIBLE_ENCODING_INDICATION,
+    TRACE,
     UNICODE_RANGES_COMBINED,
-    _SECONDARY_RANGE_NAMES,
     UTF8_MAXIMAL_ALLOCATION,
+    _SECONDARY_RANGE_NAMES,
     COMMON_CJK_CHARACTERS,
     _LATIN,
     _CJK,
@@ -30,6 +35,36 @@ from .constant import (
     _ACCENTUATED,
 )
 
+_T = TypeVar("_T")
+
+
+def _memoized(maxsize: int) -> Callable[[Callable[[str], _T]], Callable[[str], _T]]:
+    """
+    Bounded memoization of a pure function of a single str, backed by a plain dict. Unlike lru_cache, a hit
+    is a lock-free read with no recency bookkeeping to update, so threads never contend on free-threaded builds.
+    Once maxsize values are stored, the misses are computed without being stored.
+    Concurrent misses may compute the same value twice, the first one stored is kept.
+    """
+
+    def decorator(function: Callable[[str], _T]) -> Callable[[str], _T]:
+        memo: dict[str, _T] = {}
+
+        @wraps(function)
+        def memoized(argument: str) -> _T:
+            try:
+                return memo[argument]
+            except KeyError:
+                pass
+
+            if len(memo) >= maxsize:
+                return function(argument)
+
+            return memo.setdefault(argument, function(argument))
+
+        return memoized
+
+    return decorator
+
 
 def _character_flags(character: str) -> int:
     """Compute all name-based classification flags with a single unicodedata.name() call."""
@@ -69,7 +104,7 @@ def is_accentuated(character: str) -> bool:
     return bool(_character_flags(character) & _ACCENTUATED)
 
 
-@lru_cache(maxsize=UTF8_MAXIMAL_ALLOCATION)
+@_memoized(maxsize=UTF8_MAXIMAL_ALLOCATION)
 def remove_accent(character: str) -> str:
     decomposed: str = unicodedata.decomposition(character)
     if not decomposed:
@@ -155,47 +190,47 @@ def is_separator(character: str) -> bool:
     return "Z" in character_category or character_category in {"Po", "Pd", "Pc"}
 
 
-@lru_cache(maxsize=UTF8_MAXIMAL_ALLOCATION)
+@_memoized(maxsize=UTF8_MAXIMAL_ALLOCATION)
 def is_case_variable(character: str) -> bool:
     return character.islower() != character.isupper()
 
 
-@lru_cache(maxsize=UTF8_MAXIMAL_ALLOCATION)
+@_memoized(maxsize=UTF8_MAXIMAL_ALLOCATION)
 def is_cjk(character: str) -> bool:
     return bool(_character_flags(character) & _CJK)
 
 
-@lru_cache(maxsize=UTF8_MAXIMAL_ALLOCATION)
+@_memoized(maxsize=UTF8_MAXIMAL_ALLOCATION)
 def is_hiragana(character: str) -> bool:
     return bool(_character_flags(character) & _HIRAGANA)
 
 
-@lru_cache(maxsize=UTF8_MAXIMAL_ALLOCATION)
+@_memoized(maxsize=UTF8_MAXIMAL_ALLOCATION)
 def is_katakana(character: str) -> bool:
     return bool(_character_flags(character) & _KATAKANA)
 
 
-@lru_cache(maxsize=UTF8_MAXIMAL_ALLOCATION)
+@_memoized(maxsize=UTF8_MAXIMAL_ALLOCATION)
 def is_hangul(character: str) -> bool:
     return bool(_character_flags(character) & _HANGUL)
 
 
-@lru_cache(maxsize=UTF8_MAXIMAL_ALLOCATION)
+@_memoized(maxsize=UTF8_MAXIMAL_ALLOCATION)
 def is_thai(character: str) -> bool:
     return bool(_character_flags(character) & _THAI)
 
 
-@lru_cache(maxsize=UTF8_MAXIMAL_ALLOCATION)
+@_memoized(maxsize=UTF8_MAXIMAL_ALLOCATION)
 def is_arabic(character: str) -> bool:
     return bool(_character_flags(character) & _ARABIC)
 
 
-@lru_cache(maxsize=UTF8_MAXIMAL_ALLOCATION)
+@_memoized(maxsize=UTF8_MAXIMAL_ALLOCATION)
 def is_arabic_isolated_form(character: str) -> bool:
     return bool(_character_flags(character) & _ARABIC_ISOLATED_FORM)
 
 
-@lru_cache(maxsize=UTF8_MAXIMAL_ALLOCATION)
+@_memoized(maxsize=UTF8_MAXIMAL_ALLOCATION)
 def is_cjk_uncommon(character: str) -> bool:
     return character not in COMMON_CJK_CHARACTERS
 
@@ -204,7 +239,7 @@ def is_unicode_range_secondary(range_name: str) -> bool:
     return range_name in _SECONDARY_RANGE_NAMES
 
 
-@lru_cache(maxsize=UTF8_MAXIMAL_ALLOCATION)
+@_memoized(maxsize=UTF8_MAXIMAL_ALLOCATION)
 def is_unprintable(character: str) -> bool:
     return (
         not character.isspace()  # includes \n \t \r \v
@@ -216,18 +251,18 @@ def is_unprintable(character: str) -> bool:
 
 
 def any_specified_encoding(
-    sequence: bytes | bytearray, search_zone: int = 8192
+    sequence: bytes | bytearray | memoryview, search_zone: int = 8192
 ) -> str | None:
     """
     Extract using ASCII-only decoder any specified encoding in the first n-bytes.
     """
-    if not isinstance(sequence, (bytes, bytearray)):
+    if not isinstance(sequence, (bytes, bytearray, memoryview, mmap)):
         raise TypeError
 
     seq_len: int = len(sequence)
 
-    decoded_zone: str = sequence[: min(seq_len, search_zone)].decode(
-        "ascii", errors="ignore"
+    decoded_zone: str = str(
+        sequence[: min(seq_len, search_zone)], "ascii", errors="ignore"
     )
 
     # Cheap literal pre-filter.
@@ -258,7 +293,7 @@ def any_specified_encoding(
     return None
 
 
-@lru_cache(maxsize=128)
+@_memoized(maxsize=128)
 def is_multi_byte_encoding(name: str) -> bool:
     """
     Verify is a specific encoding is a multi byte one based on it IANA name
@@ -300,7 +335,136 @@ def is_multi_byte_encoding(name: str) -> bool:
     return False
 
 
-def identify_sig_or_bom(sequence: bytes | bytearray) -> tuple[str | None, bytes]:
+@_memoized(maxsize=IANA_SUPPORTED_COUNT)
+def single_byte_decoding_table(iana_name: str) -> tuple[str | None, ...]:
+    """
+    Return, for each of the 256 byte values, the character a single byte code page decode it into.
+    None stand for a byte that the code page does not define (decoding it raise UnicodeDecodeError).
+    """
+    if is_multi_byte_encoding(iana_name):
+        raise OSError(  # Defensive:
+            "Function not supported on multi-byte code page"
+        )
+
+    table: list[str | None] = []
+
+    for i in range(256):
+        try:
+            table.append(bytes([i]).decode(iana_name))
+        except UnicodeDecodeError:
+            table.append(None)
+
+    return tuple(table)
+
+
+@_memoized(maxsize=IANA_SUPPORTED_COUNT)
+def single_byte_undefined_mask(iana_name: str) -> int:
+    """
+    Bitmap (bit n stand for the byte n) of the byte values that a single byte code page does not define.
+    """
+    mask: int = 0
+
+    for i, character in enumerate(single_byte_decoding_table(iana_name)):
+        if character is None:
+            mask |= 1 << i
+
+    return mask
+
+
+@_memoized(maxsize=IANA_SUPPORTED_COUNT)
+def is_ascii_transparent(iana_name: str) -> bool:
+    """
+    Verify that any 7-bit byte sequence decode exactly as ascii would with given code page.
+    """
+    try:
+        return bytes(range(128)).decode(iana_name) == bytes(range(128)).decode("ascii")
+    except (UnicodeDecodeError, LookupError):
+        return False
+
+
+# Built on first use, see _byte_presence_tables.
+_BYTE_PRESENCE_TABLES: tuple[bytes, list[tuple[int, bytes]]] | None = None
+
+
+def _byte_presence_tables() -> tuple[bytes, list[tuple[int, bytes]]]:
+    """
+    Printable 7-bit bytes that every single byte code page define (safe to ignore), and the byte values worth
+    looking for.
+    """
+    global _BYTE_PRESENCE_TABLES
+
+    if _BYTE_PRESENCE_TABLES is None:
+        _BYTE_PRESENCE_TABLES = _build_byte_presence_tables()
+
+    return _BYTE_PRESENCE_TABLES
+
+
+def _build_byte_presence_tables() -> tuple[bytes, list[tuple[int, bytes]]]:
+    undefined_anywhere: int = 0
+
+    for iana_encoding in IANA_SUPPORTED:
+        try:
+            if is_multi_byte_encoding(iana_encoding):
+                continue
+            undefined_anywhere |= single_byte_undefined_mask(iana_encoding)
+        except (LookupError, ImportError):  # Defensive: unavailable codec.
+            continue
+
+    ignored: bytes = bytes(
+        i for i in range(0x20, 0x7F) if not undefined_anywhere & (1 << i)
+    )
+
+    return ignored, [(i, bytes([i])) for i in range(256) if i not in ignored]
+
+
+def byte_presence_mask(sequence: bytes | bytearray | memoryview) -> int:
+    """
+    Bitmap (bit n stand for the byte n) of the byte values present in given sequence. Printable 7-bit bytes
+    that every single byte code page define are never reported.
+    """
+    ignored, _ = _byte_presence_tables()
+
+    mask: int = 0
+    # Ignored byte values, then every byte value already reported.
+    deleted: bytearray = bytearray(ignored)
+
+    # Windowed, so that the translated copy stays bounded on large payloads. Each window is
+    # scanned once by translate, only the byte values not seen before survive it.
+    for cursor in range(0, len(sequence), DECODE_WINDOW_SIZE):
+        for byte in set(
+            bytes(sequence[cursor : cursor + DECODE_WINDOW_SIZE]).translate(
+                None, deleted
+            )
+        ):
+            mask |= 1 << byte
+            deleted.append(byte)
+
+    return mask
+
+
+def identity_byte_values(present_bytes_mask: int) -> bytes:
+    """
+    Byte values that decide whether two single byte code pages decode a payload identically: the ones
+    reported by byte_presence_mask along with the printable 7-bit bytes it never report.
+    """
+    ignored, looked_for = _byte_presence_tables()
+
+    return ignored + bytes(i for i, _ in looked_for if present_bytes_mask & (1 << i))
+
+
+def single_byte_identity_key(iana_name: str, byte_values: bytes) -> str:
+    """
+    What a single byte code page decode given byte values into, using its decoding table. Two code pages
+    that share the same key for the identity_byte_values of a payload decode it into the very same str.
+    """
+    table: tuple[str | None, ...] = single_byte_decoding_table(iana_name)
+
+    return "".join([table[i] or "\ufffd" for i in byte_values])
+
+
+def identify_sig_or_bom(
+    sequence: bytes | bytearray | memoryview,
+) -> tuple[str | None, bytes]:
     """
     Identify and extract SIG/BOM in given sequence.
     """
@@ -312,12 +476,58 @@ def identify_sig_or_bom(sequence: bytes | bytearray) -> tuple[str | None, bytes]
             marks = [marks]
 
         for mark in marks:
-            if sequence.startswith(mark):
+            if sequence[: len(mark)] == mark:
                 return iana_encoding, mark
 
     return None, b""
 
 
+def truncate_sequence(sequence: bytes | bytearray, limit: int) -> bytes | bytearray:
+    """
+    Cut given sequence to at most limit byte(s), trying hard not to split a multi-byte character in half.
+    The cut happen right after the last line feed found near the limit, or before an incomplete UTF-8 character
+    otherwise. With an UTF-16 or UTF-32 BOM, the cut is aligned on a code unit and never leave a lone high
+    surrogate behind.
+    """
+    if len(sequence) <= limit:
+        return sequence
+
+    sig_encoding, sig_payload = identify_sig_or_bom(sequence)
+
+    if sig_encoding in {"utf_16", "utf_32"}:
+        code_unit: int = 2 if sig_encoding == "utf_16" else 4
+        limit -= (limit - len(sig_payload)) % code_unit
+
+        if code_unit == 2 and limit - len(sig_payload) >= 2:
+            last_unit: bytes = bytes(sequence[limit - 2 : limit])
+            high_byte: int = (
+                last_unit[1] if sig_payload == BOM_UTF16_LE else last_unit[0]
+            )
+            if 0xD8 <= high_byte <= 0xDB:
+                limit -= 2
+
+        return sequence[:limit]
+
+    line_feed: int = sequence.rfind(b"\n", max(0, limit - 4096), limit)
+
+    if line_feed != -1:
+        return sequence[: line_feed + 1]
+
+    # No line feed around, at least avoid cutting an UTF-8 character in half.
+    for i in range(limit - 1, max(0, limit - 4) - 1, -1):
+        if sequence[i] < 0x80:
+            break
+        if sequence[i] >= 0xC0:
+            expected_length: int = (
+                2 if sequence[i] < 0xE0 else 3 if sequence[i] < 0xF0 else 4
+            )
+            if limit - i < expected_length:
+                limit = i
+            break
+
+    return sequence[:limit]
+
+
 def should_strip_sig_or_bom(iana_encoding: str) -> bool:
     return iana_encoding not in {"utf_16", "utf_32"}
 
@@ -370,6 +580,19 @@ def is_cp_similar(iana_name_a: str, iana_name_b: str) -> bool:
     )
 
 
+# Records of the detections made with explain=True. Its level and handler are set once
+# here, so that toggling explain never mutate the "charset_normalizer" logger shared with
+# concurrent calls. Records still propagate to the "charset_normalizer" handlers.
+explain_handler = logging.StreamHandler()
+explain_handler.setFormatter(
+    logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
+)
+
+explain_logger = logging.getLogger("charset_normalizer.explain")
+explain_logger.setLevel(TRACE)
+explain_logger.addHandler(explain_handler)
+
+
 def set_logging_handler(
     name: str = "charset_normalizer",
     level: int = logging.INFO,
@@ -383,8 +606,45 @@ def set_logging_handler(
     logger.addHandler(handler)
 
 
+def windowed_decode_length(
+    sequences: bytes | bytearray | memoryview,
+    encoding_iana: str,
+    start: int = 0,
+    window_size: int = DECODE_WINDOW_SIZE,
+    boundaries: dict[int, int] | None = None,
+) -> int:
+    """
+    Strictly decode the payload from given offset and return the count of decoded characters. The bytes are fed to
+    an incremental decoder one memoryview window at a time, so that neither a copy of the payload nor the whole
+    decoded str is ever allocated. Raise UnicodeDecodeError on the first invalid window, positions are relative to it.
+    Each offset key of boundaries is mapped to the start of the character it falls in.
+    """
+    decoder: IncrementalDecoder = getincrementaldecoder(encoding_iana)(errors="strict")
+    decoded_length: int = 0
+    cursor: int = start
+
+    with memoryview(sequences) as view:
+        length: int = len(view)
+
+        cuts: list[int] = sorted(
+            offset for offset in (boundaries or ()) if start < offset < length
+        )
+
+        for cut in cuts + [length]:
+            while cursor < cut:
+                window_end: int = min(cursor + window_size, cut)
+                decoded_length += len(decoder.decode(view[cursor:window_end], False))
+                cursor = window_end
+
+            if boundaries is not None and cut < length:
+                # Bytes held by the decoder belong to a character started before the cut.
+                boundaries[cut] = cut - len(decoder.getstate()[0])
+
+    return decoded_length + len(decoder.decode(b"", True))
+
+
 def cut_sequence_chunks(
-    sequences: bytes | bytearray,
+    sequences: bytes | bytearray | memoryview,
     encoding_iana: str,
     offsets: range,
     chunk_size: int,
@@ -394,6 +654,7 @@ def cut_sequence_chunks(
     is_multi_byte_decoder: bool,
     decoded_payload: str | None = None,
     deferred_decoding: bool = False,
+    boundaries: dict[int, int] | None = None,
 ) -> Generator[str, None, None]:
     if decoded_payload and not is_multi_byte_decoder:
         for i in offsets:
@@ -409,7 +670,9 @@ def cut_sequence_chunks(
         # short trailing chunks included, and raises UnicodeDecodeError on
         # invalid bytes just like the whole-payload decode would.
         base_bytes = (
-            sequences if not strip_sig_or_bom else sequences[len(sig_payload) :]
+            sequences
+            if not strip_sig_or_bom
+            else memoryview(sequences)[len(sig_payload) :]
         )
         for i in offsets:
             cut_sequence = base_bytes[i : i + chunk_size]
@@ -427,7 +690,8 @@ def cut_sequence_chunks(
             if bom_or_sig_available and not strip_sig_or_bom:
                 cut_sequence = sig_payload + cut_sequence
 
-            chunk = cut_sequence.decode(
+            chunk = str(
+                cut_sequence,
                 encoding_iana,
                 errors="ignore" if is_multi_byte_decoder else "strict",
             )
@@ -437,7 +701,21 @@ def cut_sequence_chunks(
             if is_multi_byte_decoder and i > 0:
                 chunk_partial_size_chk: int = min(chunk_size, 16)
 
-                if (
+                if boundaries and boundaries.get(i, i) != i:
+                    # The character boundary was located while validating the payload,
+                    # its decoding stands for the whole decoded payload lookup below.
+                    cut_sequence = sequences[boundaries[i] : chunk_end]
+
+                    if bom_or_sig_available and not strip_sig_or_bom:
+                        cut_sequence = sig_payload + cut_sequence
+
+                    aligned_chunk: str = str(
+                        cut_sequence, encoding_iana, errors="ignore"
+                    )
+
+                    if chunk[:chunk_partial_size_chk] not in aligned_chunk:
+                        chunk = aligned_chunk
+                elif (
                     decoded_payload
                     and chunk[:chunk_partial_size_chk] not in decoded_payload
                 ):
@@ -447,7 +725,7 @@ def cut_sequence_chunks(
                         if bom_or_sig_available and not strip_sig_or_bom:
                             cut_sequence = sig_payload + cut_sequence
 
-                        chunk = cut_sequence.decode(encoding_iana, errors="ignore")
+                        chunk = str(cut_sequence, encoding_iana, errors="ignore")
 
                         if chunk[:chunk_partial_size_chk] in decoded_payload:
                             break
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+from os import pardir, path
+from threading import Event
+
+import pytest
+
+from charset_normalizer import (
+    afrom_bytes,
+    afrom_path,
+    ais_binary,
+    from_bytes,
+    from_path,
+)
+
+DIR_PATH = path.join(path.dirname(path.realpath(__file__)), pardir)
+
+
+def test_afrom_bytes_match_from_bytes():
+    payload = "Bсеки човек има право на образование. Oбразованието!".encode("cp1251")
+
+    best_guess = asyncio.run(afrom_bytes(payload)).best()
+    expected = from_bytes(payload).best()
+
+    assert best_guess is not None and expected is not None
+    assert best_guess.encoding == expected.encoding
+    assert str(best_guess) == str(expected)
+
+
+@pytest.mark.parametrize(
+    "file_name",
+    ["sample-arabic-1.txt", "sample-chinese.txt", "sample-french-1.txt"],
+)
+def test_afrom_path_match_from_path(file_name: str):
+    file_path = path.join(DIR_PATH, "data", file_name)
+
+    best_guess = asyncio.run(afrom_path(file_path)).best()
+    expected = from_path(file_path).best()
+
+    assert best_guess is not None and expected is not None
+    assert best_guess.encoding == expected.encoding
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        (b"\x00\x5f\x2f\xff" * 50, True),
+        (b"Le point de vue de l'auteur.", False),
+    ],
+)
+def test_ais_binary(raw: bytes, expected: bool):
+    assert asyncio.run(ais_binary(raw)) is expected
+
+
+def test_ais_binary_path():
+    assert (
+        asyncio.run(ais_binary(path.join(DIR_PATH, "data", "sample-french.txt")))
+        is False
+    )
+
+
+def test_cancel_token_stops_detection():
+    cancel_token = Event()
+    cancel_token.set()
+
+    results = from_bytes(
+        "Bсеки човек има право на образование.".encode("cp1251"),
+        cancel_token=cancel_token,
+    )
+
+    assert len(results) == 0
+
+
+def test_afrom_bytes_cancellation():
+    payload = ("Bсеки човек има право на образование. " * 4096).encode("cp1251")
+
+    async def cancel_while_detecting() -> None:
+        task = asyncio.ensure_future(afrom_bytes(payload))
+        await asyncio.sleep(0)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancel_while_detecting())
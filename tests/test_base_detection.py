@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+from array import array
+from glob import glob
+from io import BytesIO
+from os import pardir, path
+from random import Random
+
 import pytest
 
+import charset_normalizer.api
 from charset_normalizer.api import from_bytes
-from charset_normalizer.models import CharsetMatches
+from charset_normalizer.models import CharsetMatch, CharsetMatches
+
+DIR_PATH = path.join(path.dirname(path.realpath(__file__)), pardir)
 
 
 def test_empty():
@@ -233,3 +242,215 @@ def test_match_equality_with_arbitrary_string():
 
     # Membership relies on __eq__, so this must not raise either.
     assert "not-a-real-encoding" not in [best_guess]
+
+
+def test_undefined_byte_excludes_single_byte_code_page():
+    payload = "Bonjour, ça va très bien à Paris?".encode("cp1252") + b"\x81"
+
+    results = from_bytes(payload)
+
+    assert results.best() is not None
+
+    for match in results:
+        assert "cp1252" not in match.could_be_from_charset
+
+
+def test_seven_bit_payload_is_not_tried_against_every_code_page():
+    payload = b"\x01\x02\x03 Hello World \x1b\x1c\x1d\x1e\x7f" * 8
+
+    results = from_bytes(payload, cp_exclusion=["utf_8"])
+
+    for match in results:
+        assert match.encoding not in {"cp1252", "latin_1", "cp1251"}
+
+
+def test_identical_code_pages_are_grouped_as_submatches():
+    payload = "Café crème, très bien. Où est la gare?".encode("cp1252")
+
+    results = from_bytes(payload, cp_isolation=["cp1252", "latin_1", "iso8859_15"])
+
+    assert len(results) == 1
+    assert set(results.best().could_be_from_charset) == {
+        "cp1252",
+        "latin_1",
+        "iso8859_15",
+    }
+    assert str(results.best()) == payload.decode("cp1252")
+
+
+def _noisy_payload(seed: int) -> bytes:
+    generator = Random(seed)
+    return bytes(generator.randrange(0x20, 0x100) for _ in range(4096))
+
+
+def _read(sample: str) -> bytes:
+    with open(sample, "rb") as fp:
+        return fp.read()
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [_read(sample) for sample in sorted(glob(path.join(DIR_PATH, "data", "sample-*")))]
+    + [_noisy_payload(seed) for seed in range(4)],
+)
+def test_prescreen_does_not_change_the_results(payload: bytes, monkeypatch):
+    results = from_bytes(payload)
+
+    # Without a byte presence mask, every candidate is decoded and measured in the usual order.
+    monkeypatch.setattr(charset_normalizer.api, "byte_presence_mask", lambda _: None)
+
+    expected = from_bytes(payload)
+
+    assert len(results) == len(expected)
+    assert [match.encoding for match in results] == [
+        match.encoding for match in expected
+    ]
+    assert [set(match.could_be_from_charset) for match in results] == [
+        set(match.could_be_from_charset) for match in expected
+    ]
+    assert [match.chaos for match in results] == [match.chaos for match in expected]
+
+
+def test_max_candidates_must_be_positive():
+    with pytest.raises(ValueError):
+        from_bytes(b"Hello World", max_candidates=0)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        "Bonjour, où êtes-vous allés l'été dernier ?".encode("cp1252"),
+        "\ufeffПривет, как у вас дела сегодня?".encode("utf_8"),
+        "我没有埋怨，磋砣的只是一些时间。".encode("gb18030"),
+    ],
+)
+@pytest.mark.parametrize(
+    "into_buffer",
+    [
+        memoryview,
+        lambda payload: array("B", payload),
+        lambda payload: memoryview(bytearray(payload)).cast("c"),
+    ],
+)
+def test_buffer_protocol_payload(payload: bytes, into_buffer):
+    expected = from_bytes(payload)
+    results = from_bytes(into_buffer(payload))
+
+    assert [(m.encoding, m.chaos, m.coherence) for m in results] == [
+        (m.encoding, m.chaos, m.coherence) for m in expected
+    ]
+    assert str(results.best()) == str(expected.best())
+    assert bytes(results.best().raw) == payload
+
+
+def test_unsupported_payload_type():
+    with pytest.raises(TypeError):
+        from_bytes("Hello World")
+
+    with pytest.raises(TypeError):
+        from_bytes(memoryview(b"Hello World")[::2])
+
+
+def test_alternatives_release_decoded_str():
+    payload = "Bonjour, où êtes-vous allés l'été dernier ? Très bien.".encode("cp1252")
+
+    results = from_bytes(payload)
+
+    assert len(results) > 1
+    assert results.best()._string is not None
+    assert all(match._string is None for match in list(results)[1:])
+    assert str(results[1]) == payload.decode(results[1].encoding)
+
+
+def test_not_materialized_matches():
+    payload = "Bonjour, où êtes-vous allés l'été dernier ? Très bien.".encode("cp1252")
+
+    expected = from_bytes(payload)
+    results = from_bytes(payload, materialize=False)
+
+    assert [(m.encoding, m.chaos, m.coherence) for m in results] == [
+        (m.encoding, m.chaos, m.coherence) for m in expected
+    ]
+
+    for match, expected_match in zip(results, expected):
+        assert str(match) == str(expected_match)
+        assert match.output() == expected_match.output()
+        assert match._string is None
+        assert match._output_payload is None
+
+
+def test_not_materialized_submatch():
+    payload = "Bonjour, où êtes-vous allés l'été dernier ? Très bien.".encode("cp1252")
+
+    match = CharsetMatch(payload, "cp1252", 0.0, False, [])
+    submatch = CharsetMatch(payload, "iso8859_15", 0.0, False, [])
+    submatch._unload(materialized=False)
+
+    match.add_submatch(submatch)
+
+    assert str(submatch) == payload.decode("iso8859_15")
+    assert submatch._string is None
+
+
+def test_matches_append_keep_order_and_factor_submatches():
+    payload = "Café crème, très bien. Où est la gare?".encode("cp1252")
+    matches = [
+        CharsetMatch(payload, encoding, chaos, False, [])
+        for encoding, chaos in [
+            ("cp1252", 0.02),
+            ("latin_1", 0.02),
+            ("cp1251", 0.3),
+            ("iso8859_15", 0.02),
+            ("mac_roman", 0.12),
+            ("cp1250", 0.01),
+        ]
+    ]
+
+    results = CharsetMatches()
+
+    for match in matches:
+        results.append(match)
+
+    assert [match.encoding for match in results] == [
+        "cp1250",
+        "cp1252",
+        "mac_roman",
+        "cp1251",
+    ]
+    assert results["latin_1"].could_be_from_charset == [
+        "cp1252",
+        "latin_1",
+        "iso8859_15",
+    ]
+
+
+def test_match_fingerprint_computed_once():
+    # Not decodable as utf_8: a second fingerprint computation would raise.
+    match = CharsetMatch(b"\xff\xfe", "utf_8", 0.0, False, [], "decoded")
+
+    fingerprint = match.fingerprint
+    match._unload()
+
+    assert match.fingerprint == fingerprint == hash("decoded")
+    assert match.multi_byte_usage == 1.0 - len("decoded") / 2
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        "\ufeffПривет, как у вас дела сегодня?".encode("utf_8"),
+        "\ufeffПривет, как у вас дела сегодня?".encode("utf_16"),
+        b'<?xml version="1.0" encoding="ISO-8859-1"?>\n'
+        + "Café crème, très bien. ".encode("latin_1") * 1000,
+    ],
+)
+@pytest.mark.parametrize("encoding", ["utf_8", "utf_16", "cp1252"])
+@pytest.mark.parametrize("chunk_size", [3, 4096])
+def test_match_output_to(payload: bytes, encoding: str, chunk_size: int):
+    for match in from_bytes(payload, materialize=False):
+        fp = BytesIO()
+
+        written = match.output_to(fp, encoding, chunk_size=chunk_size)
+
+        assert fp.getvalue() == match.output(encoding)
+        assert written == len(fp.getvalue())
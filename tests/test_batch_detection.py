@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pickle
+from glob import glob
+from os import pardir, path
+
+import pytest
+
+from charset_normalizer import from_bytes, from_bytes_many, from_path, from_paths
+from charset_normalizer.models import CompactCharsetMatch
+
+DIR_PATH = path.join(path.dirname(path.realpath(__file__)), pardir)
+
+SAMPLES = sorted(glob(path.join(DIR_PATH, "data", "sample-*.txt")))
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_from_paths_match_sequential_detection(ordered: bool):
+    results = dict(from_paths(SAMPLES, max_workers=2, batch_size=3, ordered=ordered))
+
+    assert sorted(results) == list(range(len(SAMPLES)))
+
+    for index, sample_path in enumerate(SAMPLES):
+        expected = from_path(sample_path).best()
+        compact_result = results[index]
+
+        assert expected is not None and compact_result is not None
+        assert compact_result.encoding == expected.encoding
+        assert compact_result.language == expected.language
+        assert compact_result.chaos == expected.chaos
+        assert compact_result.could_be_from_charset == expected.could_be_from_charset
+
+
+def test_from_bytes_many_ordered():
+    payloads = [
+        b"hello world",
+        "Bсеки човек има право на образование.".encode("cp1251"),
+        b"\x00\x01\x02\x03\xff\xfe" * 64,
+    ]
+
+    results = list(
+        from_bytes_many(payloads, max_workers=1, batch_size=2, enable_fallback=False)
+    )
+
+    assert [index for index, _ in results] == [0, 1, 2]
+
+    for (_, compact_result), payload in zip(results, payloads):
+        expected = from_bytes(payload, enable_fallback=False).best()
+
+        if expected is None:
+            assert compact_result is None
+            continue
+
+        assert compact_result is not None
+        assert compact_result.encoding == expected.encoding
+
+
+def test_compact_match_is_picklable():
+    compact_result = (
+        from_bytes("Bсеки човек има право".encode("cp1251")).best().compact()
+    )
+
+    assert isinstance(compact_result, CompactCharsetMatch)
+    assert pickle.loads(pickle.dumps(compact_result)) == compact_result
+    assert not hasattr(compact_result, "__dict__")
+
+
+@pytest.mark.parametrize("kwargs", [{"batch_size": 0}, {"max_workers": 0}])
+def test_batch_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        from_bytes_many([b"hello"], **kwargs)
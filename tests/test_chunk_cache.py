@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from os import pardir, path
+from threading import Thread
+
+import pytest
+
+from charset_normalizer import from_bytes
+from charset_normalizer.cache import (
+    ShardedBoundedCache,
+    chunk_caches_enabled,
+    chunk_caches_stats,
+    configure_chunk_caches,
+)
+
+DIR_PATH = path.join(path.dirname(path.realpath(__file__)), pardir)
+
+
+@pytest.fixture
+def chunk_caches():
+    configure_chunk_caches(enabled=True)
+    yield
+    configure_chunk_caches(enabled=True, max_size=8 * 1024 * 1024)
+
+
+def read_sample(name: str) -> bytes:
+    with open(path.join(DIR_PATH, "data", name), "rb") as fp:
+        return fp.read()
+
+
+def test_chunk_caches_shared_across_calls(chunk_caches):
+    payload = read_sample("sample-russian-2.txt")
+
+    expected = from_bytes(payload).best()
+    misses = chunk_caches_stats()["mess_ratio"]["misses"]
+
+    best_guess = from_bytes(payload).best()
+    stats = chunk_caches_stats()
+
+    assert best_guess.encoding == expected.encoding
+    assert best_guess.chaos == expected.chaos
+    assert best_guess.languages == expected.languages
+
+    assert stats["mess_ratio"]["misses"] == misses
+    assert stats["mess_ratio"]["hits"] > 0
+    assert stats["coherence_ratio"]["hits"] > 0
+
+
+def test_chunk_caches_disabled(chunk_caches):
+    payload = read_sample("sample-french.txt")
+    expected = from_bytes(payload).best()
+
+    configure_chunk_caches(enabled=False)
+
+    assert chunk_caches_enabled() is False
+
+    best_guess = from_bytes(payload).best()
+
+    assert best_guess.encoding == expected.encoding
+    assert best_guess.chaos == expected.chaos
+    assert chunk_caches_stats()["mess_ratio"]["entries"] == 0
+    assert chunk_caches_stats()["coherence_ratio"]["entries"] == 0
+
+
+def test_chunk_caches_bounded(chunk_caches):
+    configure_chunk_caches(max_size=4096)
+
+    for name in ("sample-french.txt", "sample-russian-2.txt", "sample-chinese.txt"):
+        from_bytes(read_sample(name))
+
+    stats = chunk_caches_stats()
+
+    for chunk_cache in ("mess_ratio", "coherence_ratio"):
+        assert stats[chunk_cache]["size"] <= 4096
+        assert stats[chunk_cache]["max_size"] == 4096
+
+    assert stats["mess_ratio"]["evictions"] > 0
+
+
+def test_chunk_caches_shared_across_threads(chunk_caches):
+    payload = read_sample("sample-russian-2.txt")
+
+    from_bytes(payload)
+    misses = chunk_caches_stats()["mess_ratio"]["misses"]
+
+    def detect() -> None:
+        from_bytes(payload)
+
+    # Another thread reuses what this one measured.
+    thread = Thread(target=detect)
+    thread.start()
+    thread.join()
+
+    stats = chunk_caches_stats()
+
+    assert stats["mess_ratio"]["misses"] == misses
+    assert stats["mess_ratio"]["hits"] > 0
+
+
+def test_chunk_caches_bound_is_process_wide(chunk_caches):
+    configure_chunk_caches(max_size=64 * 1024)
+
+    threads = [
+        Thread(target=from_bytes, args=(read_sample(name),))
+        for name in ("sample-french.txt", "sample-russian-2.txt", "sample-chinese.txt")
+    ]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = chunk_caches_stats()
+
+    for chunk_cache in ("mess_ratio", "coherence_ratio"):
+        assert stats[chunk_cache]["size"] <= 64 * 1024
+        assert stats[chunk_cache]["max_size"] == 64 * 1024
+
+
+def test_sharded_cache_split():
+    chunk_cache = ShardedBoundedCache(8 * 1024 * 1024)
+
+    assert len(chunk_cache._shards) == 16
+    assert chunk_cache.max_size == 8 * 1024 * 1024
+
+    chunk_cache.max_size = 1000
+
+    assert len(chunk_cache._shards) == 1
+    assert chunk_cache.max_size == 1000
+
+    chunk_cache.put("key", 1.0, 10)
+
+    assert chunk_cache.get("key") == 1.0
+    assert chunk_cache.get("other") is None
+    assert chunk_cache.stats()["hits"] == 1
+    assert chunk_cache.stats()["misses"] == 1
+    assert len(chunk_cache) == 1
+
+
+def test_chunk_caches_invalid_size():
+    with pytest.raises(ValueError):
+        configure_chunk_caches(max_size=0)
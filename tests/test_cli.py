@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import json
+import subprocess
+import sys
 import unittest
-from os import pardir, path, remove
+from contextlib import redirect_stdout
+from io import StringIO
+from os import listdir, makedirs, pardir, path, remove
 from os.path import exists
+from shutil import copyfile
+from tempfile import TemporaryDirectory
 from unittest.mock import patch
 
 from charset_normalizer.cli import cli_detect, query_yes_no
@@ -184,6 +191,184 @@ class TestCommandLineInterface(unittest.TestCase):
             cli_detect([DIR_PATH + "/data/sample-arabic-1.txt", "--force"]), 1
         )
 
+    def _make_tree(self, root):
+        makedirs(path.join(root, "sub", "deep"))
+        makedirs(path.join(root, "sub", "skipped"))
+        copyfile(
+            DIR_PATH + "/data/sample-arabic-1.txt",
+            path.join(root, "sample-arabic-1.txt"),
+        )
+        copyfile(
+            DIR_PATH + "/data/sample-turkish.txt",
+            path.join(root, "sub", "deep", "sample-turkish.txt"),
+        )
+        copyfile(
+            DIR_PATH + "/data/sample-french.txt",
+            path.join(root, "sub", "sample-french.srt"),
+        )
+        copyfile(
+            DIR_PATH + "/data/sample-chinese.txt",
+            path.join(root, "sub", "skipped", "sample-chinese.txt"),
+        )
+
+    def test_recursive_jsonl_with_jobs(self):
+        with TemporaryDirectory() as root:
+            self._make_tree(root)
+            output = StringIO()
+
+            with redirect_stdout(output):
+                self.assertEqual(
+                    0,
+                    cli_detect(
+                        [
+                            root,
+                            "-R",
+                            "-j",
+                            "2",
+                            "--jsonl",
+                            "--include",
+                            "*.txt",
+                            "--exclude",
+                            "skipped",
+                        ]
+                    ),
+                )
+
+            results = [json.loads(line) for line in output.getvalue().splitlines()]
+
+            self.assertEqual(
+                {
+                    path.join(root, "sample-arabic-1.txt"): "cp1256",
+                    path.join(root, "sub", "deep", "sample-turkish.txt"): "cp1254",
+                },
+                {el["path"]: el["encoding"] for el in results},
+            )
+
+    def test_recursive_minimal_keep_walk_order(self):
+        with TemporaryDirectory() as root:
+            self._make_tree(root)
+            output = StringIO()
+
+            with redirect_stdout(output):
+                self.assertEqual(0, cli_detect([root, "-R", "-m", "-j", "2"]))
+
+            self.assertEqual(
+                ["cp1256", "utf_8", "cp1254", "big5"],
+                output.getvalue().splitlines(),
+            )
+
+    def test_directory_without_recursive(self):
+        with TemporaryDirectory() as root, self.assertRaises(SystemExit) as cm:
+            cli_detect([root])
+
+        self.assertEqual(cm.exception.code, 2)
+
+    def test_parallel_normalize_replace(self):
+        with TemporaryDirectory() as root:
+            self._make_tree(root)
+
+            self.assertEqual(
+                1, cli_detect([root, "-R", "-j", "2", "--normalize", "--replace"])
+            )
+
+            with redirect_stdout(StringIO()):
+                self.assertEqual(
+                    0,
+                    cli_detect(
+                        [
+                            root,
+                            "-R",
+                            "-j",
+                            "2",
+                            "--normalize",
+                            "--replace",
+                            "--force",
+                            "--exclude",
+                            "sub",
+                        ]
+                    ),
+                )
+
+            self.assertEqual(["sample-arabic-1.txt", "sub"], sorted(listdir(root)))
+
+            with open(DIR_PATH + "/data/sample-arabic-1.txt", "rb") as fp:
+                expected = fp.read().decode("cp1256")
+            with open(path.join(root, "sample-arabic-1.txt"), "rb") as fp:
+                self.assertEqual(expected, fp.read().decode("utf_8"))
+
+    def test_invalid_jobs(self):
+        self.assertEqual(
+            1, cli_detect([DIR_PATH + "/data/sample-arabic-1.txt", "-j", "0"])
+        )
+
+    def test_cache_path_and_no_cache(self):
+        with TemporaryDirectory() as root:
+            self._make_tree(root)
+            cache_path = path.join(root, "cache", "detections.sqlite3")
+            outputs = []
+
+            for _ in range(2):
+                output = StringIO()
+                with redirect_stdout(output):
+                    self.assertEqual(
+                        0,
+                        cli_detect(
+                            [
+                                path.join(root, "sub"),
+                                "-R",
+                                "-a",
+                                "--cache-path",
+                                cache_path,
+                            ]
+                        ),
+                    )
+                outputs.append(output.getvalue())
+
+            self.assertTrue(exists(cache_path))
+            self.assertEqual(outputs[0], outputs[1])
+
+            remove(cache_path)
+
+            with redirect_stdout(StringIO()):
+                self.assertEqual(
+                    0,
+                    cli_detect(
+                        [root, "-R", "-m", "--no-cache", "--cache-path", cache_path]
+                    ),
+                )
+
+            self.assertFalse(exists(cache_path))
+
+    def test_cache_opt_in(self):
+        with TemporaryDirectory() as root:
+            cache_path = path.join(root, "charset_normalizer", "detections.sqlite3")
+            sample = DIR_PATH + "/data/sample-arabic-1.txt"
+
+            with patch.dict(
+                "os.environ", {"XDG_CACHE_HOME": root, "LOCALAPPDATA": root}
+            ), redirect_stdout(StringIO()):
+                self.assertEqual(0, cli_detect([sample, "-m"]))
+                self.assertFalse(exists(cache_path))
+
+                self.assertEqual(0, cli_detect([sample, "-m", "--cache", "--no-cache"]))
+                self.assertFalse(exists(cache_path))
+
+                self.assertEqual(0, cli_detect([sample, "-m", "--cache"]))
+                self.assertTrue(exists(cache_path))
+
+    def test_sqlite3_only_imported_with_cache(self):
+        # sqlite3 may be missing from a Python build, the CLI must work without it.
+        probe = (
+            "import sys; from charset_normalizer.cli import cli_detect; "
+            f"cli_detect([{DIR_PATH + '/data/sample-arabic-1.txt'!r}, '-m']); "
+            "print('sqlite3' in sys.modules)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", probe], capture_output=True, check=True, text=True
+        ).stdout
+
+        self.assertEqual(["cp1256", "False"], output.split())
+
 
 if __name__ == "__main__":
     unittest.main()
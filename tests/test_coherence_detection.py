@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+from collections import Counter
+from os import pardir, path
+
 import pytest
 
 from charset_normalizer.cd import (
+    byte_profile_score,
+    coherence_ratio,
     encoding_languages,
     filter_alt_coherence_matches,
     get_target_features,
+    histogram_coherence_ratio,
     is_multi_byte_encoding,
     mb_encoding_languages,
+    single_byte_language_profile,
 )
+from charset_normalizer.constant import RE_LATIN_NEIGHBOUR
+from charset_normalizer.utils import single_byte_decoding_table
+
+DIR_PATH = path.join(path.dirname(path.realpath(__file__)), pardir)
 
 
 @pytest.mark.parametrize(
@@ -106,3 +117,69 @@ def test_filter_alt_coherence_matches(matches, expected_return):
     results = filter_alt_coherence_matches(matches)
 
     assert results == expected_return
+
+
+@pytest.mark.parametrize(
+    "sample, source_encoding, iana_encoding, lg_inclusion",
+    [
+        ("sample-french.txt", "utf_8", "cp1252", None),
+        ("sample-french.txt", "utf_8", "cp1252", "Latin Based"),
+        ("sample-russian-2.txt", "utf_8", "cp1251", "Russian,Bulgarian"),
+        ("sample-russian-2.txt", "utf_8", "cp1252", None),
+        ("sample-russian-2.txt", "utf_8", "mac_cyrillic", None),
+        ("sample-turkish.txt", "cp1254", "cp1254", None),
+        ("sample-arabic.txt", "utf_8", "cp1256", None),
+        ("sample-hebrew-2.txt", "cp1255", "cp1255", "Hebrew"),
+    ],
+)
+def test_histogram_coherence_ratio_parity(
+    sample: str, source_encoding: str, iana_encoding: str, lg_inclusion: str | None
+):
+    with open(path.join(DIR_PATH, "data", sample), encoding=source_encoding) as fp:
+        payload = fp.read().encode(iana_encoding, errors="ignore")
+
+    for i in range(0, len(payload), 512):
+        chunk = payload[i : i + 512]
+
+        assert histogram_coherence_ratio(
+            list(Counter(chunk).items()),
+            single_byte_decoding_table(iana_encoding),
+            0.1,
+            lg_inclusion,
+        ) == coherence_ratio(chunk.decode(iana_encoding), 0.1, lg_inclusion)
+
+
+def test_histogram_coherence_ratio_final_sigma():
+    chunk = "ΚΑΛΗΜΕΡΑ ΚΟΣΜΟΣ".encode("cp1253")
+
+    assert (
+        histogram_coherence_ratio(
+            list(Counter(chunk).items()), single_byte_decoding_table("cp1253")
+        )
+        is None
+    )
+
+
+@pytest.mark.parametrize(
+    "content, expected_encoding, unexpected_encoding",
+    [
+        ("Всё хорошо, спасибо большое за помощь!", "cp1251", "cp1252"),
+        ("Ça va très bien, merci beaucoup à vous.", "cp1252", "cp1251"),
+        ("Ça va très bien, merci beaucoup à vous.", "cp1252", "cp037"),
+        ("Καλημέρα σας, τι κάνετε σήμερα;", "cp1253", "koi8_r"),
+    ],
+)
+def test_byte_profile_score(
+    content: str, expected_encoding: str, unexpected_encoding: str
+):
+    payload = content.encode(expected_encoding)
+    histogram = list(Counter(payload).items())
+    latin_neighbours = list(
+        Counter(b"".join(RE_LATIN_NEIGHBOUR.findall(payload))).items()
+    )
+
+    assert byte_profile_score(
+        histogram, latin_neighbours, single_byte_language_profile(expected_encoding)
+    ) > byte_profile_score(
+        histogram, latin_neighbours, single_byte_language_profile(unexpected_encoding)
+    )
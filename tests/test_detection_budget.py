@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from os import pardir, path
+from threading import Event
+
+import pytest
+
+import charset_normalizer.api
+from charset_normalizer import from_bytes, from_path, is_binary
+
+DIR_PATH = path.join(path.dirname(path.realpath(__file__)), pardir)
+
+SAMPLE = path.join(DIR_PATH, "data", "sample-russian-2.txt")
+
+
+def test_generous_timeout_is_not_truncated():
+    results = from_path(SAMPLE, timeout=60.0)
+    expected = from_path(SAMPLE)
+
+    assert results.truncated is False
+    assert results.best().encoding == expected.best().encoding
+    assert expected.truncated is False
+
+
+def test_expired_timeout_is_truncated():
+    results = from_path(SAMPLE, timeout=0.0)
+
+    assert results.truncated is True
+    assert len(results) == 0
+
+
+def test_cancel_token_checked_between_chunks(monkeypatch: pytest.MonkeyPatch):
+    cancel_token = Event()
+    calls: list[str] = []
+
+    def mess_ratio_then_cancel(chunk: str, *args) -> float:
+        calls.append(chunk)
+        cancel_token.set()
+        return 0.0
+
+    monkeypatch.setattr(
+        charset_normalizer.api, "shared_mess_ratio", mess_ratio_then_cancel
+    )
+
+    with open(SAMPLE, "rb") as fp:
+        payload = fp.read()
+
+    results = from_bytes(payload, cancel_token=cancel_token)
+
+    assert len(calls) == 1
+    assert results.truncated is True
+
+
+def test_is_binary_accept_timeout_and_cancel_token():
+    cancel_token = Event()
+
+    assert is_binary(SAMPLE, timeout=60.0, cancel_token=cancel_token) is False
+
+    cancel_token.set()
+
+    # Nothing was tested, no evidence of text at all.
+    assert is_binary(SAMPLE, cancel_token=cancel_token) is True
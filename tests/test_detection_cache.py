@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BufferedReader, FileIO
+from mmap import mmap
+from os import pardir, path, utime
+
+import pytest
+
+import charset_normalizer.cache
+from charset_normalizer import (
+    DetectionCache,
+    PersistentDetectionCache,
+    from_bytes,
+    from_fp,
+    from_path,
+    from_paths,
+)
+from charset_normalizer.constant import TOO_BIG_SEQUENCE
+
+DIR_PATH = path.join(path.dirname(path.realpath(__file__)), pardir)
+
+
+def read_sample(name: str) -> bytes:
+    with open(path.join(DIR_PATH, "data", name), "rb") as fp:
+        return fp.read()
+
+
+@pytest.mark.parametrize(
+    "sample",
+    [
+        "sample-french.txt",
+        "sample-russian-2.txt",
+        "sample-chinese.txt",
+        "sample-english.bom.txt",
+    ],
+)
+def test_cache_hit_same_verdict(sample: str):
+    payload = read_sample(sample)
+    cache = DetectionCache()
+
+    expected = from_bytes(payload, cache=cache)
+    cached = from_bytes(payload, cache=cache)
+
+    assert cache.misses == 1
+    assert cache.hits == 1
+
+    assert len(cached) == len(expected)
+
+    for a, b in zip(expected, cached):
+        assert a.encoding == b.encoding
+        assert a.chaos == b.chaos
+        assert a.languages == b.languages
+        assert a.bom == b.bom
+        assert a.could_be_from_charset == b.could_be_from_charset
+        assert str(a) == str(b)
+        assert b.raw is payload
+
+
+def test_cache_parameters_are_part_of_the_key():
+    payload = "Bсеки човек има право на образование.".encode("cp1251")
+    cache = DetectionCache()
+
+    from_bytes(payload, cache=cache)
+    from_bytes(payload, cache=cache, cp_isolation=["cp1251"])
+    from_bytes(payload, cache=cache, threshold=0.1)
+
+    assert cache.misses == 3
+    assert cache.hits == 0
+    assert len(cache) == 3
+
+
+def test_cache_does_not_retain_payload():
+    payload = read_sample("sample-french.txt")
+    cache = DetectionCache()
+
+    from_bytes(payload, cache=cache)
+
+    def walk(o):
+        if isinstance(o, (bytes, bytearray, str)) and len(o) > 64:
+            raise AssertionError("payload or decoded str retained in cache")
+        if isinstance(o, (tuple, list)):
+            for item in o:
+                walk(item)
+
+    for entry in cache._entries.values():
+        walk(entry)
+
+
+def test_cache_ttl(monkeypatch: pytest.MonkeyPatch):
+    now = [1000.0]
+    monkeypatch.setattr(charset_normalizer.cache, "monotonic", lambda: now[0])
+
+    cache = DetectionCache(ttl=10)
+
+    from_bytes(b"Hello World", cache=cache)
+    from_bytes(b"Hello World", cache=cache)
+
+    assert cache.hits == 1
+
+    now[0] += 11
+
+    from_bytes(b"Hello World", cache=cache)
+
+    assert cache.misses == 2
+
+
+def test_cache_size_eviction_and_clear():
+    cache = DetectionCache(max_size=2048)
+
+    for i in range(32):
+        from_bytes(f"Hello World {i}".encode(), cache=cache)
+
+    stats = cache.stats()
+
+    assert stats["size"] <= 2048
+    assert stats["evictions"] > 0
+    assert stats["entries"] < 32
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.stats()["size"] == 0
+    assert cache.hits == cache.misses == 0
+
+
+@pytest.mark.parametrize("max_size, ttl", [(0, None), (1024, 0)])
+def test_cache_invalid_parameters(max_size: int, ttl: float | None):
+    with pytest.raises(ValueError):
+        DetectionCache(max_size=max_size, ttl=ttl)
+
+
+def test_cache_thread_safety():
+    payloads = [read_sample("sample-french.txt"), read_sample("sample-russian-2.txt")]
+    cache = DetectionCache()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        verdicts = list(
+            executor.map(
+                lambda i: from_bytes(payloads[i % 2], cache=cache).best().encoding,
+                range(64),
+            )
+        )
+
+    assert set(verdicts[::2]) == {from_bytes(payloads[0]).best().encoding}
+    assert set(verdicts[1::2]) == {from_bytes(payloads[1]).best().encoding}
+    assert cache.hits + cache.misses == 64
+    assert len(cache) == 2
+
+
+def test_persistent_cache_across_instances(tmp_path):
+    payload = read_sample("sample-russian-2.txt")
+    cache_path = tmp_path / "cache.sqlite3"
+
+    expected = from_bytes(payload, cache=PersistentDetectionCache(cache_path))
+
+    cache = PersistentDetectionCache(cache_path)
+    cached = from_bytes(payload, cache=cache)
+
+    assert cache.hits == 1 and cache.misses == 0
+    assert len(cache) == 1
+
+    assert [m.encoding for m in cached] == [m.encoding for m in expected]
+    assert [m.chaos for m in cached] == [m.chaos for m in expected]
+    assert [m.languages for m in cached] == [m.languages for m in expected]
+    assert [m.could_be_from_charset for m in cached] == [
+        m.could_be_from_charset for m in expected
+    ]
+    assert str(cached.best()) == str(expected.best())
+
+    # The verdict went through JSON, the coherence results must be (language, ratio) tuples again.
+    assert [m._languages for m in cached] == [m._languages for m in expected]
+    assert all(
+        type(entry) is tuple
+        for m in (*cached, *cached.best().submatch)
+        for entry in m._languages
+    )
+
+
+def test_persistent_cache_file_identity(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    sample = tmp_path / "sample.txt"
+    sample.write_bytes(read_sample("sample-arabic-1.txt"))
+    an_hour_ago = time.time() - 3600
+    utime(sample, (an_hour_ago, an_hour_ago))
+
+    cache = PersistentDetectionCache(tmp_path / "cache.sqlite3")
+    expected = from_path(sample, cache=cache)
+
+    assert cache.stats()["files"] == 1
+
+    def no_hashing(*args):
+        raise AssertionError("an unchanged file should not be hashed")
+
+    with monkeypatch.context() as m:
+        m.setattr(PersistentDetectionCache, "key", staticmethod(no_hashing))
+        cached = from_path(sample, cache=cache)
+
+    assert cache.hits == 1
+    assert cached.best().encoding == expected.best().encoding == "cp1256"
+
+    # The same content with another mtime is found by its digest.
+    utime(sample, (an_hour_ago - 60, an_hour_ago - 60))
+    from_path(sample, cache=cache)
+
+    assert cache.hits == 2 and cache.misses == 1
+
+    # Not recorded for the other parameters.
+    from_path(sample, cache=cache, threshold=0.1)
+
+    assert cache.misses == 2
+    assert len(cache) == 2
+
+
+@pytest.mark.parametrize("materialize", [True, False])
+def test_persistent_cache_file_identity_no_map_left(tmp_path, materialize: bool):
+    sample = tmp_path / "sample.txt"
+    sample.write_bytes(read_sample("sample-arabic-1.txt"))
+    an_hour_ago = time.time() - 3600
+    utime(sample, (an_hour_ago, an_hour_ago))
+
+    cache = PersistentDetectionCache(tmp_path / "cache.sqlite3")
+    expected = from_path(sample, cache=cache)
+
+    # Nothing keeps the file mapped (and locked on Windows) once the call returned.
+    with open(sample, "rb") as fp:
+        cached = from_fp(fp, cache=cache, materialize=materialize)
+
+    assert cache.hits == 1
+    assert not isinstance(cached.best().raw, mmap)
+    assert str(cached.best()) == str(expected.best())
+
+
+def test_persistent_cache_file_identity_partial_read(tmp_path):
+    sample = tmp_path / "sample.txt"
+    sample.write_bytes(read_sample("sample-arabic-1.txt") * (TOO_BIG_SEQUENCE // 900))
+    an_hour_ago = time.time() - 3600
+    utime(sample, (an_hour_ago, an_hour_ago))
+
+    cache = PersistentDetectionCache(tmp_path / "cache.sqlite3")
+    expected = from_path(sample, cache=cache, partial_read=True)
+
+    class UnreadableFile(BufferedReader):
+        def read(self, *args):
+            raise AssertionError("a mapped file should not be read")
+
+    with UnreadableFile(FileIO(sample)) as fp:
+        cached = from_fp(fp, cache=cache, partial_read=True)
+
+        assert cache.hits == 1
+        assert isinstance(cached.best().raw, mmap)
+        assert str(cached.best()) == str(expected.best())
+
+
+def test_persistent_cache_recent_file_not_recorded(tmp_path):
+    sample = tmp_path / "sample.txt"
+    sample.write_bytes(b"Hello World")
+
+    cache = PersistentDetectionCache(tmp_path / "cache.sqlite3")
+    from_path(sample, cache=cache)
+
+    assert cache.stats()["files"] == 0
+    assert len(cache) == 1
+
+
+def test_persistent_cache_lru_eviction(tmp_path):
+    cache = PersistentDetectionCache(tmp_path / "cache.sqlite3", max_entries=4)
+
+    for i in range(4):
+        from_bytes(f"Hello World {i}".encode(), cache=cache)
+
+    # Refresh the oldest one, then overflow.
+    from_bytes(b"Hello World 0", cache=cache)
+
+    for i in range(4, 7):
+        from_bytes(f"Hello World {i}".encode(), cache=cache)
+
+    assert len(cache) == 4
+    assert cache.evictions == 3
+    assert (
+        cache._connection().execute("SELECT COUNT(*) FROM verdicts").fetchone()[0] == 4
+    )
+
+    from_bytes(b"Hello World 0", cache=cache)
+
+    assert cache.hits == 2
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.hits == cache.misses == cache.evictions == 0
+
+
+def test_persistent_cache_shared_by_workers(tmp_path):
+    cache = PersistentDetectionCache(tmp_path / "cache.sqlite3")
+    copy = pickle.loads(pickle.dumps(cache))
+
+    assert copy.path == cache.path and copy.max_entries == cache.max_entries
+
+    paths = [
+        path.join(DIR_PATH, "data", name)
+        for name in (
+            "sample-french.txt",
+            "sample-russian-2.txt",
+            "sample-chinese.txt",
+            "sample-turkish.txt",
+        )
+    ]
+
+    expected = [r.encoding for _, r in from_paths(paths, max_workers=1)]
+
+    for _ in range(2):
+        assert [
+            r.encoding
+            for _, r in from_paths(paths, max_workers=2, batch_size=1, cache=cache)
+        ] == expected
+
+    assert len(cache) == len(paths)
+
+
+def test_persistent_cache_invalid_parameters(tmp_path):
+    with pytest.raises(ValueError):
+        PersistentDetectionCache(tmp_path / "cache.sqlite3", max_entries=0)
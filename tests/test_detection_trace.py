@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from os import pardir, path
+
+import pytest
+
+from charset_normalizer import (
+    DetectionCache,
+    PersistentDetectionCache,
+    from_bytes,
+    from_path,
+)
+
+DIR_PATH = path.join(path.dirname(path.realpath(__file__)), pardir)
+
+SAMPLE = path.join(DIR_PATH, "data", "sample-arabic-1.txt")
+
+
+def test_trace_disabled_by_default():
+    assert from_path(SAMPLE).trace is None
+
+
+def test_trace_does_not_alter_verdict():
+    results = from_path(SAMPLE, trace=True)
+    expected = from_path(SAMPLE)
+
+    assert [match.encoding for match in results] == [
+        match.encoding for match in expected
+    ]
+    assert [match.chaos for match in results] == [match.chaos for match in expected]
+
+
+def test_trace_records_every_candidate():
+    results = from_path(SAMPLE, trace=True)
+    trace = results.trace
+
+    assert trace is not None
+    assert trace.cached is False
+    assert trace.elapsed > 0.0
+
+    encodings = [candidate.encoding for candidate in trace]
+
+    assert len(encodings) == len(set(encodings)) == len(trace)
+
+    for match in results:
+        assert trace[match.encoding].outcome in ("passed", "fast_tracked")
+
+    best_guess = trace["windows-1256"]
+
+    assert best_guess.encoding == "cp1256"
+    assert best_guess.outcome == "passed"
+    assert best_guess.reason is None
+    assert best_guess.mess_ratios
+    assert best_guess.coherence[0][0] == "Arabic"
+    assert best_guess.md_time > 0.0
+
+    assert trace["utf_8"].outcome == "hard_failure"
+    assert trace["utf_8"].reason == "decode_error"
+    assert trace["utf_8"].detail
+
+    assert trace["utf_16"].outcome == "skipped"
+    assert trace["utf_16"].reason == "requires_bom"
+
+    assert {candidate.outcome for candidate in trace} <= {
+        "skipped",
+        "hard_failure",
+        "soft_failure",
+        "fast_tracked",
+        "passed",
+    }
+
+    with pytest.raises(KeyError):
+        trace["not-an-encoding"]
+
+
+def test_trace_to_dict():
+    trace = from_bytes(
+        "Bсеки човек има право на образование.".encode("cp1251"), trace=True
+    ).trace
+
+    assert trace is not None
+
+    document = trace.to_dict()
+
+    assert document["cached"] is False
+    assert len(document["candidates"]) == len(trace)
+    assert document["candidates"][0]["encoding"] == "ascii"
+    assert document["candidates"][0]["outcome"] == "hard_failure"
+
+
+def test_trace_interrupted():
+    trace = from_path(SAMPLE, timeout=0.0, trace=True).trace
+
+    assert trace is not None
+    assert len(trace) == 0
+
+
+def test_trace_cached_verdict(tmp_path):
+    cache = DetectionCache()
+    payload = from_path(SAMPLE).best().raw
+
+    first = from_bytes(payload, cache=cache, trace=True).trace
+    second = from_bytes(payload, cache=cache, trace=True).trace
+
+    assert first is not None and first.cached is False and len(first) > 0
+    assert second is not None and second.cached is True and len(second) == 0
+
+    persistent_cache = PersistentDetectionCache(str(tmp_path / "cache.sqlite3"))
+
+    first = from_path(SAMPLE, cache=persistent_cache, trace=True).trace
+    second = from_path(SAMPLE, cache=persistent_cache, trace=True).trace
+
+    assert first is not None and first.cached is False and len(first) > 0
+    assert second is not None and second.cached is True and len(second) == 0
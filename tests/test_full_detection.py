@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from os import pardir, path
+from os import listdir, pardir, path
 
 import pytest
 
@@ -48,3 +48,23 @@ def test_elementary_detection(
     assert (
         best_guess.language == expected_language
     ), f"Elementary language detection has failed upon '{input_data_file}'"
+
+
+@pytest.mark.parametrize("max_candidates", [1, 5])
+@pytest.mark.parametrize(
+    "input_data_file",
+    sorted(
+        name
+        for name in listdir(path.join(DIR_PATH, "data"))
+        if name.startswith("sample-")
+    ),
+)
+def test_ranked_candidates_parity(input_data_file: str, max_candidates: int):
+    expected_guess = from_path(DIR_PATH + f"/data/{input_data_file}").best()
+    best_guess = from_path(
+        DIR_PATH + f"/data/{input_data_file}", max_candidates=max_candidates
+    ).best()
+
+    assert best_guess is not None
+    assert best_guess.encoding == expected_guess.encoding
+    assert best_guess.language == expected_guess.language
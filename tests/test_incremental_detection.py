@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from glob import glob
+from os import pardir, path
+from os.path import basename
+
+import pytest
+
+from charset_normalizer import IncrementalDetector, UniversalDetector, detect, from_path
+from charset_normalizer.constant import TRACE
+
+DIR_PATH = path.join(path.dirname(path.realpath(__file__)), pardir)
+
+
+def feed_by_chunk(detector, payload: bytes, chunk_size: int = 64) -> None:
+    for i in range(0, len(payload), chunk_size):
+        if detector.done:
+            break
+        detector.feed(payload[i : i + chunk_size])
+
+
+@pytest.mark.parametrize(
+    "sample",
+    sorted(glob(path.join(DIR_PATH, "data", "sample-*"))),
+    ids=basename,
+)
+def test_incremental_parity_with_from_path(sample: str):
+    with open(sample, "rb") as fp:
+        payload = fp.read()
+
+    detector = IncrementalDetector()
+    feed_by_chunk(detector, payload)
+
+    best_guess = detector.close().best()
+    expected = from_path(sample).best()
+
+    assert best_guess is not None
+    assert expected is not None
+    assert best_guess.encoding == expected.encoding
+
+
+def test_incremental_prune_on_undecodable_chunk():
+    detector = IncrementalDetector()
+
+    detector.feed("héllo wörld ".encode())
+    assert "utf_8" in detector.candidates
+
+    detector.feed(b"\xff\xfe\xfa")
+
+    assert "utf_8" not in detector.candidates
+    assert "ascii" not in detector.candidates
+
+
+def test_incremental_done_early_on_ascii():
+    detector = IncrementalDetector()
+
+    while not detector.done:
+        detector.feed(b"This is a plain ASCII line of text.\n")
+
+    # feeding after done is a no-op
+    detector.feed(b"\xff" * 16)
+
+    best_guess = detector.close().best()
+
+    assert best_guess is not None
+    assert best_guess.encoding in {"ascii", "utf_8"}
+
+
+def test_incremental_retain_bounded_sample():
+    line = (
+        "Всеки човек има право на образование. Образованието трябва да бъде безплатно.\n"
+    ).encode("cp1251")
+    payload = line * (4 * 1024 * 1024 // len(line))
+
+    detector = IncrementalDetector()
+    feed_by_chunk(detector, payload, 65536)
+
+    retained = len(detector._head) + sum(len(window) for _, window in detector._windows)
+
+    assert detector.done is False
+    assert retained <= 8192 + 2 * 5 * 512
+    assert detector.close().best().encoding == "cp1251"
+
+
+def test_incremental_done_early_on_large_utf_8():
+    payload = (
+        "Ceci est une ligne écrite en français, avec des accents.\n".encode() * 50000
+    )
+
+    detector = IncrementalDetector()
+    fed = 0
+
+    while not detector.done:
+        detector.feed(payload[fed : fed + 1000])
+        fed += 1000
+
+    assert fed < 16384
+    assert detector.close().best().encoding == "utf_8"
+
+
+def test_incremental_not_done_on_short_input():
+    detector = IncrementalDetector()
+    detector.feed(b"Hello")
+
+    assert detector.done is False
+    assert detector.results is None
+
+    results = detector.close()
+
+    assert detector.done is True
+    assert detector.results is results
+    assert results.best().encoding == "ascii"
+
+
+def test_incremental_reset():
+    detector = IncrementalDetector()
+    detector.feed(b"\xff\xfe\xfa")
+    detector.close()
+
+    detector.reset()
+
+    assert detector.done is False
+    assert "utf_8" in detector.candidates
+
+
+def test_incremental_cp_isolation_nothing_left():
+    detector = IncrementalDetector(cp_isolation=["ascii"])
+    detector.feed(b"\xe9t\xe9")
+
+    assert detector.candidates == []
+    assert len(detector.close()) == 0
+
+
+def test_incremental_candidates_not_seen_as_cp_isolation(caplog):
+    detector = IncrementalDetector(cp_isolation=["cp1251", "cp1252", "utf_8"])
+    detector.feed("Всеки човек има право на образование.".encode("cp1251"))
+
+    with caplog.at_level(TRACE, logger="charset_normalizer"):
+        results = detector.close()
+
+    assert "cp_isolation is set" in caplog.text
+    assert "limited list of encoding allowed : cp1251, cp1252, utf_8." in caplog.text
+    assert results.best().encoding == "cp1251"
+
+    caplog.clear()
+
+    detector = IncrementalDetector()
+    detector.feed("Всеки човек има право на образование.".encode("cp1251"))
+
+    with caplog.at_level(TRACE, logger="charset_normalizer"):
+        results = detector.close()
+
+    assert "cp_isolation is set" not in caplog.text
+    assert results.best().encoding == "cp1251"
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        "Bсеки човек има право на образование.".encode("cp1251"),
+        "我没有埋怨，磋砣的只是一些时间。".encode("gb18030"),
+        ("﻿" + "Hello World").encode("utf_8"),
+        b"Hello World",
+        b"",
+    ],
+)
+def test_universal_detector_parity_with_detect(payload: bytes):
+    detector = UniversalDetector()
+
+    assert detector.result == {"encoding": None, "confidence": 0.0, "language": None}
+
+    feed_by_chunk(detector, payload, 8)
+    r = detector.close()
+
+    assert r == detect(payload)
+    assert detector.result == r
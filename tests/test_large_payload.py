@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import tracemalloc
+from mmap import ACCESS_READ, mmap
+
 import pytest
 
 from charset_normalizer import from_bytes
@@ -53,3 +56,149 @@ def test_misleading_large_sequence():
     assert match._string is not None, "str should be cached as only match"
     assert match.encoding == "utf_8"
     assert str(match) is not None
+
+
+@pytest.mark.parametrize("free_threaded", [False, True])
+def test_large_payload_workers_parity(monkeypatch, free_threaded):
+    import charset_normalizer.api
+
+    monkeypatch.setattr(charset_normalizer.api, "_free_threaded", lambda: free_threaded)
+
+    content = (
+        "Bonjour, ça va très bien. Où êtes-vous allés l'été dernier ? " * 200_000
+    ).encode("cp1252")
+
+    assert len(content) >= TOO_BIG_SEQUENCE
+
+    expected = from_bytes(content)
+    results = from_bytes(content, workers=2)
+
+    assert [(m.encoding, m.chaos, m.coherence) for m in results] == [
+        (m.encoding, m.chaos, m.coherence) for m in expected
+    ]
+
+
+def test_workers_pool_reused(monkeypatch):
+    import charset_normalizer.api
+
+    segments: list[str] = []
+    original_close = charset_normalizer.api._SpeculativeValidation.close
+
+    def close(self):
+        if self._segment is not None:
+            segments.append(self._segment.name)
+        original_close(self)
+
+    monkeypatch.setattr(charset_normalizer.api._SpeculativeValidation, "close", close)
+
+    content = ("Où êtes-vous allés l'été dernier ? " * 300_000).encode("cp1252")
+
+    from_bytes(content, workers=2)
+    pool = charset_normalizer.api._speculation_pool(2)
+    from_bytes(content, workers=2)
+
+    assert charset_normalizer.api._speculation_pool(2) is pool
+    assert len(segments) == 2
+
+    from multiprocessing.shared_memory import SharedMemory
+
+    for name in segments:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
+
+    charset_normalizer.api._shutdown_speculation_pools()
+
+    assert charset_normalizer.api._speculation_pool(2) is not pool
+
+
+def test_workers_below_threshold(caplog):
+    content = "Bonjour, ça va très bien.".encode("cp1252")
+
+    with caplog.at_level(5, logger="charset_normalizer"):
+        best_guess = from_bytes(content, workers=4).best()
+
+    assert best_guess is not None
+    assert "candidate(s) ahead" not in caplog.text
+
+
+def test_invalid_workers():
+    with pytest.raises(ValueError):
+        from_bytes(b"hello world", workers=0)
+
+
+def test_large_payload_bounded_memory():
+    content = (
+        "Bonjour, ceci est un texte accentué à réfléchir sans tarder. " * 4
+    ).encode("cp1252") * 820_000
+
+    assert len(content) >= 20 * TOO_BIG_SEQUENCE
+
+    tracemalloc.start()
+
+    try:
+        best_guess = from_bytes(content).best()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert best_guess is not None
+    assert best_guess.encoding == "cp1252"
+    assert (
+        peak < len(content) // 20
+    ), "validation should not copy nor decode the whole payload"
+
+
+def test_large_payload_memory_mapped_buffer(tmp_path):
+    content = ("Où êtes-vous allés l'été dernier ? " * 400_000).encode("cp1252")
+
+    assert len(content) >= TOO_BIG_SEQUENCE
+
+    expected = [(m.encoding, m.chaos, m.coherence) for m in from_bytes(content)]
+
+    path = tmp_path / "large.txt"
+    path.write_bytes(content)
+
+    with open(path, "rb") as fp:
+        mapped = mmap(fp.fileno(), 0, access=ACCESS_READ)
+
+        tracemalloc.start()
+
+        try:
+            results = from_bytes(memoryview(mapped))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert [(m.encoding, m.chaos, m.coherence) for m in results] == expected
+        assert peak < len(content) // 4, "the mapped payload should not be copied"
+
+        del results
+        mapped.close()
+
+
+def test_large_payload_streamed_output():
+    content = ("Où êtes-vous allés l'été dernier ? " * 400_000).encode("cp1252")
+
+    best_guess = from_bytes(content, materialize=False).best()
+
+    assert best_guess is not None
+
+    class CountingSink:
+        written = 0
+
+        def write(self, data: bytes) -> int:
+            self.written += len(data)
+            return len(data)
+
+    sink = CountingSink()
+
+    tracemalloc.start()
+
+    try:
+        written = best_guess.output_to(sink, chunk_size=65536)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert written == sink.written == len(content.decode("cp1252").encode("utf_8"))
+    assert peak < len(content) // 20, "the output should be streamed"
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+from collections import Counter
+
 import pytest
 
-from charset_normalizer.md import mess_ratio
+from charset_normalizer.md import (
+    histogram_mess_ratio,
+    mess_ratio,
+    single_byte_property_table,
+)
 
 
 @pytest.mark.parametrize(
@@ -46,3 +52,43 @@ def test_mess_detection(content, min_expected_ratio, max_expected_ratio):
     assert (
         min_expected_ratio <= calculated_mess_ratio <= max_expected_ratio
     ), "The mess detection ratio calculated for given content is not well adjusted!"
+
+
+@pytest.mark.parametrize(
+    "content, source_encoding, target_encoding",
+    [
+        ("Привет, как дела? Всё хорошо, спасибо большое!", "cp1251", "cp1252"),
+        ("Привет, как дела? Всё хорошо, спасибо большое!", "cp1251", "cp1251"),
+        ("Ça va très bien, merci. Où êtes-vous allés?", "cp1252", "cp437"),
+        ("Ça va très bien, merci. Où êtes-vous allés?", "cp1252", "mac_roman"),
+        ("Καλημέρα σας, τι κάνετε σήμερα;", "cp1253", "cp1256"),
+        ("Hello world! Plain ascii text.\x01\x02", "ascii", "cp1252"),
+    ],
+)
+def test_histogram_mess_ratio_is_lower_bound(
+    content: str, source_encoding: str, target_encoding: str
+):
+    payload = content.encode(source_encoding)
+
+    lower_bound = histogram_mess_ratio(
+        list(Counter(payload).items()),
+        len(payload),
+        single_byte_property_table(target_encoding),
+    )
+
+    assert round(lower_bound, 3) <= mess_ratio(
+        payload.decode(target_encoding), maximum_threshold=100.0
+    )
+
+
+def test_histogram_mess_ratio_catches_unprintable():
+    payload = b"\x01\x02\x03\x04 Hello World \x05\x06\x07\x08"
+
+    assert (
+        histogram_mess_ratio(
+            list(Counter(payload).items()),
+            len(payload),
+            single_byte_property_table("cp1252"),
+        )
+        >= 0.2
+    )
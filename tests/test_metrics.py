@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from os import pardir, path
+
+from charset_normalizer import (
+    DetectionCache,
+    add_phase_hook,
+    from_bytes,
+    from_path,
+    remove_phase_hook,
+    stats,
+)
+from charset_normalizer.cache import BoundedCache
+from charset_normalizer.md import mess_ratio
+from charset_normalizer.metrics import COUNTERS
+
+DIR_PATH = path.join(path.dirname(path.realpath(__file__)), pardir)
+
+SAMPLE = path.join(DIR_PATH, "data", "sample-arabic-1.txt")
+
+
+def test_stats_counters_and_reset():
+    stats(reset=True)
+
+    results = from_path(SAMPLE, trace=True)
+    snapshot = stats(reset=True)
+
+    assert set(COUNTERS) <= set(snapshot)
+    assert snapshot["detections"] == 1
+    assert snapshot["truncated"] == 0
+    assert snapshot["candidates"] == len(results.trace)
+    assert snapshot["coherence_measured"] == sum(
+        1 for candidate in results.trace if candidate.outcome == "passed"
+    )
+    assert snapshot["char_info"]["entries"] > 0
+    assert "hits" in snapshot["mess_ratio"]
+    assert "hits" in snapshot["coherence_ratio"]
+
+    snapshot = stats()
+
+    assert all(snapshot[name] == 0 for name in COUNTERS)
+    assert snapshot["mess_ratio"]["hits"] == snapshot["mess_ratio"]["misses"] == 0
+    assert snapshot["char_info"]["hits"] == snapshot["char_info"]["misses"] == 0
+
+    from_path(SAMPLE, timeout=0.0)
+
+    assert stats()["truncated"] == 1
+
+
+def test_stats_char_info_hit_rate():
+    stats(reset=True)
+
+    # Seven distinct non-ASCII characters, only the first sight of each may be a miss.
+    mess_ratio("Ελληνικά Ελληνικά Ελληνικά")
+
+    snapshot = stats()["char_info"]
+
+    assert snapshot["hits"] + snapshot["misses"] == 24
+    assert snapshot["misses"] <= 7
+    assert snapshot["hit_rate"] == snapshot["hits"] / 24
+    assert snapshot["entries"] >= 7
+
+
+def test_stats_definitive_match_pruned():
+    stats(reset=True)
+
+    from_path(path.join(DIR_PATH, "data", "sample-greek.txt"))
+
+    snapshot = stats(reset=True)
+
+    assert snapshot["definitive_match_pruned"] > 0
+    assert snapshot["mb_definitive_match_pruned"] == 0
+
+    from_path(path.join(DIR_PATH, "data", "sample-chinese.txt"))
+
+    snapshot = stats()
+
+    assert snapshot["mb_definitive_match_pruned"] > 0
+
+
+def test_stats_not_counting_cached_verdicts():
+    cache = DetectionCache()
+    payload = "Bсеки човек има право на образование.".encode("cp1251")
+
+    from_bytes(payload, cache=cache)
+    stats(reset=True)
+    from_bytes(payload, cache=cache)
+
+    assert stats()["detections"] == 0
+
+
+def test_phase_hook():
+    received: list[tuple[str, str | None, float]] = []
+
+    def hook(phase: str, encoding: str | None, duration: float) -> None:
+        received.append((phase, encoding, duration))
+
+    add_phase_hook(hook)
+    add_phase_hook(hook)
+
+    try:
+        results = from_path(SAMPLE)
+    finally:
+        remove_phase_hook(hook)
+
+    # Timed for the hooks only, not attached.
+    assert results.trace is None
+
+    assert {phase for phase, _, _ in received} == {
+        "decode",
+        "mess",
+        "coherence",
+        "detection",
+    }
+    assert received[-1][:2] == ("detection", "cp1256")
+    assert sum(1 for phase, _, _ in received if phase == "detection") == 1
+    assert all(duration > 0.0 for _, _, duration in received)
+
+    received.clear()
+    from_path(SAMPLE)
+    remove_phase_hook(hook)
+
+    assert received == []
+
+
+def test_bounded_cache_stats_reset():
+    cache = BoundedCache(1024)
+    cache.put("a", 1, 8)
+    cache.get("a")
+    cache.get("b")
+
+    assert cache.stats(reset=True)["hits"] == 1
+
+    snapshot = cache.stats()
+
+    assert snapshot["hits"] == snapshot["misses"] == 0
+    assert snapshot["entries"] == 1
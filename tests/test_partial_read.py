@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from io import BytesIO
+from mmap import mmap
+
+import pytest
+
+from charset_normalizer import from_fp, from_path, is_binary
+from charset_normalizer.constant import TOO_BIG_SEQUENCE
+
+
+@pytest.fixture
+def large_utf8_file(tmp_path):
+    line = "Ceci est une ligne écrite en français, avec des accents. 日本語\n".encode()
+    target = tmp_path / "large-utf8.txt"
+    target.write_bytes(line * (TOO_BIG_SEQUENCE // len(line) + 1))
+    return target
+
+
+def test_partial_read_parity(large_utf8_file):
+    best_guess = from_path(large_utf8_file, partial_read=True).best()
+    expected = from_path(large_utf8_file).best()
+
+    assert best_guess is not None
+    assert best_guess.encoding == expected.encoding == "utf_8"
+    assert isinstance(best_guess.raw, mmap)
+    assert str(best_guess) == str(expected)
+
+
+def test_partial_read_cursor_at_end(large_utf8_file):
+    with open(large_utf8_file, "rb") as fp:
+        from_fp(fp, partial_read=True)
+        assert fp.read() == b""
+
+
+def test_partial_read_small_or_unmappable_input():
+    payload = "Bсеки човек има право на образование.".encode("cp1251")
+
+    best_guess = from_fp(BytesIO(payload), partial_read=True).best()
+
+    assert best_guess is not None
+    assert isinstance(best_guess.raw, bytes)
+    assert best_guess.encoding == from_fp(BytesIO(payload)).best().encoding
+
+
+def test_trust_sample_skip_whole_validation(tmp_path):
+    line = "Ceci est une ligne écrite en français, avec des accents.\n".encode()
+    payload = bytearray(line * (TOO_BIG_SEQUENCE // len(line) + 1))
+
+    # an invalid utf_8 byte, far from the head and away from the probed windows.
+    payload[len(payload) // 5 + 4096] = 0xFF
+
+    target = tmp_path / "large-mostly-utf8.txt"
+    target.write_bytes(payload)
+
+    assert from_path(target).best().encoding != "utf_8"
+    assert (
+        from_path(target, partial_read=True, trust_sample=True).best().encoding
+        == "utf_8"
+    )
+
+
+def test_is_binary_partial_read(large_utf8_file):
+    assert is_binary(large_utf8_file, partial_read=True) is False
@@ -90,3 +90,4 @@ def test_preemptive_mark_replacement(payload, expected_outcome):
     transformed_output = m.output()
 
     assert transformed_output == expected_outcome
+    assert b"".join(m.iter_output(chunk_size=4)) == expected_outcome
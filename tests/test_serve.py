@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from os import pardir, path
+
+import pytest
+
+from charset_normalizer.cli import DetectionServer, cli_detect
+
+DIR_PATH = path.join(path.dirname(path.realpath(__file__)), pardir)
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets are not available"
+)
+
+
+def read_sample(name: str) -> bytes:
+    with open(path.join(DIR_PATH, "data", name), "rb") as fp:
+        return fp.read()
+
+
+async def request(
+    unix_path: str, method: str, target: str, body: bytes | None = None
+) -> tuple[int, bytes]:
+    reader, writer = await asyncio.open_unix_connection(unix_path)
+
+    head = f"{method} {target} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+
+    if body is not None:
+        head += f"Content-Length: {len(body)}\r\n"
+
+    writer.write(head.encode("ascii") + b"\r\n" + (body or b""))
+    await writer.drain()
+
+    response = await reader.read()
+    writer.close()
+
+    status_line, _, rest = response.partition(b"\r\n")
+    _, _, content = rest.partition(b"\r\n\r\n")
+
+    return int(status_line.split(b" ")[1]), content
+
+
+def metrics(content: bytes) -> dict[str, float]:
+    return {
+        name: float(value)
+        for name, _, value in (
+            line.rpartition(" ")
+            for line in content.decode("ascii").splitlines()
+            if not line.startswith("#")
+        )
+    }
+
+
+def test_serve_detect(tmp_path):
+    unix_path = str(tmp_path / "normalizer.sock")
+
+    async def scenario():
+        async with DetectionServer(jobs=1) as server:
+            await server.start(unix_path=unix_path)
+
+            status, content = await request(
+                unix_path, "POST", "/detect", read_sample("sample-arabic-1.txt")
+            )
+
+            assert status == 200
+            assert json.loads(content)["encoding"] == "cp1256"
+
+            status, content = await request(
+                unix_path, "POST", "/detect", bytes(range(256)) * 64
+            )
+
+            assert status == 200
+            assert json.loads(content)["encoding"] is None
+
+            assert await request(unix_path, "GET", "/health") == (200, b"ok\n")
+            assert (await request(unix_path, "GET", "/detect"))[0] == 405
+            assert (await request(unix_path, "POST", "/detect"))[0] == 411
+            assert (await request(unix_path, "GET", "/not-found"))[0] == 404
+
+    asyncio.run(scenario())
+
+
+def test_serve_keep_alive(tmp_path):
+    unix_path = str(tmp_path / "normalizer.sock")
+    payload = "Bсеки човек има право на образование.".encode("cp1251")
+
+    async def scenario():
+        async with DetectionServer(jobs=1) as server:
+            await server.start(unix_path=unix_path)
+
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+
+            for _ in range(2):
+                writer.write(
+                    f"POST /detect HTTP/1.1\r\nContent-Length: {len(payload)}\r\n\r\n".encode(
+                        "ascii"
+                    )
+                    + payload
+                )
+                await writer.drain()
+
+                assert (await reader.readline()).startswith(b"HTTP/1.1 200")
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line == b"\r\n":
+                        break
+                    name, _, value = line.decode("ascii").partition(":")
+                    headers[name.lower()] = value.strip()
+
+                content = await reader.readexactly(int(headers["content-length"]))
+
+                assert json.loads(content)["encoding"] == "cp1251"
+
+            writer.close()
+
+            assert server.metrics.detections == 1
+
+    asyncio.run(scenario())
+
+
+def test_serve_coalesce_batch_and_metrics(tmp_path):
+    unix_path = str(tmp_path / "normalizer.sock")
+    samples = [
+        read_sample(name)
+        for name in (
+            "sample-french.txt",
+            "sample-russian-2.txt",
+            "sample-turkish.txt",
+            "sample-greek.txt",
+        )
+    ]
+
+    async def scenario():
+        async with DetectionServer(jobs=1, batch_size=4, batch_delay=0.5) as server:
+            await server.start(unix_path=unix_path)
+
+            responses = await asyncio.gather(
+                *[
+                    request(unix_path, "POST", "/detect", samples[i % 4])
+                    for i in range(12)
+                ]
+            )
+
+            assert all(status == 200 for status, _ in responses)
+            assert len({content for _, content in responses}) == 4
+
+            status, content = await request(unix_path, "GET", "/metrics")
+
+            assert status == 200
+
+            return metrics(content)
+
+    exposed = asyncio.run(scenario())
+
+    assert exposed["charset_normalizer_detections_total"] == 4
+    assert (
+        exposed["charset_normalizer_coalesced_total"]
+        + exposed["charset_normalizer_cache_hits_total"]
+        == 8
+    )
+    assert exposed["charset_normalizer_batches_total"] == 1
+    assert exposed["charset_normalizer_batched_payloads_total"] == 4
+    assert (
+        exposed['charset_normalizer_requests_total{endpoint="/detect",status="200"}']
+        == 12
+    )
+    assert (
+        exposed['charset_normalizer_request_duration_seconds_bucket{le="+Inf"}'] == 12
+    )
+
+
+def test_serve_broken_pool(tmp_path, capsys):
+    unix_path = str(tmp_path / "normalizer.sock")
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.shutdown()
+
+    async def scenario():
+        async with DetectionServer(executor=executor, batch_threshold=1024) as server:
+            await server.start(unix_path=unix_path)
+
+            # Batched, then sent to the pool on its own.
+            for payload in (b"hello world", read_sample("sample-arabic-1.txt")):
+                status, content = await request(unix_path, "POST", "/detect", payload)
+
+                assert status == 500
+                assert json.loads(content) == {"error": "Detection failed."}
+
+    asyncio.run(scenario())
+
+    assert "Detection failed: RuntimeError" in capsys.readouterr().err
+
+
+def test_serve_detection_error(tmp_path, capsys):
+    unix_path = str(tmp_path / "normalizer.sock")
+
+    async def failing_detect(payload):
+        raise ValueError("unexpected")
+
+    async def scenario():
+        async with DetectionServer(jobs=1) as server:
+            server.detect = failing_detect
+            await server.start(unix_path=unix_path)
+
+            status, content = await request(unix_path, "POST", "/detect", b"hello")
+
+            assert status == 500
+            assert json.loads(content) == {"error": "Detection failed."}
+
+    asyncio.run(scenario())
+
+    assert "Detection failed: ValueError('unexpected')" in capsys.readouterr().err
+
+
+def test_serve_slow_client_and_header_flood(tmp_path):
+    unix_path = str(tmp_path / "normalizer.sock")
+
+    async def response_status(head: bytes) -> int:
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+        writer.write(head)
+        await writer.drain()
+
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+
+        return int(response.split(b" ")[1])
+
+    async def scenario():
+        async with DetectionServer(
+            jobs=1, request_timeout=0.2, max_headers=8
+        ) as server:
+            await server.start(unix_path=unix_path)
+
+            # Stalled in the headers, then in the body.
+            assert await response_status(b"GET /health HTTP/1.1\r\nHost: x\r\n") == 408
+            assert (
+                await response_status(
+                    b"POST /detect HTTP/1.1\r\nContent-Length: 10\r\n\r\nhello"
+                )
+                == 408
+            )
+
+            assert (
+                await response_status(
+                    b"GET /health HTTP/1.1\r\n" + b"X-Flood: 1\r\n" * 9 + b"\r\n"
+                )
+                == 431
+            )
+            assert (
+                await response_status(
+                    b"GET /health HTTP/1.1\r\n"
+                    + b"X-Flood: 1\r\n" * 7
+                    + b"Connection: close\r\n\r\n"
+                )
+                == 200
+            )
+
+    asyncio.run(scenario())
+
+
+def test_serve_invalid_arguments():
+    assert cli_detect(["serve", "--threshold", "2"]) == 1
+    assert cli_detect(["serve", "-j", "0"]) == 1
+
+    with pytest.raises(ValueError):
+        DetectionServer(jobs=0)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+
+import charset_normalizer.stream
+from charset_normalizer import from_bytes, from_stream
+
+
+class PipeLike(io.RawIOBase):
+    """Non-seekable stream that hand out short reads, like a pipe or a socket would."""
+
+    def __init__(self, payload: bytes, max_read: int = 1000):
+        self._payload = payload
+        self._cursor = 0
+        self._max_read = max_read
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = min(len(buffer), self._max_read, len(self._payload) - self._cursor)
+        buffer[:n] = self._payload[self._cursor : self._cursor + n]
+        self._cursor += n
+        return n
+
+
+PAYLOAD = (
+    "Всеки човек има право на образование. Образованието трябва да бъде безплатно.\n"
+    * 2000
+).encode("cp1251")
+
+
+@pytest.mark.parametrize("tail_budget", [0, 4096])
+def test_stream_replay_whole_content(tail_budget: int):
+    results, reader = from_stream(
+        PipeLike(PAYLOAD), head_budget=8192, tail_budget=tail_budget
+    )
+
+    assert results.best() is not None
+    assert results.best().encoding == from_bytes(PAYLOAD).best().encoding
+
+    with reader:
+        assert reader.read() == PAYLOAD
+
+
+def test_stream_read_at_most_head_budget():
+    source = PipeLike(PAYLOAD)
+
+    results, reader = from_stream(source, head_budget=8192)
+
+    assert len(results.best().raw) <= 8192
+    assert source._cursor == 8192
+
+    reader.close()
+
+
+def test_stream_text_wrapper():
+    payload = (
+        "Ceci est une ligne écrite en français, avec des accents.\n".encode() * 500
+    )
+
+    results, reader = from_stream(PipeLike(payload, 333), head_budget=4000)
+
+    assert results.best().encoding == "utf_8"
+
+    with io.TextIOWrapper(
+        io.BufferedReader(reader), encoding=results.best().encoding
+    ) as fp:
+        assert fp.read() == payload.decode("utf_8")
+
+
+def test_stream_short_content():
+    results, reader = from_stream(PipeLike(b"Hello World"), tail_budget=16)
+
+    assert results.best().encoding == "ascii"
+    assert reader.read() == b"Hello World"
+
+
+def test_stream_tail_is_examined():
+    # A pure ASCII head but the tail reveal the true nature of the stream.
+    payload = (
+        b"abcdefghij\n" * 1000 + "Ceci est écrit en français, où ça?\n".encode() * 10
+    )
+
+    head_only, _ = from_stream(PipeLike(payload), head_budget=2048)
+    with_tail, reader = from_stream(
+        PipeLike(payload), head_budget=2048, tail_budget=512
+    )
+
+    assert head_only.best().encoding == "ascii"
+    assert with_tail.best().encoding == "utf_8"
+    assert reader.read() == payload
+
+
+@pytest.mark.parametrize("head_budget, tail_budget", [(0, 0), (1024, -1)])
+def test_stream_invalid_budget(head_budget: int, tail_budget: int):
+    with pytest.raises(ValueError):
+        from_stream(
+            PipeLike(b"Hello"), head_budget=head_budget, tail_budget=tail_budget
+        )
+
+
+def test_stream_spool_closed_on_error(monkeypatch: pytest.MonkeyPatch):
+    spools: list[io.BufferedRandom] = []
+    temporary_file = charset_normalizer.stream.TemporaryFile
+
+    def tracked_temporary_file():
+        spools.append(temporary_file())
+        return spools[-1]
+
+    class FailingPipe(PipeLike):
+        def readinto(self, buffer) -> int:
+            if self._cursor >= 5000:
+                raise OSError("connection reset")
+            return super().readinto(buffer)
+
+    monkeypatch.setattr(
+        charset_normalizer.stream, "TemporaryFile", tracked_temporary_file
+    )
+
+    with pytest.raises(OSError):
+        from_stream(FailingPipe(PAYLOAD), head_budget=4000, tail_budget=1000)
+
+    assert len(spools) == 1
+    assert spools[0].closed
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from os import pardir, path
+from os import cpu_count, environ, pardir, path
+from time import perf_counter
 
-from charset_normalizer.api import from_path
+import pytest
+
+from charset_normalizer.api import _free_threaded, from_bytes, from_path
+from charset_normalizer.cache import (
+    COHERENCE_RATIO_CACHE,
+    MESS_RATIO_CACHE,
+    configure_chunk_caches,
+)
 
 DIR_PATH = path.join(path.dirname(path.realpath(__file__)), pardir)
 
@@ -16,6 +25,11 @@ _THREAD_CASES = [
 ]
 
 
+def _read(file_name: str) -> bytes:
+    with open(path.join(DIR_PATH, "data", file_name), "rb") as fp:
+        return fp.read()
+
+
 def _detect(case: tuple[str, str, str]) -> tuple[str, str, str, str | None, str | None]:
     file_name, expected_enc, expected_lang = case
     result = from_path(path.join(DIR_PATH, "data", file_name))
@@ -29,6 +43,18 @@ def _detect(case: tuple[str, str, str]) -> tuple[str, str, str, str | None, str
     )
 
 
+def _detect_all(payloads: list[bytes], workers: int) -> tuple[list[str | None], float]:
+    started_at = perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        verdicts = [
+            best_guess.encoding if best_guess is not None else None
+            for best_guess in pool.map(
+                lambda payload: from_bytes(payload).best(), payloads
+            )
+        ]
+    return verdicts, perf_counter() - started_at
+
+
 class TestThreadSafety:
     def test_concurrent_detection(self) -> None:
         """Three files detected concurrently must each return the correct
@@ -52,3 +78,80 @@ class TestThreadSafety:
         intermittent race conditions."""
         for _ in range(5):
             self.test_concurrent_detection()
+
+    def test_explain_does_not_mutate_shared_logger(self) -> None:
+        """Detections made with explain=True, concurrently with regular ones,
+        must leave the shared package logger level and handlers untouched."""
+        shared_logger = logging.getLogger("charset_normalizer")
+        level, handlers = shared_logger.level, list(shared_logger.handlers)
+
+        payload = "Bonjour, où êtes-vous allés l'été dernier ?".encode("cp1252")
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            verdicts = list(
+                pool.map(
+                    lambda explain: (
+                        from_bytes(payload, explain=explain).best().encoding
+                    ),
+                    [True, False] * 8,
+                )
+            )
+
+        assert len(set(verdicts)) == 1
+        assert shared_logger.level == level
+        assert shared_logger.handlers == handlers
+
+    def test_concurrent_detection_scaling(self) -> None:
+        """The same payloads detected by many threads at once must yield the
+        serial verdicts."""
+        payloads = [_read(file_name) for file_name, _, _ in _THREAD_CASES] * 4
+
+        expected, _ = _detect_all(payloads, 1)
+        parallel_verdicts, _ = _detect_all(payloads, 4)
+
+        assert parallel_verdicts == expected
+
+    def test_concurrent_detection_spread_over_chunk_cache_shards(self) -> None:
+        """Concurrent detections must not all go through a single lock of the
+        shared chunk caches, and must still yield the serial verdicts."""
+        payloads = [_read(file_name) for file_name, _, _ in _THREAD_CASES] * 4
+
+        configure_chunk_caches(enabled=True)
+
+        expected, _ = _detect_all(payloads, 1)
+
+        configure_chunk_caches(enabled=True)
+
+        parallel_verdicts, _ = _detect_all(payloads, 4)
+
+        assert parallel_verdicts == expected
+
+        for chunk_cache in (MESS_RATIO_CACHE, COHERENCE_RATIO_CACHE):
+            assert len(chunk_cache._shards) > 1
+            assert sum(1 for shard in chunk_cache._shards if len(shard)) > 1
+
+    @pytest.mark.skipif(
+        "CHARSET_NORMALIZER_BENCHMARK" not in environ
+        or not _free_threaded()
+        or (cpu_count() or 1) < 4,
+        reason="Benchmark, set CHARSET_NORMALIZER_BENCHMARK to run it on a free-threaded build with 4+ CPUs",
+    )
+    def test_concurrent_detection_throughput_scales(self) -> None:
+        """On free-threaded builds, threads must make progress in parallel:
+        no shared cache shall serialize them."""
+        payloads = [_read(file_name) for file_name, _, _ in _THREAD_CASES] * 8
+
+        # Every detection does the whole work, instead of hitting the chunk caches.
+        configure_chunk_caches(enabled=False)
+
+        try:
+            # Warm up the per codepoint and per code page caches.
+            _detect_all(payloads, 1)
+
+            _, serial_duration = _detect_all(payloads, 1)
+            _, parallel_duration = _detect_all(payloads, 4)
+        finally:
+            configure_chunk_caches(enabled=True)
+
+        # At least twice the serial throughput out of 4 threads.
+        assert len(payloads) / parallel_duration >= 2 * len(payloads) / serial_duration
@@ -4,7 +4,18 @@ import logging
 
 import pytest
 
-from charset_normalizer.utils import cp_similarity, is_accentuated, set_logging_handler
+from charset_normalizer.utils import (
+    byte_presence_mask,
+    cp_similarity,
+    identity_byte_values,
+    is_accentuated,
+    is_ascii_transparent,
+    set_logging_handler,
+    single_byte_identity_key,
+    single_byte_undefined_mask,
+    truncate_sequence,
+    windowed_decode_length,
+)
 
 
 @pytest.mark.parametrize(
@@ -50,3 +61,100 @@ def test_cp_similarity(cp_name_a, cp_name_b, expected_is_similar):
     is_similar = cp_similarity(cp_name_a, cp_name_b) >= 0.8
 
     assert is_similar is expected_is_similar, "cp_similarity is broken"
+
+
+@pytest.mark.parametrize(
+    "sequence, limit, expected",
+    [
+        (b"hello\nworld", 64, b"hello\nworld"),
+        (b"hello\nworld", 9, b"hello\n"),
+        ("aé".encode(), 2, b"a"),
+        ("a日".encode(), 3, b"a"),
+        ("aé".encode() + b"b", 3, "aé".encode()),
+        ("ab".encode("utf_16"), 5, "a".encode("utf_16")),
+        ("\ufeffa\U0001f600".encode("utf_16_le"), 6, b"\xff\xfea\x00"),
+    ],
+)
+def test_truncate_sequence(sequence: bytes, limit: int, expected: bytes):
+    assert truncate_sequence(sequence, limit) == expected
+
+
+@pytest.mark.parametrize(
+    "sequence, present, absent",
+    [
+        (b"hello world", [], [ord("h"), ord(" ")]),
+        (b"hello\x81", [0x81], [0x82, ord("h")]),
+        (b"plop\n", [ord("p"), ord("\n")], [ord("l"), ord("o")]),
+    ],
+)
+def test_byte_presence_mask(sequence: bytes, present: list[int], absent: list[int]):
+    mask = byte_presence_mask(sequence)
+
+    for i in present:
+        assert mask & (1 << i)
+    for i in absent:
+        assert not mask & (1 << i)
+
+
+def test_single_byte_undefined_mask():
+    assert single_byte_undefined_mask("ascii") == sum(
+        1 << i for i in range(0x80, 0x100)
+    )
+    assert single_byte_undefined_mask("latin_1") == 0
+    assert single_byte_undefined_mask("cp1252") & (1 << 0x81)
+
+
+@pytest.mark.parametrize(
+    "iana_encoding, expected_is_transparent",
+    [
+        ("cp1252", True),
+        ("latin_1", True),
+        ("cp037", False),
+        ("utf_7", False),
+    ],
+)
+def test_is_ascii_transparent(iana_encoding: str, expected_is_transparent: bool):
+    assert is_ascii_transparent(iana_encoding) is expected_is_transparent
+
+
+@pytest.mark.parametrize(
+    "sequence, cp_name_a, cp_name_b, expected_is_identical",
+    [
+        ("Café crème".encode("cp1252"), "cp1252", "latin_1", True),
+        ("Café crème".encode("cp1252"), "cp1252", "iso8859_15", True),
+        ("Café crème".encode("cp1252"), "cp1252", "cp1251", False),
+        ("Coût: 5€".encode("cp1252"), "cp1252", "latin_1", False),
+        (b"Hello World", "cp1252", "cp037", False),
+    ],
+)
+def test_single_byte_identity_key(
+    sequence: bytes, cp_name_a: str, cp_name_b: str, expected_is_identical: bool
+):
+    byte_values = identity_byte_values(byte_presence_mask(sequence))
+
+    assert (
+        single_byte_identity_key(cp_name_a, byte_values)
+        == single_byte_identity_key(cp_name_b, byte_values)
+    ) is expected_is_identical
+
+    if expected_is_identical:
+        assert sequence.decode(cp_name_a) == sequence.decode(cp_name_b)
+
+
+@pytest.mark.parametrize("iana_encoding", ["gb18030", "big5", "utf_8", "utf_16_le"])
+def test_windowed_decode_length(iana_encoding: str):
+    decoded = "這是一個測試，中文字符。" * 64
+    sequence = decoded.encode(iana_encoding)
+
+    boundaries = {offset: offset for offset in range(0, len(sequence), 37)}
+
+    assert windowed_decode_length(
+        sequence, iana_encoding, window_size=7, boundaries=boundaries
+    ) == len(decoded)
+
+    for offset, boundary in boundaries.items():
+        assert offset - 4 < boundary <= offset
+        assert sequence[boundary:].decode(iana_encoding) in decoded
+
+    with pytest.raises(UnicodeDecodeError):
+        windowed_decode_length(sequence[:-1], iana_encoding, window_size=7)